@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: str.format templates vs precompiled templates.
+
+Renders posts for both languages with the legacy ``str.format`` path
+(including the per-post ``datetime.now().strftime`` call it used to make)
+and with CompiledTemplate, and prints posts/sec for each.
+
+Usage:
+    python scripts/bench_templates.py [--posts 200000]
+"""
+
+import argparse
+import logging
+import random
+import timeit
+from datetime import datetime
+
+from hpc_ai_tools.content_generator import ContentGenerator
+
+
+def _legacy_render(generator, template, topic, organization, emoji, hashtags):
+    content = template.format(
+        emoji=emoji,
+        topic=topic,
+        organization=organization,
+        date=datetime.now().strftime("%Y-%m-%d"),
+    )
+    return content + f"\n\n{hashtags}"
+
+
+def _compiled_render(generator, template, topic, organization, emoji, hashtags):
+    return template.render((emoji, topic, organization, hashtags))
+
+
+def bench_language(language: str, posts: int) -> None:
+    generator = ContentGenerator(language=language)
+    rng = random.Random(0)
+
+    raw = generator.hpc_templates
+    _, compiled = generator._focus_components("hpc")
+    draws = []
+    for _ in range(posts):
+        i = rng.randrange(len(raw))
+        topic = rng.choice(generator.hpc_topics)
+        draws.append(
+            (
+                i,
+                topic,
+                rng.choice(generator.organizations),
+                rng.choice(generator.emojis),
+                generator._generate_hashtags(topic, "hpc"),
+            )
+        )
+
+    def run(render, templates):
+        for i, topic, org, emoji, tags in draws:
+            render(generator, templates[i], topic, org, emoji, tags)
+
+    before = min(timeit.repeat(lambda: run(_legacy_render, raw), number=1, repeat=3))
+    after = min(
+        timeit.repeat(lambda: run(_compiled_render, compiled), number=1, repeat=3)
+    )
+
+    print(f"[{language}] str.format : {posts / before:>12,.0f} posts/sec")
+    print(f"[{language}] compiled   : {posts / after:>12,.0f} posts/sec")
+    print(f"[{language}] speedup    : {before / after:>12.2f}x")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--posts", type=int, default=200_000, help="Posts per run")
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    for language in ("en", "zh"):
+        bench_language(language, args.posts)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Load generator for the serve-api generation endpoint.
+
+Opens --connections keep-alive connections to a running
+``hpc-ai-tools serve-api`` and sends GET /generate requests back to back
+on each for --duration seconds, then prints requests/sec and the p50,
+p90 and p99 latencies.
+
+Usage:
+    python scripts/load_generator.py [--url http://127.0.0.1:8080] \\
+        [--connections 64] [--duration 10] [--focus hpc] [--lang en] [--n 1]
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from typing import List
+from urllib.parse import urlencode, urlsplit
+
+
+async def _worker(
+    host: str,
+    port: int,
+    request: bytes,
+    deadline: float,
+    latencies: List[float],
+    errors: List[str],
+) -> None:
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            writer.write(request)
+            head = await reader.readuntil(b"\r\n\r\n")
+            status = int(head.split(b" ", 2)[1])
+            length = 0
+            for line in head.split(b"\r\n")[1:]:
+                if line.lower().startswith(b"content-length:"):
+                    length = int(line.split(b":", 1)[1])
+            body = await reader.readexactly(length)
+            latencies.append(time.perf_counter() - start)
+            if status != 200:
+                errors.append(json.loads(body).get("error", str(status)))
+    finally:
+        writer.close()
+
+
+def _percentile(sorted_values: List[float], fraction: float) -> float:
+    index = min(len(sorted_values) - 1, int(fraction * len(sorted_values)))
+    return sorted_values[index]
+
+
+async def run(url: str, connections: int, duration: float, focus: str, lang: str, n: int) -> None:
+    parts = urlsplit(url)
+    host, port = parts.hostname, parts.port or 80
+    query = urlencode({"focus": focus, "lang": lang, "n": n})
+    request = f"GET /generate?{query} HTTP/1.1\r\nHost: {host}:{port}\r\n\r\n".encode("latin-1")
+
+    latencies: List[float] = []
+    errors: List[str] = []
+    started = time.perf_counter()
+    deadline = started + duration
+    await asyncio.gather(
+        *(_worker(host, port, request, deadline, latencies, errors) for _ in range(connections))
+    )
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    if not latencies:
+        print("No requests completed")
+        return
+    print(f"requests    : {len(latencies):>10,} ({len(errors)} errors) over {elapsed:.1f}s")
+    print(f"throughput  : {len(latencies) / elapsed:>10,.0f} req/s ({len(latencies) * n / elapsed:,.0f} posts/s)")
+    for label, fraction in (("p50", 0.50), ("p90", 0.90), ("p99", 0.99)):
+        print(f"latency {label} : {_percentile(latencies, fraction) * 1000:>10.2f} ms")
+    if errors:
+        print(f"first error : {errors[0]}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--url", default="http://127.0.0.1:8080", help="serve-api base URL")
+    parser.add_argument("--connections", type=int, default=64, help="Concurrent keep-alive connections")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds to run")
+    parser.add_argument("--focus", choices=["hpc", "ai"], default="hpc", help="Content focus")
+    parser.add_argument("--lang", choices=["en", "zh"], default="en", help="Content language")
+    parser.add_argument("--n", type=int, default=1, help="Posts per request")
+    args = parser.parse_args()
+
+    asyncio.run(run(args.url, args.connections, args.duration, args.focus, args.lang, args.n))
+
+
+if __name__ == "__main__":
+    main()
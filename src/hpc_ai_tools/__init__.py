@@ -7,6 +7,14 @@ __author__ = "Attaxu"
 __email__ = "last.kakas.1989@gmail.com"
 
 from .content_generator import ContentGenerator
-from .x_poster import XPoster
 
 __all__ = ["ContentGenerator", "XPoster"]
+
+
+def __getattr__(name):
+    # XPoster pulls in its sqlite stores and dotenv; import it on first use only
+    if name == "XPoster":
+        from .x_poster import XPoster
+
+        return XPoster
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
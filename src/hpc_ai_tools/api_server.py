@@ -0,0 +1,357 @@
+"""
+HTTP content generation service with request micro-batching
+"""
+
+import asyncio
+import json
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from http import HTTPStatus
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from .content_generator import ContentGenerator
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8080
+DEFAULT_BATCH_WINDOW = 0.002
+DEFAULT_MAX_BATCH = 4096
+
+# Posts one request may ask for
+MAX_POSTS_PER_REQUEST = 100
+
+FOCUSES = ("hpc", "ai")
+LANGUAGES = ("en", "zh")
+
+MAX_HEADER_BYTES = 16 * 1024
+
+
+@dataclass
+class _Pending:
+    """A request waiting for its share of a batch."""
+
+    n: int
+    future: asyncio.Future
+
+
+class MicroBatcher:
+    """
+    Merges concurrent requests into single bulk generation calls.
+
+    The first request of a batch waits up to ``window`` seconds for others
+    to join (less if ``max_batch`` posts are already queued). The batch then
+    runs as one ``generate(total)`` call on the executor, and each request
+    gets its slice. Requests that arrive while a batch is generating form
+    the next batch, so under load batches grow with the request rate
+    instead of adding queueing delay.
+    """
+
+    def __init__(
+        self,
+        generate: Callable[[int], List[str]],
+        executor: ThreadPoolExecutor,
+        window: float = DEFAULT_BATCH_WINDOW,
+        max_batch: int = DEFAULT_MAX_BATCH,
+    ):
+        """
+        Args:
+            generate: Blocking function returning that many posts
+            executor: Executor the generation calls run on
+            window: Seconds the first request of a batch waits for company
+            max_batch: Posts per generation call
+        """
+        self._generate = generate
+        self._executor = executor
+        self.window = window
+        self.max_batch = max_batch
+        self._pending: List[_Pending] = []
+        self._queued = 0
+        self._full = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self.batches = 0
+        self.requests = 0
+
+    async def submit(self, n: int) -> List[str]:
+        """Queue a request for ``n`` posts and wait for them."""
+        loop = asyncio.get_running_loop()
+        pending = _Pending(n, loop.create_future())
+        self._pending.append(pending)
+        self._queued += n
+        if self._queued >= self.max_batch:
+            self._full.set()
+        if self._task is None:
+            self._task = loop.create_task(self._run())
+        return await pending.future
+
+    def _take(self) -> List[_Pending]:
+        """Requests for the next batch: whole requests up to max_batch posts."""
+        batch, total = [], 0
+        while self._pending and (not batch or total + self._pending[0].n <= self.max_batch):
+            item = self._pending.pop(0)
+            batch.append(item)
+            total += item.n
+        self._queued -= total
+        if self._queued < self.max_batch:
+            self._full.clear()
+        return batch
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        try:
+            while self._pending:
+                if self._queued < self.max_batch:
+                    try:
+                        await asyncio.wait_for(self._full.wait(), timeout=self.window)
+                    except asyncio.TimeoutError:
+                        pass
+                batch = self._take()
+                total = sum(item.n for item in batch)
+                try:
+                    posts = await loop.run_in_executor(self._executor, self._generate, total)
+                except Exception as e:
+                    for item in batch:
+                        if not item.future.done():
+                            item.future.set_exception(e)
+                    continue
+                self.batches += 1
+                self.requests += len(batch)
+                start = 0
+                for item in batch:
+                    if not item.future.done():
+                        item.future.set_result(posts[start:start + item.n])
+                    start += item.n
+        finally:
+            self._task = None
+
+
+class GenerationServer:
+    """
+    Asyncio HTTP/1.1 server for ``GET /generate`` backed by warm generators.
+
+    One ContentGenerator per language is built at start-up and reused.
+    Requests are merged per (language, focus) by a MicroBatcher. Generation
+    runs on a single worker thread, since a generator is not thread-safe,
+    while the event loop keeps accepting and parsing requests. Connections
+    are kept alive between requests.
+
+    Endpoints:
+        GET /generate?focus=hpc|ai&lang=en|zh&n=1..100
+            -> {"focus": ..., "lang": ..., "posts": [...]}
+        GET /health -> {"status": "ok", "batches": ..., "requests": ...}
+    """
+
+    def __init__(
+        self,
+        host: str = DEFAULT_HOST,
+        port: int = DEFAULT_PORT,
+        batch_window: Optional[float] = None,
+        max_batch: Optional[int] = None,
+        seed: Optional[int] = None,
+    ):
+        """
+        Args:
+            host: Address to listen on
+            port: Port to listen on (0 picks a free one)
+            batch_window: Seconds a batch waits for more requests. Defaults
+                to API_BATCH_WINDOW_MS / 1000 or 2ms
+            max_batch: Posts per generation call. Defaults to API_MAX_BATCH or 4096
+            seed: Seed for the generators
+        """
+        self.host = host
+        self.port = port
+        if batch_window is None:
+            batch_window = float(
+                os.getenv("API_BATCH_WINDOW_MS", str(DEFAULT_BATCH_WINDOW * 1000))
+            ) / 1000
+        self.batch_window = batch_window
+        self.max_batch = max_batch or int(os.getenv("API_MAX_BATCH", str(DEFAULT_MAX_BATCH)))
+        self.seed = seed
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="generate")
+        self._generators: Dict[str, ContentGenerator] = {}
+        self._batchers: Dict[Tuple[str, str], MicroBatcher] = {}
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self) -> None:
+        """Build the generators and start listening."""
+        loop = asyncio.get_running_loop()
+        for language in LANGUAGES:
+            generator = ContentGenerator(language=language, seed=self.seed)
+            self._generators[language] = generator
+            for focus in FOCUSES:
+                # Build the length index and NumPy state before the first request
+                await loop.run_in_executor(self._executor, generator.generate_batch, 1, focus)
+                self._batchers[(language, focus)] = MicroBatcher(
+                    self._batch_function(generator, focus),
+                    self._executor,
+                    window=self.batch_window,
+                    max_batch=self.max_batch,
+                )
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        logger.info(f"Generation API listening on http://{self.host}:{self.port}")
+
+    @staticmethod
+    def _batch_function(generator: ContentGenerator, focus: str) -> Callable[[int], List[str]]:
+        return lambda n: generator.generate_batch(n, focus)[0]
+
+    async def serve_forever(self) -> None:
+        """Serve until cancelled."""
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self) -> None:
+        """Stop listening and wait for the generation thread."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        self._executor.shutdown(wait=True)
+
+    def stats(self) -> Dict[str, int]:
+        """Requests served and generation calls made."""
+        return {
+            "batches": sum(b.batches for b in self._batchers.values()),
+            "requests": sum(b.requests for b in self._batchers.values()),
+        }
+
+    async def _handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    return
+                except asyncio.LimitOverrunError:
+                    head = b""
+                if not head or len(head) > MAX_HEADER_BYTES:
+                    await self._respond(
+                        writer, HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE, {"error": "Headers too large"}, False
+                    )
+                    return
+
+                lines = head.decode("latin-1").split("\r\n")
+                try:
+                    method, target, version = lines[0].split(" ", 2)
+                except ValueError:
+                    await self._respond(
+                        writer, HTTPStatus.BAD_REQUEST, {"error": "Malformed request line"}, False
+                    )
+                    return
+                headers = {}
+                for line in lines[1:]:
+                    if ":" in line:
+                        name, value = line.split(":", 1)
+                        headers[name.strip().lower()] = value.strip()
+                try:
+                    length = int(headers.get("content-length") or 0)
+                except ValueError:
+                    length = -1
+                if length < 0:
+                    await self._respond(
+                        writer, HTTPStatus.BAD_REQUEST, {"error": "Invalid Content-Length"}, False
+                    )
+                    return
+                if length:
+                    await reader.readexactly(length)
+
+                connection = headers.get("connection", "").lower()
+                keep_alive = connection != "close" if version == "HTTP/1.1" else connection == "keep-alive"
+
+                status, payload = await self._route(method, target)
+                await self._respond(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    return
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _route(self, method: str, target: str) -> Tuple[HTTPStatus, dict]:
+        url = urlsplit(target)
+        if url.path not in ("/generate", "/health"):
+            return HTTPStatus.NOT_FOUND, {"error": f"Unknown path {url.path}"}
+        if method != "GET":
+            return HTTPStatus.METHOD_NOT_ALLOWED, {"error": "Only GET is supported"}
+        if url.path == "/health":
+            return HTTPStatus.OK, {"status": "ok", **self.stats()}
+
+        params = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        focus = params.get("focus", "hpc")
+        language = params.get("lang", "en")
+        if focus not in FOCUSES:
+            return HTTPStatus.BAD_REQUEST, {"error": f"focus must be one of {', '.join(FOCUSES)}"}
+        if language not in LANGUAGES:
+            return HTTPStatus.BAD_REQUEST, {"error": f"lang must be one of {', '.join(LANGUAGES)}"}
+        try:
+            n = int(params.get("n", "1"))
+        except ValueError:
+            n = 0
+        if not 1 <= n <= MAX_POSTS_PER_REQUEST:
+            return HTTPStatus.BAD_REQUEST, {"error": f"n must be between 1 and {MAX_POSTS_PER_REQUEST}"}
+
+        try:
+            posts = await self._batchers[(language, focus)].submit(n)
+        except Exception as e:
+            logger.error(f"Generation failed: {e}")
+            return HTTPStatus.INTERNAL_SERVER_ERROR, {"error": "Generation failed"}
+        return HTTPStatus.OK, {"focus": focus, "lang": language, "posts": posts}
+
+    @staticmethod
+    async def _respond(
+        writer: asyncio.StreamWriter, status: HTTPStatus, payload: dict, keep_alive: bool
+    ) -> None:
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        head = (
+            f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+            "Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n"
+            "\r\n"
+        )
+        writer.write(head.encode("latin-1") + body)
+        await writer.drain()
+
+
+def run_server(
+    host: str = DEFAULT_HOST,
+    port: int = DEFAULT_PORT,
+    on_start: Optional[Callable[[GenerationServer], None]] = None,
+    **kwargs,
+) -> None:
+    """
+    Run a GenerationServer until SIGINT/SIGTERM.
+
+    Args:
+        host: Address to listen on
+        port: Port to listen on
+        on_start: Called with the server once it is listening
+        **kwargs: Passed to GenerationServer
+    """
+    import signal
+
+    async def main() -> None:
+        server = GenerationServer(host, port, **kwargs)
+        started = time.perf_counter()
+        await server.start()
+        logger.info(f"Generators warmed up in {time.perf_counter() - started:.2f}s")
+        if on_start is not None:
+            on_start(server)
+
+        loop = asyncio.get_running_loop()
+        serving = asyncio.ensure_future(server.serve_forever())
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, serving.cancel)
+        try:
+            await serving
+        except asyncio.CancelledError:
+            pass
+        finally:
+            await server.close()
+
+    asyncio.run(main())
@@ -0,0 +1,180 @@
+"""
+Asyncio posting pipeline with bounded concurrency
+"""
+
+import asyncio
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, List, Optional, Set, Tuple
+
+from .post_index import PostIndex
+from .x_poster import XPoster
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONCURRENCY = 4
+
+
+@dataclass
+class PostResult:
+    """Outcome of posting one queued item."""
+
+    key: Any
+    content: str
+    success: bool
+    message: str
+    tweet_id: Optional[str] = None
+    latency: float = 0.0
+
+
+class AsyncXPoster:
+    """
+    Posts content taken from an ``asyncio.Queue``.
+
+    ``concurrency`` worker tasks pull ``(key, content)`` or
+    ``(key, content, focus)`` items from the queue and keep at most that
+    many requests in flight. Each item is published with XPoster._publish
+    on a thread pool of the same size, over an XApiClient whose session
+    pool holds one keep-alive connection per worker.
+    """
+
+    def __init__(
+        self,
+        poster: Optional[XPoster] = None,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        client: Optional[Any] = None,
+    ):
+        """
+        Args:
+            poster: XPoster providing mode, validation, duplicate index and logs
+            concurrency: Maximum requests in flight
+            client: XApiClient for real posts. Built from the environment
+                when the poster is in real mode and none is given.
+        """
+        if concurrency < 1:
+            raise ValueError(f"Concurrency must be positive, got {concurrency}")
+
+        self.poster = poster if poster is not None else XPoster()
+        self.concurrency = concurrency
+        self.client = client
+        if self.client is None and not self.poster.mock_mode:
+            from .x_api import XApiClient
+
+            self.client = XApiClient.from_env(
+                pool_size=concurrency, rate_limiter=self.poster.rate_limits
+            )
+
+        self._executor = ThreadPoolExecutor(
+            max_workers=concurrency, thread_name_prefix="x-post"
+        )
+        self._in_flight: Set[bytes] = set()
+
+    async def post(self, key: Any, content: str, focus: Optional[str] = None) -> PostResult:
+        """
+        Post one item.
+
+        Args:
+            key: Caller's identifier for the item
+            content: Content to post
+            focus: Content focus ('hpc', 'ai') recorded in the post history
+
+        Returns:
+            PostResult for the item
+        """
+        start = time.perf_counter()
+        success, message, tweet_id = await self._post(content, focus)
+        return PostResult(key, content, success, message, tweet_id, time.perf_counter() - start)
+
+    async def _post(self, content: str, focus: Optional[str]) -> Tuple[bool, str, Optional[str]]:
+        # The same text twice in one run would race past the index check
+        content_hash = PostIndex.content_hash(content)
+        if content_hash in self._in_flight:
+            return False, "Duplicate content: already posted within the retention window", None
+
+        loop = asyncio.get_running_loop()
+        self._in_flight.add(content_hash)
+        try:
+            success, message, tweet_id, _ = await loop.run_in_executor(
+                self._executor, self.poster._publish, content, focus, None, self.client
+            )
+            return success, message, tweet_id
+        finally:
+            self._in_flight.discard(content_hash)
+
+    async def _worker(
+        self,
+        queue: asyncio.Queue,
+        results: List[PostResult],
+        on_result: Optional[Callable[[PostResult], None]],
+    ) -> None:
+        while True:
+            item = await queue.get()
+            try:
+                if item is None:
+                    # Pass the stop signal on to the next worker
+                    await queue.put(None)
+                    return
+                result = await self.post(*item)
+                results.append(result)
+                if on_result is not None:
+                    on_result(result)
+            finally:
+                queue.task_done()
+
+    async def run(
+        self,
+        queue: asyncio.Queue,
+        on_result: Optional[Callable[[PostResult], None]] = None,
+    ) -> List[PostResult]:
+        """
+        Drain a queue of ``(key, content[, focus])`` items until a ``None`` item arrives.
+
+        Args:
+            queue: Queue fed by the caller; put ``None`` once when done
+            on_result: Called with each PostResult as soon as it is known
+
+        Returns:
+            Results in completion order
+        """
+        results: List[PostResult] = []
+        workers = [
+            asyncio.create_task(self._worker(queue, results, on_result))
+            for _ in range(self.concurrency)
+        ]
+        await asyncio.gather(*workers)
+        return results
+
+    async def post_many(
+        self,
+        contents: Iterable[str],
+        on_result: Optional[Callable[[PostResult], None]] = None,
+    ) -> List[PostResult]:
+        """
+        Post several items and return their results in input order.
+
+        Args:
+            contents: Content to post
+            on_result: Called with each PostResult as soon as it is known
+
+        Returns:
+            Results keyed by input position
+        """
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.concurrency * 2)
+
+        async def produce() -> None:
+            for key, content in enumerate(contents):
+                await queue.put((key, content))
+            await queue.put(None)
+
+        producer = asyncio.create_task(produce())
+        results = await self.run(queue, on_result)
+        await producer
+        return sorted(results, key=lambda result: result.key)
+
+    def close(self) -> None:
+        """Shut down the worker threads and pooled connections."""
+        self._executor.shutdown(wait=True)
+        if self.client is not None:
+            self.client.close()
@@ -0,0 +1,394 @@
+"""
+Benchmark suite with a stored baseline and regression gate
+"""
+
+import gc
+import json
+import logging
+import os
+import platform
+import statistics
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable, ContextManager, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from .content_generator import ContentGenerator
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BASELINE_PATH = "benchmarks/baseline.json"
+DEFAULT_THRESHOLD = 0.5
+DEFAULT_LOG_RECORDS = 100_000
+DEFAULT_ROUND_TIME = 0.1
+DEFAULT_REPEAT = 5
+
+RESULTS_VERSION = 1
+
+# Legacy free-text log entries written per history record; installs that
+# predate the JSONL history carry both
+LEGACY_LOG_RATIO = 10
+
+# A setup context: given a scratch directory and the synthetic log size,
+# yields the operation to time and cleans up after it
+Setup = Callable[[Path, int], ContextManager[Callable[[], object]]]
+
+
+@dataclass
+class Benchmark:
+    """A named operation timed by run_benchmarks()."""
+
+    name: str
+    description: str
+    setup: Setup
+
+
+def _generator() -> ContentGenerator:
+    generator = ContentGenerator(seed=0)
+    generator.length_index("hpc")
+    return generator
+
+
+def _overlong_post(generator: ContentGenerator) -> str:
+    """A post over the length limit with a long hashtag line."""
+    body = " ".join(generator.hpc_topics) * 2
+    return f"🚀 {body}\n\n#Tech #Innovation #HPC #Supercomputing #HighPerformanceComputing #Exascale"
+
+
+def write_synthetic_logs(directory: Path, records: int) -> Tuple[Path, Path, Path]:
+    """
+    Write a post history and legacy logs of a given size (once per directory).
+
+    Args:
+        directory: Directory for the logs
+        records: History records; the legacy logs get a tenth as many entries
+
+    Returns:
+        Tuple of (history path, tweet log path, error log path)
+    """
+    from .history import history_record
+
+    history_path = directory / "post_history.jsonl"
+    tweet_log = directory / "tweet_log.txt"
+    error_log = directory / "post_errors.log"
+    if history_path.exists():
+        return history_path, tweet_log, error_log
+
+    directory.mkdir(parents=True, exist_ok=True)
+    generator = ContentGenerator(seed=0)
+    posts = generator.generate_batch(min(records, 1000), "hpc")[0]
+    start = datetime(2024, 1, 1).astimezone()
+
+    with open(history_path, "w", encoding="utf-8") as f:
+        for i in range(records):
+            now = start + timedelta(minutes=i)
+            if i % 50 == 49:
+                f.write(history_record("real", posts[i % len(posts)], error="503 Service Unavailable", now=now))
+            else:
+                mode = "real" if i % 4 == 0 else "mock"
+                tweet_id = str(10**18 + i) if mode == "real" else None
+                f.write(history_record(mode, posts[i % len(posts)], tweet_id=tweet_id, focus="hpc", now=now))
+
+    legacy = max(1, records // LEGACY_LOG_RATIO)
+    separator = "=" * 50
+    with open(tweet_log, "w", encoding="utf-8") as f:
+        for i in range(legacy):
+            stamp = (start - timedelta(minutes=legacy - i)).strftime("%Y-%m-%d %H:%M:%S")
+            f.write(f"[{stamp}] MOCK POST\n{posts[i % len(posts)]}\n{separator}\n")
+    with open(error_log, "w", encoding="utf-8") as f:
+        for i in range(legacy // 50):
+            stamp = (start - timedelta(minutes=legacy - i)).strftime("%Y-%m-%d %H:%M:%S")
+            f.write(f"[{stamp}] ERROR\nContent: {posts[0]}\nError: 503\n{separator}\n")
+
+    return history_path, tweet_log, error_log
+
+
+@contextmanager
+def _generate_content(workdir: Path, records: int) -> Iterator[Callable[[], object]]:
+    generator = _generator()
+    yield lambda: generator._generate_content("hpc")
+
+
+@contextmanager
+def _generate_hashtags(workdir: Path, records: int) -> Iterator[Callable[[], object]]:
+    generator = _generator()
+    topic = generator.hpc_topics[0]
+    yield lambda: generator._generate_hashtags(topic, "hpc")
+
+
+@contextmanager
+def _validate_content_length(workdir: Path, records: int) -> Iterator[Callable[[], object]]:
+    generator = _generator()
+    content = _overlong_post(generator)
+    yield lambda: generator._validate_content_length(content)
+
+
+@contextmanager
+def _content_stats(workdir: Path, records: int) -> Iterator[Callable[[], object]]:
+    generator = _generator()
+    content = generator._generate_content("hpc")
+    yield lambda: generator.get_content_stats(content)
+
+
+@contextmanager
+def _poster(workdir: Path, counters_name: str):
+    from .history import PostHistory
+    from .journal import close_journals
+    from .post_index import PostIndex
+    from .post_stats import PostCounters
+    from .x_poster import XPoster
+
+    counters = PostCounters(workdir / counters_name)
+    poster = XPoster(
+        mock_mode=True, post_index=PostIndex(workdir / "post_index.sqlite3"), counters=counters
+    )
+    poster.history = PostHistory(workdir / "mock_history.jsonl")
+    try:
+        yield poster
+    finally:
+        close_journals()
+        counters.close()
+        poster.post_index.close()
+
+
+@contextmanager
+def _mock_post(workdir: Path, records: int) -> Iterator[Callable[[], object]]:
+    with _poster(workdir, "mock_stats.sqlite3") as poster:
+        content = _generator()._generate_content("hpc")
+        yield lambda: poster._mock_post(content, "hpc")
+
+
+@contextmanager
+def _posting_stats(workdir: Path, records: int) -> Iterator[Callable[[], object]]:
+    from .history import PostHistory
+
+    history_path, tweet_log, error_log = write_synthetic_logs(workdir / "logs", records)
+    with _poster(workdir, "post_stats.sqlite3") as poster:
+        poster.counters.rebuild(PostHistory(history_path), tweet_log, error_log)
+        yield poster.get_posting_stats
+
+
+@contextmanager
+def _rebuild_stats(workdir: Path, records: int) -> Iterator[Callable[[], object]]:
+    from .history import PostHistory
+    from .post_stats import PostCounters
+
+    history_path, tweet_log, error_log = write_synthetic_logs(workdir / "logs", records)
+    history = PostHistory(history_path)
+    counters = PostCounters(workdir / "rebuild_stats.sqlite3")
+    try:
+        yield lambda: counters.rebuild(history, tweet_log, error_log)
+    finally:
+        counters.close()
+
+
+BENCHMARKS: Dict[str, Benchmark] = {
+    b.name: b
+    for b in (
+        Benchmark("generate_content", "ContentGenerator._generate_content('hpc')", _generate_content),
+        Benchmark("generate_hashtags", "ContentGenerator._generate_hashtags", _generate_hashtags),
+        Benchmark(
+            "validate_content_length",
+            "ContentGenerator._validate_content_length on an over-long post",
+            _validate_content_length,
+        ),
+        Benchmark("content_stats", "ContentGenerator.get_content_stats", _content_stats),
+        Benchmark("mock_post", "XPoster._mock_post (history journal and counters)", _mock_post),
+        Benchmark(
+            "posting_stats",
+            "XPoster.get_posting_stats after rebuilding from the synthetic logs",
+            _posting_stats,
+        ),
+        Benchmark(
+            "rebuild_stats",
+            "PostCounters.rebuild over the synthetic history and legacy logs",
+            _rebuild_stats,
+        ),
+    )
+}
+
+
+def measure(
+    operation: Callable[[], object],
+    round_time: float = DEFAULT_ROUND_TIME,
+    repeat: int = DEFAULT_REPEAT,
+) -> Dict[str, float]:
+    """
+    Time an operation.
+
+    The number of calls per round is doubled until a round takes at least
+    ``round_time`` seconds; then ``repeat`` rounds are timed with the
+    garbage collector off. The fastest round is the least disturbed by
+    other load, so it is what the regression gate compares.
+
+    Args:
+        operation: Callable to time
+        round_time: Minimum seconds per timed round
+        repeat: Timed rounds
+
+    Returns:
+        Dictionary with best_us and median_us (microseconds per call),
+        ops_per_sec, and the number of calls per round
+    """
+    def timed(number: int) -> float:
+        started = time.perf_counter()
+        for _ in range(number):
+            operation()
+        return time.perf_counter() - started
+
+    number = 1
+    while timed(number) < round_time:
+        number *= 2
+
+    # As timeit does, keep collector pauses out of the timed rounds
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        rounds = [timed(number) / number for _ in range(repeat)]
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+    best = min(rounds)
+    return {
+        "best_us": best * 1e6,
+        "median_us": statistics.median(rounds) * 1e6,
+        "ops_per_sec": 1 / best if best else float("inf"),
+        "number": number,
+    }
+
+
+def run_benchmarks(
+    workdir: Path,
+    names: Optional[Sequence[str]] = None,
+    records: Optional[int] = None,
+    round_time: float = DEFAULT_ROUND_TIME,
+    repeat: int = DEFAULT_REPEAT,
+    on_result: Optional[Callable[[str, Dict[str, float]], None]] = None,
+) -> Dict[str, object]:
+    """
+    Run benchmarks and collect the results.
+
+    Logging is disabled while they run, so the numbers measure the code
+    rather than the log handlers.
+
+    Args:
+        workdir: Scratch directory for the synthetic logs and sidecar files
+        names: Benchmarks to run (all by default)
+        records: Synthetic history records. Defaults to BENCH_LOG_RECORDS or 100000
+        round_time: Minimum seconds per timed round
+        repeat: Timed rounds per benchmark
+        on_result: Called with each benchmark's name and result as it finishes
+
+    Returns:
+        Results dictionary (see save_results) with one entry per benchmark
+
+    Raises:
+        ValueError: If a benchmark name is unknown
+    """
+    names = list(names or BENCHMARKS)
+    unknown = [name for name in names if name not in BENCHMARKS]
+    if unknown:
+        raise ValueError(
+            f"Unknown benchmark(s) {', '.join(unknown)} (choose from {', '.join(BENCHMARKS)})"
+        )
+    if records is None:
+        records = int(os.getenv("BENCH_LOG_RECORDS", str(DEFAULT_LOG_RECORDS)))
+
+    results: Dict[str, object] = {
+        "version": RESULTS_VERSION,
+        "created": datetime.now().astimezone().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "records": records,
+        "benchmarks": {},
+    }
+    previous = logging.root.manager.disable
+    logging.disable(logging.CRITICAL)
+    try:
+        for name in names:
+            with BENCHMARKS[name].setup(Path(workdir), records) as operation:
+                result = measure(operation, round_time, repeat)
+            results["benchmarks"][name] = result
+            if on_result is not None:
+                on_result(name, result)
+    finally:
+        logging.disable(previous)
+    return results
+
+
+def load_results(path: Path) -> Optional[Dict[str, object]]:
+    """Read saved results; None if the file does not exist."""
+    path = Path(path)
+    if not path.exists():
+        return None
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def save_results(results: Dict[str, object], path: Path) -> None:
+    """Write results as JSON (atomically, so a baseline is never half-written)."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    tmp_path.write_text(json.dumps(results, indent=2) + "\n", encoding="utf-8")
+    os.replace(tmp_path, path)
+
+
+@dataclass
+class Regression:
+    """A benchmark that got slower than the baseline allows."""
+
+    name: str
+    baseline_us: float
+    current_us: float
+
+    @property
+    def change(self) -> float:
+        """Slowdown as a fraction (0.3 is 30% slower)."""
+        return self.current_us / self.baseline_us - 1
+
+
+def compare(
+    results: Dict[str, object],
+    baseline: Dict[str, object],
+    threshold: Optional[float] = None,
+) -> List[Regression]:
+    """
+    Find benchmarks slower than the baseline by more than the threshold.
+
+    Only benchmarks present in both are compared, by their best time.
+
+    Args:
+        results: Current results
+        baseline: Baseline results
+        threshold: Allowed slowdown as a fraction. Defaults to BENCH_THRESHOLD or 0.5
+
+    Returns:
+        Regressions, in results order
+    """
+    if threshold is None:
+        threshold = float(os.getenv("BENCH_THRESHOLD", str(DEFAULT_THRESHOLD)))
+    regressions = []
+    for name, current in results["benchmarks"].items():
+        reference = baseline.get("benchmarks", {}).get(name)
+        if reference is None:
+            continue
+        if current["best_us"] > reference["best_us"] * (1 + threshold):
+            regressions.append(Regression(name, reference["best_us"], current["best_us"]))
+    return regressions
+
+
+def format_result(name: str, result: Dict[str, float], reference: Optional[Dict[str, float]] = None) -> str:
+    """One table row: name, time per call, throughput and change from the baseline."""
+    row = f"{name:<24} {result['best_us']:>12.2f} us {result['ops_per_sec']:>14,.0f} ops/s"
+    if reference is not None:
+        row += f" {result['best_us'] / reference['best_us'] - 1:>+8.1%}"
+    return row
+
+
+def default_baseline_path() -> Path:
+    """Baseline file from BENCH_BASELINE, else benchmarks/baseline.json."""
+    return Path(os.getenv("BENCH_BASELINE", DEFAULT_BASELINE_PATH))
+
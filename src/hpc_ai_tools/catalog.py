@@ -0,0 +1,158 @@
+"""
+Shared content catalogs
+"""
+
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import FrozenSet, Tuple
+
+from .templates import CompiledTemplate, compile_templates
+
+HPC_TOPICS = (
+    "Exascale Computing",
+    "Quantum-HPC Integration",
+    "AI for Science",
+    "High Performance Data Analytics",
+    "Green Computing",
+    "HPC Cloud",
+    "GPU Computing",
+    "Storage Technologies",
+    "Interconnect Networks",
+    "Scientific Visualization",
+    "Edge Computing",
+    "Hybrid Computing",
+    "Memory Technologies",
+    "Parallel Algorithms",
+    "Workflow Management",
+)
+
+AI_TOPICS = (
+    "Large Language Models",
+    "Computer Vision",
+    "Reinforcement Learning",
+    "Generative AI",
+    "Federated Learning",
+    "Explainable AI",
+    "AI Ethics",
+    "Edge AI",
+    "AI Hardware",
+    "Multimodal AI",
+    "Transfer Learning",
+    "Self-Supervised Learning",
+    "Neuro-Symbolic AI",
+    "AI Safety",
+    "AI Governance",
+)
+
+ORGANIZATIONS = (
+    "DOE (Department of Energy)",
+    "NSF (National Science Foundation)",
+    "CERN",
+    "NASA",
+    "Oak Ridge National Laboratory",
+    "Lawrence Livermore National Laboratory",
+    "Argonne National Laboratory",
+    "European HPC Centers",
+    "Chinese Supercomputing Centers",
+    "Japanese Research Institutions",
+    "MIT",
+    "Stanford University",
+    "Google Research",
+    "Microsoft Research",
+    "OpenAI",
+)
+
+EMOJIS = (
+    "🚀", "🔬", "💻", "⚡", "🌍", "📈", "🔍", "🎯", "🤖", "🧠", "💡", "⚛️", "🔋", "📊", "🌐",
+)
+
+ENGLISH_HPC_TEMPLATES = (
+    "{emoji} {topic} breakthrough: {organization} reports significant performance improvements, accelerating scientific discovery.\n\n#HighPerformanceComputing #ScientificComputing",
+    "{emoji} {topic} technology analysis: New architecture shows excellent performance in {organization} tests, with improved energy efficiency.\n\nFollow cutting-edge computing infrastructure development!",
+    "{emoji} {topic} application case: {organization} uses this technology to solve complex scientific problems, dramatically reducing computation time.\n\n#HPC #ResearchInnovation",
+    "{emoji} Latest developments in {topic}: {organization} study reveals groundbreaking advances in computational capabilities.\n\n#Supercomputing #TechInnovation",
+    "{emoji} {topic} infrastructure update: {organization} deploys new system achieving record-breaking performance metrics.\n\n#HPCNews #Computing",
+)
+
+ENGLISH_AI_TEMPLATES = (
+    "{emoji} {topic} breakthrough: {organization} research team publishes latest results, achieving new performance heights.\n\n#ArtificialIntelligence #MachineLearning",
+    "{emoji} {topic} applications: Demonstrates powerful capabilities in real-world scenarios, validated by {organization}.\n\n#AI #TechnologyInnovation",
+    "{emoji} {topic} trend analysis: {organization} report indicates rapid development in this field with widespread industry applications.\n\nFollow AI frontier developments!",
+    "{emoji} Advancements in {topic}: {organization} researchers achieve state-of-the-art results in benchmark tests.\n\n#AIResearch #DeepLearning",
+    "{emoji} {topic} implementation: Successful deployment at {organization} shows promising results for future applications.\n\n#AITechnology #Innovation",
+)
+
+CHINESE_HPC_TEMPLATES = (
+    "{emoji} {topic}最新进展：{organization}报告显示性能提升显著，推动科学发现加速。\n\n#高性能计算 #科学计算",
+    "{emoji} {topic}技术解析：新型架构在{organization}测试中表现优异，能效比改善明显。\n\n关注前沿计算基础设施发展！",
+    "{emoji} {topic}应用案例：{organization}利用该技术解决复杂科学问题，计算时间大幅缩短。\n\n#HPC #科研创新",
+    "{emoji} {topic}基础设施更新：{organization}部署新系统，实现突破性性能指标。\n\n#超算 #技术创新",
+    "{emoji} {topic}研究动态：{organization}最新研究揭示计算能力重大进展。\n\n#高性能计算 #科技前沿",
+)
+
+CHINESE_AI_TEMPLATES = (
+    "{emoji} {topic}突破：{organization}研究团队发布最新成果，模型性能达到新高度。\n\n#人工智能 #机器学习",
+    "{emoji} {topic}应用：在实际场景中展现强大能力，{organization}验证其有效性。\n\n#AI #技术创新",
+    "{emoji} {topic}趋势分析：{organization}报告指出该领域发展迅速，产业应用广泛。\n\n关注AI前沿动态！",
+    "{emoji} {topic}进展：{organization}研究人员在基准测试中取得最先进成果。\n\n#AI研究 #深度学习",
+    "{emoji} {topic}实施：在{organization}的成功部署显示未来应用前景广阔。\n\n#AI技术 #创新",
+)
+
+TEMPLATES = {
+    "en": (ENGLISH_HPC_TEMPLATES, ENGLISH_AI_TEMPLATES),
+    "zh": (CHINESE_HPC_TEMPLATES, CHINESE_AI_TEMPLATES),
+}
+
+
+@dataclass(frozen=True)
+class ContentCatalog:
+    """Immutable content databases for one language."""
+
+    language: str
+    hpc_topics: Tuple[str, ...]
+    ai_topics: Tuple[str, ...]
+    organizations: Tuple[str, ...]
+    emojis: Tuple[str, ...]
+    emoji_set: FrozenSet[str]
+    hpc_templates: Tuple[str, ...]
+    ai_templates: Tuple[str, ...]
+    hpc_compiled: Tuple[CompiledTemplate, ...]
+    ai_compiled: Tuple[CompiledTemplate, ...]
+
+
+def catalog_language(language: str) -> str:
+    """Map a content language to the catalog that serves it."""
+    return "zh" if language == "zh" else "en"
+
+
+@lru_cache(maxsize=None)
+def _build_catalog(language: str) -> ContentCatalog:
+    hpc_templates, ai_templates = TEMPLATES[language]
+    return ContentCatalog(
+        language=language,
+        hpc_topics=HPC_TOPICS,
+        ai_topics=AI_TOPICS,
+        organizations=ORGANIZATIONS,
+        emojis=EMOJIS,
+        emoji_set=frozenset(EMOJIS),
+        hpc_templates=hpc_templates,
+        ai_templates=ai_templates,
+        hpc_compiled=tuple(compile_templates(hpc_templates)),
+        ai_compiled=tuple(compile_templates(ai_templates)),
+    )
+
+
+def get_catalog(language: str = "en") -> ContentCatalog:
+    """
+    Get the shared catalog for a language.
+
+    Each catalog is built (and its templates compiled) once per process and
+    then shared by every ContentGenerator.
+
+    Args:
+        language: Content language ('zh' for Chinese, anything else English)
+
+    Returns:
+        ContentCatalog instance
+    """
+    return _build_catalog(catalog_language(language))
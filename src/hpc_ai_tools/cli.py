@@ -4,13 +4,20 @@ HPC/AI Tools Command Line Interface
 """
 
 import argparse
+import json
 import sys
 import os
+from itertools import islice
 from pathlib import Path
 from typing import Optional
 
-from .content_generator import ContentGenerator
-from .x_poster import XPoster
+from .content_generator import STREAM_CHUNK_SIZE, ContentGenerator
+from .log_setup import configure_logging
+from .metrics import start_textfile_exporter
+from .tracing import configure_tracing
+
+# XPoster (sqlite stores) and the process-pool helpers (numpy) are imported
+# inside the commands that need them to keep CLI start-up fast.
 
 
 def setup_parser() -> argparse.ArgumentParser:
@@ -22,12 +29,39 @@ def setup_parser() -> argparse.ArgumentParser:
 Examples:
   %(prog)s generate                    # Generate HPC/AI content
   %(prog)s generate --output content.txt  # Save to file
+  %(prog)s generate --count 10000 -o batch.txt  # Bulk generation
+  %(prog)s generate --stream --format jsonl | scorer  # Endless feed
+  %(prog)s generate -n 1000000 --workers 8 --seed 42 -o big.txt  # Parallel, replayable
+  %(prog)s generate --unique -n 5      # Next posts of a no-repeat walk
   %(prog)s post --mock                 # Test publishing (dry run)
   %(prog)s post --real                 # Real publishing (requires API keys)
+  %(prog)s generate --stream -f jsonl -n 50 | %(prog)s post --from-queue - --concurrency 8
+  %(prog)s generate -n 20 --enqueue     # Queue posts in the durable outbox
+  %(prog)s drain --mode real --follow  # Publish queued posts (run several to scale)
+  %(prog)s stats                       # Posting totals
+  %(prog)s stats --since 2024-05-01 --group-by day  # Posts per day from the history
+  %(prog)s bench -o results.json       # Benchmarks; fails on a regression vs the baseline
+  %(prog)s post --mock --profile       # Print the hottest functions of a run
+  %(prog)s post --real --trace post.json  # Span timeline for Perfetto (ui.perfetto.dev)
+  %(prog)s generate -n 100000 -o big.txt --profile=mem  # Top allocations in big.txt.mem.txt
   %(prog)s setup                       # Setup configuration
         """,
     )
 
+    profile_help = (
+        "Profile the command: cpu (cProfile, .pstats file) or mem (tracemalloc "
+        "top allocations); saved next to --output or in PROFILE_DIR (default: cpu)"
+    )
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const="cpu",
+        choices=["cpu", "mem"],
+        help=profile_help,
+    )
+    trace_help = "Record pipeline spans to FILE as Chrome trace-event JSON (default: TRACE_FILE)"
+    parser.add_argument("--trace", metavar="FILE", type=str, help=trace_help)
+
     subparsers = parser.add_subparsers(dest="command", help="Command to execute")
 
     # Generate command
@@ -45,6 +79,59 @@ Examples:
         default="both",
         help="Time of day for content (default: both)",
     )
+    gen_parser.add_argument(
+        "--count",
+        "-n",
+        type=int,
+        help="Number of posts to generate per time slot in one batch",
+    )
+    # Output modes; at most one may be given
+    gen_mode = gen_parser.add_mutually_exclusive_group()
+    gen_mode.add_argument(
+        "--stream",
+        action="store_true",
+        help="Write records as they are generated (endless unless --count is set)",
+    )
+    gen_parser.add_argument(
+        "--format",
+        "-f",
+        choices=["text", "jsonl"],
+        default="text",
+        help="Record format for --stream and --unique (default: text)",
+    )
+    gen_parser.add_argument(
+        "--workers",
+        "-w",
+        type=int,
+        default=1,
+        help="Worker processes for --count generation (0 = all CPUs, default: 1)",
+    )
+    gen_parser.add_argument(
+        "--seed",
+        type=int,
+        help="Random seed; the same seed reproduces the same output",
+    )
+    gen_mode.add_argument(
+        "--unique",
+        action="store_true",
+        help="Take the next --count posts (default 1) from a seeded walk over all "
+        "combinations that never repeats",
+    )
+    gen_parser.add_argument(
+        "--cursor-file",
+        type=str,
+        help="Walk position file for --unique (default: logs/content_cursor.json)",
+    )
+    gen_parser.add_argument(
+        "--skip-posted",
+        action="store_true",
+        help="Skip content already in the posted-content index (single posts and --stream)",
+    )
+    gen_mode.add_argument(
+        "--enqueue",
+        action="store_true",
+        help="Add --count posts (default 1) per slot to the outbox instead of printing them",
+    )
     gen_parser.add_argument(
         "--verbose", "-v", action="store_true", help="Verbose output"
     )
@@ -65,6 +152,185 @@ Examples:
         help="Content file to post (default: generates new content)",
     )
     post_parser.add_argument(
+        "--image",
+        metavar="PATH",
+        action="append",
+        help="Attach a media file (repeat for up to 4 images)",
+    )
+    post_parser.add_argument(
+        "--thread",
+        action="store_true",
+        help="Post content longer than MAX_TWEET_LENGTH as a numbered reply thread",
+    )
+    post_parser.add_argument(
+        "--from-queue",
+        metavar="FILE",
+        type=str,
+        help="Post every JSONL record ('content' field) from FILE, or '-' for stdin",
+    )
+    post_parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=4,
+        help="Requests in flight with --from-queue (default: 4)",
+    )
+    post_parser.add_argument(
+        "--enqueue",
+        action="store_true",
+        help="Add the content to the outbox for 'drain' instead of posting it now",
+    )
+    post_parser.add_argument(
+        "--verbose", "-v", action="store_true", help="Verbose output"
+    )
+
+    # Drain command
+    drain_parser = subparsers.add_parser(
+        "drain", help="Publish posts waiting in the outbox"
+    )
+    drain_parser.add_argument(
+        "--mode",
+        "-m",
+        choices=["mock", "real"],
+        default="mock",
+        help="Publishing mode (default: mock)",
+    )
+    drain_parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=10,
+        help="Items claimed and committed together (default: 10)",
+    )
+    drain_parser.add_argument(
+        "--follow",
+        action="store_true",
+        help="Keep polling for new items instead of exiting when the outbox is empty",
+    )
+    drain_parser.add_argument(
+        "--poll-interval",
+        type=float,
+        default=5.0,
+        help="Seconds between polls with --follow (default: 5)",
+    )
+    drain_parser.add_argument(
+        "--worker-id",
+        type=str,
+        help="Lease owner name (default: host:pid)",
+    )
+    drain_parser.add_argument(
+        "--requeue-dead",
+        action="store_true",
+        help="Move dead-lettered items back to pending before draining",
+    )
+    drain_parser.add_argument(
+        "--verbose", "-v", action="store_true", help="Verbose output"
+    )
+
+    # Serve command
+    serve_parser = subparsers.add_parser(
+        "serve",
+        help="Run the daily generate/post schedule in one long-lived process",
+    )
+    serve_parser.add_argument(
+        "--mode",
+        "-m",
+        choices=["mock", "real"],
+        default="mock",
+        help="Publishing mode (default: mock)",
+    )
+    serve_parser.add_argument(
+        "--verbose", "-v", action="store_true", help="Verbose output"
+    )
+
+    # Serve-api command
+    api_parser = subparsers.add_parser(
+        "serve-api", help="Serve generated posts over HTTP (GET /generate)"
+    )
+    api_parser.add_argument(
+        "--host",
+        type=str,
+        default="127.0.0.1",
+        help="Address to listen on (default: 127.0.0.1)",
+    )
+    api_parser.add_argument(
+        "--port",
+        "-p",
+        type=int,
+        default=8080,
+        help="Port to listen on (default: 8080)",
+    )
+    api_parser.add_argument(
+        "--verbose", "-v", action="store_true", help="Verbose output"
+    )
+
+    # Stats command
+    stats_parser = subparsers.add_parser("stats", help="Show posting statistics")
+    stats_parser.add_argument(
+        "--rebuild",
+        action="store_true",
+        help="Recompute the running counters from the post history and legacy logs",
+    )
+    stats_parser.add_argument(
+        "--since",
+        type=str,
+        help="Query the post history from this date/time (ISO 8601, inclusive)",
+    )
+    stats_parser.add_argument(
+        "--until",
+        type=str,
+        help="Query the post history up to this date/time (ISO 8601, exclusive)",
+    )
+    stats_parser.add_argument(
+        "--group-by",
+        choices=["day", "mode", "focus"],
+        help="Summarize the post history by day, mode or focus",
+    )
+    stats_parser.add_argument(
+        "--verbose", "-v", action="store_true", help="Verbose output"
+    )
+
+    # Bench command
+    bench_parser = subparsers.add_parser(
+        "bench", help="Run the benchmark suite and compare it with the baseline"
+    )
+    bench_parser.add_argument(
+        "--only",
+        metavar="NAME",
+        action="append",
+        help="Run only this benchmark (repeatable; default: all)",
+    )
+    bench_parser.add_argument(
+        "--records",
+        type=int,
+        help="Records in the synthetic post history (default: BENCH_LOG_RECORDS or 100000)",
+    )
+    bench_parser.add_argument(
+        "--repeat",
+        type=int,
+        default=5,
+        help="Timed rounds per benchmark (default: 5)",
+    )
+    bench_parser.add_argument(
+        "--output",
+        "-o",
+        type=str,
+        help="Write the results as JSON to this file ('-' for stdout)",
+    )
+    bench_parser.add_argument(
+        "--baseline",
+        type=str,
+        help="Baseline results (default: BENCH_BASELINE or benchmarks/baseline.json)",
+    )
+    bench_parser.add_argument(
+        "--threshold",
+        type=float,
+        help="Allowed slowdown before failing, as a fraction (default: BENCH_THRESHOLD or 0.5)",
+    )
+    bench_parser.add_argument(
+        "--update-baseline",
+        action="store_true",
+        help="Save the results as the new baseline instead of comparing",
+    )
+    bench_parser.add_argument(
         "--verbose", "-v", action="store_true", help="Verbose output"
     )
 
@@ -90,13 +356,254 @@ Examples:
         "--verbose", "-v", action="store_true", help="Verbose output"
     )
 
+    # Also accept --profile and --trace after the subcommand; SUPPRESS
+    # keeps a subcommand from resetting an option given before it
+    for subparser in subparsers.choices.values():
+        subparser.add_argument(
+            "--profile",
+            nargs="?",
+            const="cpu",
+            choices=["cpu", "mem"],
+            default=argparse.SUPPRESS,
+            help=profile_help,
+        )
+        subparser.add_argument(
+            "--trace", metavar="FILE", type=str, default=argparse.SUPPRESS, help=trace_help
+        )
+
     return parser
 
 
+POST_SEPARATOR = "\n" + "=" * 50 + "\n"
+
+TIME_SLOTS = {
+    "morning": ("hpc", "Morning"),
+    "afternoon": ("ai", "Afternoon"),
+}
+
+STREAM_BUFFER_SIZE = 64 * 1024
+
+
+def _selected_slots(args) -> list:
+    """Time slots selected by ``--time``."""
+    return ["morning", "afternoon"] if args.time == "both" else [args.time]
+
+
+def _generate_batches(generator: ContentGenerator, args) -> int:
+    """Generate ``args.count`` posts per selected time slot in bulk."""
+    from .parallel import generate_parallel, resolve_seed
+    
+    if args.count < 1:
+        print("❌ --count must be at least 1", file=sys.stderr)
+        return 1
+    if args.workers < 0:
+        print("❌ --workers must not be negative", file=sys.stderr)
+        return 1
+    
+    slots = _selected_slots(args)
+    seed = resolve_seed(args.seed)
+    if args.verbose:
+        print(f"🎲 Seed: {seed}", file=sys.stderr)
+    
+    for slot in slots:
+        focus, time_label = TIME_SLOTS[slot]
+        posts, _ = generate_parallel(
+            args.count,
+            focus=focus,
+            language=generator.language,
+            workers=args.workers or None,
+            seed=seed,
+        )
+        text = POST_SEPARATOR.join(posts) + "\n"
+        
+        if args.output:
+            output_path = Path(args.output)
+            if len(slots) > 1:
+                output_path = output_path.with_stem(f"{output_path.stem}_{slot}")
+            output_path.parent.mkdir(parents=True, exist_ok=True)
+            output_path.write_text(text, encoding="utf-8")
+            print(f"✅ {len(posts)} {slot} posts saved to: {output_path}")
+        else:
+            if args.verbose:
+                print(f"{time_label} Content ({len(posts)} posts):")
+                print("=" * 50)
+            sys.stdout.write(text)
+    
+    return 0
+
+
+def _format_record(record: dict, fmt: str) -> str:
+    """Serialize one generated record for stream output."""
+    if fmt == "jsonl":
+        return json.dumps(record, ensure_ascii=False) + "\n"
+    return record["content"] + POST_SEPARATOR
+
+
+def _stream_content(generator: ContentGenerator, args) -> int:
+    """
+    Stream generated records to stdout or ``args.output``.
+    
+    Records are pulled from ContentGenerator.iter_content one at a time and
+    written through a fixed-size buffer. Writes block when a downstream pipe
+    is full, which pauses generation, so memory stays constant regardless of
+    how slowly the consumer reads.
+    """
+    if args.count is not None and args.count < 1:
+        print("❌ --count must be at least 1", file=sys.stderr)
+        return 1
+    
+    streams = [
+        generator.iter_content(focus=TIME_SLOTS[slot][0], limit=args.count)
+        for slot in _selected_slots(args)
+    ]
+    # Interleave morning/afternoon records when both are requested
+    records = streams[0] if len(streams) == 1 else (
+        record for group in zip(*streams) for record in group
+    )
+    
+    if args.output:
+        output_path = Path(args.output)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        out = open(output_path, "w", encoding="utf-8", buffering=STREAM_BUFFER_SIZE)
+    else:
+        out = open(
+            sys.stdout.fileno(),
+            "w",
+            encoding="utf-8",
+            buffering=STREAM_BUFFER_SIZE,
+            closefd=False,
+        )
+    
+    written = 0
+    try:
+        with out:
+            for record in records:
+                out.write(_format_record(record, args.format))
+                written += 1
+                if written % STREAM_CHUNK_SIZE == 0:
+                    # Hand complete chunks downstream promptly
+                    out.flush()
+    except BrokenPipeError:
+        # Reader went away (e.g. `| head`); point stdout at devnull so the
+        # interpreter's final flush does not raise again
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, sys.stdout.fileno())
+        return 0
+    except KeyboardInterrupt:
+        return 130
+    
+    if args.output:
+        print(f"✅ {written} records streamed to: {args.output}", file=sys.stderr)
+    return 0
+
+
+def _generate_unique(generator: ContentGenerator, args) -> int:
+    """
+    Emit the next posts of each slot's no-repeat walk and advance its cursor.
+    
+    The cursor is saved only after the output is written, so an interrupted
+    run does not skip content.
+    """
+    from .enumerator import EnumerationCursor
+    
+    count = args.count if args.count is not None else 1
+    if count < 1:
+        print("❌ --count must be at least 1", file=sys.stderr)
+        return 1
+    
+    cursor = EnumerationCursor(args.cursor_file)
+    chunks = []
+    
+    for slot in _selected_slots(args):
+        focus, _ = TIME_SLOTS[slot]
+        key = f"{generator.catalog.language}:{focus}"
+        size = generator.length_index(focus).feasible
+        wanted = count
+        if wanted > size:
+            print(
+                f"⚠️  Only {size} distinct {focus} posts exist; emitting {size}",
+                file=sys.stderr,
+            )
+            wanted = size
+        # A run that wraps into a new epoch must not repeat its own output
+        emitted = set()
+        
+        while len(emitted) < wanted:
+            seed, position = cursor.get(key, size, seed=args.seed)
+            walk = generator.iter_unique(focus, seed=seed, start=position)
+            budget = wanted - len(emitted)
+            walked = fresh = 0
+            for record in islice(walk, budget):
+                walked += 1
+                cursor.advance(key, record["position"] + 1)
+                if record["content"] in emitted:
+                    continue
+                emitted.add(record["content"])
+                chunks.append(_format_record(record, args.format))
+                fresh += 1
+            
+            if walked < budget:
+                # Walk ran out; the next cursor.get starts a new epoch
+                cursor.advance(key, size)
+                if fresh == 0 and position == 0:
+                    print(f"⚠️  No unposted {focus} content left", file=sys.stderr)
+                    break
+    
+    text = "".join(chunks)
+    if args.output:
+        output_path = Path(args.output)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        output_path.write_text(text, encoding="utf-8")
+        print(f"✅ {len(chunks)} unique posts saved to: {output_path}")
+    else:
+        sys.stdout.write(text)
+    
+    cursor.save()
+    return 0
+
+
+def _enqueue_generated(generator: ContentGenerator, args) -> int:
+    """Add ``args.count`` new posts per selected time slot to the outbox."""
+    from .outbox import Outbox
+    
+    count = args.count if args.count is not None else 1
+    if count < 1:
+        print("❌ --count must be at least 1", file=sys.stderr)
+        return 1
+    
+    outbox = Outbox()
+    try:
+        for slot in _selected_slots(args):
+            focus, _ = TIME_SLOTS[slot]
+            records = generator.iter_content(focus=focus, limit=count)
+            ids = outbox.enqueue((record["content"] for record in records), focus=focus)
+            print(f"✅ Enqueued {len(ids)} {slot} posts to: {outbox.path}")
+    finally:
+        outbox.close()
+    return 0
+
+
 def command_generate(args) -> int:
     """Handle generate command."""
     try:
-        generator = ContentGenerator()
+        post_index = None
+        if args.skip_posted:
+            from .post_index import PostIndex
+            
+            post_index = PostIndex()
+        generator = ContentGenerator(seed=args.seed, post_index=post_index)
+        
+        if args.enqueue:
+            return _enqueue_generated(generator, args)
+        
+        if args.stream:
+            return _stream_content(generator, args)
+        
+        if args.unique:
+            return _generate_unique(generator, args)
+        
+        if args.count is not None:
+            return _generate_batches(generator, args)
         
         if args.time == "both":
             morning_content = generator.generate_morning_content()
@@ -161,9 +668,149 @@ def command_generate(args) -> int:
         return 1
 
 
+def _read_queue_records(source: str, skipped: Optional[list] = None):
+    """
+    Yield (key, content, focus) records from a JSONL file or stdin.
+    
+    Lines that are not JSON, or objects without a string 'content', are
+    reported on stderr and skipped; their line numbers are appended to
+    ``skipped`` when given.
+    """
+    stream = sys.stdin if source == "-" else open(source, encoding="utf-8")
+    try:
+        for line_no, line in enumerate(stream, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as e:
+                reason = f"not JSON ({e})"
+            else:
+                if not isinstance(record, dict):
+                    yield line_no, str(record), None
+                    continue
+                if isinstance(record.get("content"), str):
+                    yield record.get("id", line_no), record["content"], record.get("focus")
+                    continue
+                reason = "no 'content' string"
+            print(f"⚠️  Skipping {source} line {line_no}: {reason}", file=sys.stderr)
+            if skipped is not None:
+                skipped.append(line_no)
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+
+async def _drain_queue_source(async_poster, records, on_result) -> list:
+    """Feed records into a bounded queue while AsyncXPoster drains it."""
+    import asyncio
+    
+    queue: asyncio.Queue = asyncio.Queue(maxsize=async_poster.concurrency * 2)
+    loop = asyncio.get_running_loop()
+    
+    async def produce() -> None:
+        try:
+            while True:
+                # Reading stdin blocks, so keep it off the event loop
+                item = await loop.run_in_executor(None, next, records, None)
+                if item is None:
+                    break
+                await queue.put(item)
+        finally:
+            # Always stop the workers (each passes the signal on), or a
+            # failed read would leave them waiting forever
+            await queue.put(None)
+    
+    producer = asyncio.create_task(produce())
+    results = await async_poster.run(queue, on_result=on_result)
+    # Re-raises a read error once the queued items are done
+    await producer
+    return results
+
+
+def _post_from_queue(args) -> int:
+    """Post queued records with bounded concurrency."""
+    import asyncio
+    
+    from .async_poster import AsyncXPoster
+    from .x_poster import XPoster
+    
+    if args.concurrency < 1:
+        print("❌ --concurrency must be at least 1", file=sys.stderr)
+        return 1
+    if args.from_queue != "-" and not Path(args.from_queue).exists():
+        print(f"❌ Queue file not found: {args.from_queue}", file=sys.stderr)
+        return 1
+    
+    poster = XPoster(mock_mode=args.mode == "mock")
+    async_poster = AsyncXPoster(poster, concurrency=args.concurrency)
+    
+    def report(result) -> None:
+        if result.success:
+            print(f"✅ [{result.key}] {result.message} ({result.latency:.2f}s)")
+        else:
+            print(f"❌ [{result.key}] {result.message}", file=sys.stderr)
+    
+    skipped: list = []
+    try:
+        records = _read_queue_records(args.from_queue, skipped)
+        results = asyncio.run(_drain_queue_source(async_poster, records, report))
+    finally:
+        async_poster.close()
+    
+    failed = sum(1 for result in results if not result.success)
+    print(f"📊 Posted {len(results) - failed}/{len(results)} items")
+    if skipped:
+        print(f"⚠️  Skipped {len(skipped)} unreadable lines", file=sys.stderr)
+    return 1 if failed or skipped else 0
+
+
+def _enqueue_posts(args) -> int:
+    """Add ``--content`` or ``--from-queue`` records to the outbox."""
+    from .outbox import Outbox
+    
+    skipped: list = []
+    if args.from_queue:
+        if args.from_queue != "-" and not Path(args.from_queue).exists():
+            print(f"❌ Queue file not found: {args.from_queue}", file=sys.stderr)
+            return 1
+        contents = (content for _, content, _ in _read_queue_records(args.from_queue, skipped))
+        focus = None
+    elif args.content:
+        content_path = Path(args.content)
+        if not content_path.exists():
+            print(f"❌ Content file not found: {content_path}", file=sys.stderr)
+            return 1
+        contents = [content_path.read_text(encoding="utf-8")]
+        focus = None
+    else:
+        contents = [ContentGenerator().generate_morning_content()]
+        focus = "hpc"
+    
+    outbox = Outbox()
+    try:
+        ids = outbox.enqueue(contents, focus=focus)
+    finally:
+        outbox.close()
+    print(f"✅ Enqueued {len(ids)} posts to: {outbox.path}")
+    if skipped:
+        print(f"⚠️  Skipped {len(skipped)} unreadable lines", file=sys.stderr)
+        return 1
+    return 0
+
+
 def command_post(args) -> int:
     """Handle post command."""
+    from .x_poster import XPoster
+    
     try:
+        if args.enqueue:
+            return _enqueue_posts(args)
+        
+        if args.from_queue:
+            return _post_from_queue(args)
+        
         poster = XPoster()
         
         if args.content:
@@ -172,22 +819,35 @@ def command_post(args) -> int:
                 print(f"❌ Content file not found: {content_path}", file=sys.stderr)
                 return 1
             content = content_path.read_text(encoding="utf-8")
+            focus = None
         else:
-            # Generate new content
-            generator = ContentGenerator()
+            # Generate new content that has not been posted yet
+            generator = ContentGenerator(post_index=poster.post_index)
             content = generator.generate_morning_content()
+            focus = "hpc"
             if args.verbose:
                 print("📝 Generated content for posting:")
                 print(content)
         
-        if args.mode == "real":
+        if args.thread:
+            if args.image:
+                print("❌ --image cannot be combined with --thread", file=sys.stderr)
+                return 1
+            success, message = poster.post_thread(
+                content, mock=args.mode == "mock", focus=focus
+            )
+        elif args.image:
+            success, message = poster.post_with_images(
+                content, args.image, mock=args.mode == "mock", focus=focus
+            )
+        elif args.mode == "real":
             if args.verbose:
                 print("🚀 Posting to X (real mode)...")
-            success, message = poster.post_to_x(content, mock=False)
+            success, message = poster.post_to_x(content, mock=False, focus=focus)
         else:
             if args.verbose:
                 print("🧪 Testing X posting (mock mode)...")
-            success, message = poster.post_to_x(content, mock=True)
+            success, message = poster.post_to_x(content, mock=True, focus=focus)
         
         if success:
             print(f"✅ {message}")
@@ -204,6 +864,256 @@ def command_post(args) -> int:
         return 1
 
 
+def command_drain(args) -> int:
+    """Handle drain command."""
+    from .outbox import Outbox, OutboxWorker
+    from .x_poster import XPoster
+    
+    if args.batch_size < 1:
+        print("❌ --batch-size must be at least 1", file=sys.stderr)
+        return 1
+    
+    try:
+        outbox = Outbox()
+        if args.requeue_dead:
+            print(f"♻️  Requeued {outbox.requeue_dead()} dead-lettered posts")
+        
+        poster = XPoster(mock_mode=args.mode == "mock")
+        worker = OutboxWorker(
+            outbox, poster, worker_id=args.worker_id, batch_size=args.batch_size
+        )
+        if args.verbose:
+            print(f"🚚 Draining {outbox.path} as {worker.worker_id}")
+        
+        try:
+            totals = worker.run(follow=args.follow, poll_interval=args.poll_interval)
+            counts = outbox.counts()
+        except KeyboardInterrupt:
+            # Unfinished leases expire and are picked up by the next worker
+            return 130
+        finally:
+            outbox.close()
+        
+        print(f"📊 Posted {totals['posted']}, failed {totals['failed']}")
+        print(
+            "📦 Outbox: " + ", ".join(f"{status} {n}" for status, n in counts.items())
+        )
+        return 1 if totals["failed"] else 0
+        
+    except Exception as e:
+        print(f"❌ Error draining outbox: {e}", file=sys.stderr)
+        if args.verbose:
+            import traceback
+            traceback.print_exc()
+        return 1
+
+
+def command_serve(args) -> int:
+    """Handle serve command."""
+    from .outbox import Outbox, OutboxWorker
+    from .scheduler import Scheduler, jobs_from_env
+    from .x_poster import XPoster
+    
+    try:
+        # Built once and kept warm for every scheduled run
+        poster = XPoster(mock_mode=args.mode == "mock")
+        generator = ContentGenerator(post_index=poster.post_index)
+        outbox = Outbox()
+        worker = OutboxWorker(outbox, poster)
+        
+        def enqueue(slot: str):
+            focus, _ = TIME_SLOTS[slot]
+            make = getattr(generator, f"generate_{slot}_content")
+            return lambda: outbox.enqueue([make()], focus=focus)
+        
+        try:
+            scheduler = Scheduler(jobs_from_env({
+                "generate_morning": enqueue("morning"),
+                "generate_afternoon": enqueue("afternoon"),
+                "post_morning": worker.run,
+                "post_afternoon": worker.run,
+            }))
+            
+            def started():
+                mode_str = "mock" if poster.mock_mode else "real"
+                print(f"🕒 Serving in {mode_str} mode (Ctrl+C to stop)", flush=True)
+                if args.verbose:
+                    for job in scheduler.jobs:
+                        print(f"   {job.name}: daily at {job.at:%H:%M}", flush=True)
+            
+            scheduler.run(on_start=started)
+        finally:
+            outbox.close()
+        print("👋 Stopped")
+        return 0
+        
+    except Exception as e:
+        print(f"❌ Error running scheduler: {e}", file=sys.stderr)
+        if args.verbose:
+            import traceback
+            traceback.print_exc()
+        return 1
+
+
+def command_serve_api(args) -> int:
+    """Handle serve-api command."""
+    from .api_server import run_server
+    
+    def started(server):
+        print(f"🌐 Serving GET /generate on http://{server.host}:{server.port} (Ctrl+C to stop)", flush=True)
+    
+    try:
+        run_server(args.host, args.port, on_start=started)
+        print("👋 Stopped")
+        return 0
+        
+    except Exception as e:
+        print(f"❌ Error running API server: {e}", file=sys.stderr)
+        if args.verbose:
+            import traceback
+            traceback.print_exc()
+        return 1
+
+
+def _parse_time(value: Optional[str]):
+    """Parse an ISO 8601 date or date-time; naive values are local time."""
+    from datetime import datetime
+    
+    if value is None:
+        return None
+    parsed = datetime.fromisoformat(value)
+    return parsed if parsed.tzinfo else parsed.astimezone()
+
+
+def _history_report(args) -> int:
+    """Summarize the post history over a time range."""
+    from .history import PostHistory
+    
+    try:
+        since = _parse_time(args.since)
+        until = _parse_time(args.until)
+    except ValueError as e:
+        print(f"❌ Invalid date: {e}", file=sys.stderr)
+        return 1
+    
+    group_by = args.group_by or "day"
+    summary = PostHistory().aggregate(since, until, group_by)
+    
+    print(f"📊 Post history by {group_by}:")
+    if not summary:
+        print("  (no records in range)")
+        return 0
+    print(f"  {group_by:<12} {'posts':>7} {'errors':>7} {'avg len':>8} {'avg latency':>12}")
+    for key, row in summary.items():
+        latency = f"{row['avg_latency']:.3f}s" if row["avg_latency"] is not None else "-"
+        print(
+            f"  {key:<12} {row['posts']:>7} {row['errors']:>7} "
+            f"{row['avg_length']:>8.1f} {latency:>12}"
+        )
+    return 0
+
+
+def command_stats(args) -> int:
+    """Handle stats command."""
+    from .history import PostHistory
+    from .journal import flush_journals
+    from .post_stats import PostCounters
+    from .x_poster import ERROR_LOG, TWEET_LOG
+    
+    try:
+        if args.since or args.until or args.group_by:
+            flush_journals()
+            return _history_report(args)
+        
+        counters = PostCounters()
+        if args.rebuild:
+            flush_journals()
+            history = PostHistory()
+            stats = counters.rebuild(history, TWEET_LOG, ERROR_LOG)
+            print(f"♻️  Rebuilt counters from {history.path}")
+        else:
+            stats = counters.snapshot()
+        counters.close()
+        
+        print("📊 Posting Statistics:")
+        for key, value in stats.items():
+            print(f"  {key}: {value}")
+        return 0
+        
+    except Exception as e:
+        print(f"❌ Error reading statistics: {e}", file=sys.stderr)
+        if args.verbose:
+            import traceback
+            traceback.print_exc()
+        return 1
+
+
+def command_bench(args) -> int:
+    """Handle bench command."""
+    import tempfile
+    from .bench import (
+        compare,
+        default_baseline_path,
+        format_result,
+        load_results,
+        run_benchmarks,
+        save_results,
+    )
+    
+    try:
+        baseline_path = Path(args.baseline) if args.baseline else default_baseline_path()
+        baseline = None if args.update_baseline else load_results(baseline_path)
+        reference = baseline["benchmarks"] if baseline else {}
+        # The table goes to stderr when stdout carries the JSON
+        out = sys.stderr if args.output == "-" else sys.stdout
+        
+        def report(name, result):
+            print(format_result(name, result, reference.get(name)), file=out, flush=True)
+        
+        print(f"⏱️  Running benchmarks (time per call, best of {args.repeat} rounds)", file=out)
+        with tempfile.TemporaryDirectory(prefix="hpc-ai-bench-") as workdir:
+            results = run_benchmarks(
+                Path(workdir),
+                names=args.only,
+                records=args.records,
+                repeat=args.repeat,
+                on_result=report,
+            )
+        
+        if args.output == "-":
+            print(json.dumps(results, indent=2))
+        elif args.output:
+            save_results(results, Path(args.output))
+            print(f"💾 Results saved to {args.output}")
+        
+        if args.update_baseline:
+            save_results(results, baseline_path)
+            print(f"📌 Baseline updated: {baseline_path}", file=out)
+            return 0
+        if baseline is None:
+            print(f"ℹ️  No baseline at {baseline_path}; run with --update-baseline to create one", file=out)
+            return 0
+        
+        regressions = compare(results, baseline, args.threshold)
+        for regression in regressions:
+            print(
+                f"❌ {regression.name} regressed {regression.change:+.1%} "
+                f"({regression.baseline_us:.2f} us -> {regression.current_us:.2f} us)",
+                file=out,
+            )
+        if regressions:
+            return 1
+        print(f"✅ No regressions against {baseline_path}", file=out)
+        return 0
+        
+    except Exception as e:
+        print(f"❌ Error running benchmarks: {e}", file=sys.stderr)
+        if args.verbose:
+            import traceback
+            traceback.print_exc()
+        return 1
+
+
 def command_setup(args) -> int:
     """Handle setup command."""
     try:
@@ -259,6 +1169,13 @@ def command_test(args) -> int:
                     print("   ✅ Content generator working")
                     print(f"   📝 Morning content length: {len(morning)} chars")
                     print(f"   📝 Afternoon content length: {len(afternoon)} chars")
+                    for focus in ("hpc", "ai"):
+                        stats = generator.length_stats(focus)
+                        print(
+                            f"   📏 {focus}: {stats['feasible']}/{stats['combinations']} "
+                            f"combinations fit, {stats['truncation_rate']:.1%} would "
+                            f"have been truncated"
+                        )
                     tests_passed += 1
                 else:
                     print("   ❌ Content generator failed")
@@ -271,6 +1188,8 @@ def command_test(args) -> int:
         if args.component in ["all", "poster"]:
             print("\n2. Testing X Poster...")
             try:
+                from .x_poster import XPoster
+                
                 poster = XPoster()
                 test_content = "Test content from HPC/AI Tools"
                 success, message = poster.post_to_x(test_content, mock=True)
@@ -289,9 +1208,6 @@ def command_test(args) -> int:
         if args.component in ["all", "config"]:
             print("\n3. Testing Configuration...")
             try:
-                from dotenv import load_dotenv
-                load_dotenv()
-                
                 # Check for required environment variables
                 required_vars = ["X_API_KEY", "X_API_SECRET", "X_ACCESS_TOKEN", "X_ACCESS_TOKEN_SECRET"]
                 missing_vars = [var for var in required_vars if not os.getenv(var)]
@@ -328,25 +1244,60 @@ def command_test(args) -> int:
         return 1
 
 
+def _expand_profile_flag(argv: list) -> list:
+    """
+    Spell a bare --profile as --profile=cpu, so that before the subcommand
+    it does not take the subcommand name as its mode.
+    """
+    return [
+        "--profile=cpu"
+        if arg == "--profile" and (i + 1 == len(argv) or argv[i + 1] not in ("cpu", "mem"))
+        else arg
+        for i, arg in enumerate(argv)
+    ]
+
+
 def main() -> int:
     """Main entry point for CLI."""
     parser = setup_parser()
-    args = parser.parse_args()
+    args = parser.parse_args(_expand_profile_flag(sys.argv[1:]))
     
     if not args.command:
         parser.print_help()
         return 0
     
+    # .env settings apply to every command; variables already set win
+    from dotenv import find_dotenv, load_dotenv
+    
+    load_dotenv(find_dotenv(usecwd=True))
+    
+    # Package logs go to LOG_FILE; the library itself never configures logging
+    configure_logging()
+    # Metrics snapshots for node_exporter, if METRICS_TEXTFILE_DIR is set
+    start_textfile_exporter()
+    # Spans are written to the trace file at exit
+    configure_tracing(args.trace)
+    
     # Dispatch to appropriate command handler
     command_handlers = {
         "generate": command_generate,
         "post": command_post,
+        "drain": command_drain,
+        "serve": command_serve,
+        "serve-api": command_serve_api,
+        "stats": command_stats,
+        "bench": command_bench,
         "setup": command_setup,
         "test": command_test,
     }
     
     handler = command_handlers.get(args.command)
     if handler:
+        if args.profile:
+            from .profiling import profile_path, run_profiled
+            
+            path = profile_path(args.command, args.profile, getattr(args, "output", None))
+            return run_profiled(lambda: handler(args), args.profile, path)
         return handler(args)
     else:
         print(f"❌ Unknown command: {args.command}", file=sys.stderr)
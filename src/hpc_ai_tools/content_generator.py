@@ -4,146 +4,75 @@ HPC/AI Content Generator
 
 import random
 import os
-from datetime import datetime
-from typing import List, Dict, Optional, Tuple
+from typing import TYPE_CHECKING, Any, Iterator, List, Dict, Optional, Sequence, Tuple
 import logging
-from dotenv import load_dotenv
 
-# Load environment variables
-load_dotenv()
+from .catalog import get_catalog
+from .enumerator import ContentSpace, FeistelPermutation
+from .length_index import LengthIndex
+from .metrics import POSTS_GENERATED, TRUNCATIONS
+from .templates import CompiledTemplate
+from .tracing import TRACER
+
+if TYPE_CHECKING:
+    import numpy as np
+    from .post_index import PostIndex
+    from .tracing import Stages
 
 logger = logging.getLogger(__name__)
 
+# Posts drawn per generate_batch call when streaming
+STREAM_CHUNK_SIZE = 1024
+
+# Redraws before giving up on finding content that was not posted yet
+MAX_DUPLICATE_DRAWS = 10
+
+# Length indexes shared by all generators, keyed by (language, focus, max_length)
+_LENGTH_INDEXES: Dict[Tuple[str, str, int], LengthIndex] = {}
+
 
 class ContentGenerator:
     """HPC/AI Content Generator"""
     
-    def __init__(self, language: str = "en"):
+    def __init__(
+        self,
+        language: str = "en",
+        seed: Optional[int] = None,
+        post_index: Optional["PostIndex"] = None,
+    ):
         """
         Initialize content generator.
         
         Args:
             language: Content language ('en' for English, 'zh' for Chinese)
+            seed: Seed for this generator's random streams (None for fresh entropy)
+            post_index: Index of posted content; when given, already posted
+                content is redrawn (single posts) or skipped (iter_content)
         """
         self.language = language or os.getenv("LANGUAGE", "en")
+        self.seed = seed
+        self.post_index = post_index
         self.max_length = int(os.getenv("MAX_TWEET_LENGTH", "280"))
         
-        # Initialize content databases
-        self._init_hpc_topics()
-        self._init_ai_topics()
-        self._init_organizations()
-        self._init_emojis()
-        self._init_templates()
+        # Content databases are shared, immutable and built once per language
+        self.catalog = get_catalog(self.language)
+        self.hpc_topics = self.catalog.hpc_topics
+        self.ai_topics = self.catalog.ai_topics
+        self.organizations = self.catalog.organizations
+        self.emojis = self.catalog.emojis
+        self.emoji_set = self.catalog.emoji_set
+        self.hpc_templates = self.catalog.hpc_templates
+        self.ai_templates = self.catalog.ai_templates
+        
+        # Per-instance random streams so runs can be replayed from a seed
+        self.rng = random.Random(seed)
+        self._batch_rng: Optional["np.random.Generator"] = None  # created on first batch
+        
+        # Posts that still had to be truncated (stays 0 for sampled content)
+        self.truncations = 0
         
         logger.info(f"ContentGenerator initialized with language: {self.language}")
     
-    def _init_hpc_topics(self) -> None:
-        """Initialize HPC topics database."""
-        self.hpc_topics = [
-            "Exascale Computing",
-            "Quantum-HPC Integration", 
-            "AI for Science",
-            "High Performance Data Analytics",
-            "Green Computing",
-            "HPC Cloud",
-            "GPU Computing",
-            "Storage Technologies",
-            "Interconnect Networks",
-            "Scientific Visualization",
-            "Edge Computing",
-            "Hybrid Computing",
-            "Memory Technologies",
-            "Parallel Algorithms",
-            "Workflow Management"
-        ]
-    
-    def _init_ai_topics(self) -> None:
-        """Initialize AI topics database."""
-        self.ai_topics = [
-            "Large Language Models",
-            "Computer Vision",
-            "Reinforcement Learning",
-            "Generative AI",
-            "Federated Learning",
-            "Explainable AI",
-            "AI Ethics",
-            "Edge AI",
-            "AI Hardware",
-            "Multimodal AI",
-            "Transfer Learning",
-            "Self-Supervised Learning",
-            "Neuro-Symbolic AI",
-            "AI Safety",
-            "AI Governance"
-        ]
-    
-    def _init_organizations(self) -> None:
-        """Initialize organizations database."""
-        self.organizations = [
-            "DOE (Department of Energy)",
-            "NSF (National Science Foundation)",
-            "CERN",
-            "NASA",
-            "Oak Ridge National Laboratory",
-            "Lawrence Livermore National Laboratory",
-            "Argonne National Laboratory",
-            "European HPC Centers",
-            "Chinese Supercomputing Centers",
-            "Japanese Research Institutions",
-            "MIT",
-            "Stanford University",
-            "Google Research",
-            "Microsoft Research",
-            "OpenAI"
-        ]
-    
-    def _init_emojis(self) -> None:
-        """Initialize emojis database."""
-        self.emojis = ["🚀", "🔬", "💻", "⚡", "🌍", "📈", "🔍", "🎯", "🤖", "🧠", "💡", "⚛️", "🔋", "📊", "🌐"]
-    
-    def _init_templates(self) -> None:
-        """Initialize content templates based on language."""
-        if self.language == "zh":
-            self._init_chinese_templates()
-        else:
-            self._init_english_templates()
-    
-    def _init_english_templates(self) -> None:
-        """Initialize English content templates."""
-        self.hpc_templates = [
-            "{emoji} {topic} breakthrough: {organization} reports significant performance improvements, accelerating scientific discovery.\n\n#HighPerformanceComputing #ScientificComputing",
-            "{emoji} {topic} technology analysis: New architecture shows excellent performance in {organization} tests, with improved energy efficiency.\n\nFollow cutting-edge computing infrastructure development!",
-            "{emoji} {topic} application case: {organization} uses this technology to solve complex scientific problems, dramatically reducing computation time.\n\n#HPC #ResearchInnovation",
-            "{emoji} Latest developments in {topic}: {organization} study reveals groundbreaking advances in computational capabilities.\n\n#Supercomputing #TechInnovation",
-            "{emoji} {topic} infrastructure update: {organization} deploys new system achieving record-breaking performance metrics.\n\n#HPCNews #Computing"
-        ]
-        
-        self.ai_templates = [
-            "{emoji} {topic} breakthrough: {organization} research team publishes latest results, achieving new performance heights.\n\n#ArtificialIntelligence #MachineLearning",
-            "{emoji} {topic} applications: Demonstrates powerful capabilities in real-world scenarios, validated by {organization}.\n\n#AI #TechnologyInnovation",
-            "{emoji} {topic} trend analysis: {organization} report indicates rapid development in this field with widespread industry applications.\n\nFollow AI frontier developments!",
-            "{emoji} Advancements in {topic}: {organization} researchers achieve state-of-the-art results in benchmark tests.\n\n#AIResearch #DeepLearning",
-            "{emoji} {topic} implementation: Successful deployment at {organization} shows promising results for future applications.\n\n#AITechnology #Innovation"
-        ]
-    
-    def _init_chinese_templates(self) -> None:
-        """Initialize Chinese content templates."""
-        self.hpc_templates = [
-            "{emoji} {topic}最新进展：{organization}报告显示性能提升显著，推动科学发现加速。\n\n#高性能计算 #科学计算",
-            "{emoji} {topic}技术解析：新型架构在{organization}测试中表现优异，能效比改善明显。\n\n关注前沿计算基础设施发展！",
-            "{emoji} {topic}应用案例：{organization}利用该技术解决复杂科学问题，计算时间大幅缩短。\n\n#HPC #科研创新",
-            "{emoji} {topic}基础设施更新：{organization}部署新系统，实现突破性性能指标。\n\n#超算 #技术创新",
-            "{emoji} {topic}研究动态：{organization}最新研究揭示计算能力重大进展。\n\n#高性能计算 #科技前沿"
-        ]
-        
-        self.ai_templates = [
-            "{emoji} {topic}突破：{organization}研究团队发布最新成果，模型性能达到新高度。\n\n#人工智能 #机器学习",
-            "{emoji} {topic}应用：在实际场景中展现强大能力，{organization}验证其有效性。\n\n#AI #技术创新",
-            "{emoji} {topic}趋势分析：{organization}报告指出该领域发展迅速，产业应用广泛。\n\n关注AI前沿动态！",
-            "{emoji} {topic}进展：{organization}研究人员在基准测试中取得最先进成果。\n\n#AI研究 #深度学习",
-            "{emoji} {topic}实施：在{organization}的成功部署显示未来应用前景广阔。\n\n#AI技术 #创新"
-        ]
-    
     def generate_morning_content(self) -> str:
         """
         Generate morning content (HPC focus).
@@ -172,34 +101,317 @@ class ContentGenerator:
         Returns:
             Generated content string
         """
-        if focus == "hpc":
-            topic = random.choice(self.hpc_topics)
-            template = random.choice(self.hpc_templates)
+        index = self.length_index(focus)
+        # One flag check when tracing is off
+        trace = TRACER.stages("generate_content", focus=focus) if TRACER.enabled else None
+        
+        for _ in range(MAX_DUPLICATE_DRAWS):
+            # Draw only among combinations that fit the length limit
+            code = index.codes[self.rng.randrange(index.feasible)]
+            if trace is None:
+                content = self.render_combination(index.space.decode(code), focus)
+            else:
+                content = self._render_traced(index.space.decode(code), focus, trace)
+            
+            fresh = self.post_index is None or not self.post_index.contains(content)
+            if trace is not None and self.post_index is not None:
+                trace.mark("dedupe")
+            if fresh:
+                break
         else:
-            topic = random.choice(self.ai_topics)
-            template = random.choice(self.ai_templates)
-        
-        organization = random.choice(self.organizations)
-        emoji = random.choice(self.emojis)
-        
-        # Fill template
-        content = template.format(
-            emoji=emoji,
-            topic=topic,
-            organization=organization,
-            date=datetime.now().strftime("%Y-%m-%d")
-        )
+            logger.warning(
+                f"No unposted {focus} content after {MAX_DUPLICATE_DRAWS} draws"
+            )
         
-        # Add hashtags
+        if trace is not None:
+            trace.end()
+        POSTS_GENERATED.inc(focus, self.language)
+        logger.info(f"Generated {focus} content: {content[:50]}...")
+        return content
+    
+    def _render_traced(self, components: Sequence[int], focus: str, trace: "Stages") -> str:
+        """render_combination() with a trace mark after each stage."""
+        topics, templates = self._focus_components(focus)
+        t, tpl, org, emo = components
+        topic = topics[t]
+        trace.mark("sample")
         hashtags = self._generate_hashtags(topic, focus)
-        content += f"\n\n{hashtags}"
-        
-        # Validate length
+        trace.mark("hashtags")
+        content = templates[tpl].render(
+            (self.emojis[emo], topic, self.organizations[org], hashtags)
+        )
+        trace.mark("render")
         content = self._validate_content_length(content)
-        
-        logger.info(f"Generated {focus} content: {content[:50]}...")
+        trace.mark("validate")
         return content
     
+    def _render_content(
+        self,
+        template: CompiledTemplate,
+        topic: str,
+        organization: str,
+        emoji: str,
+        hashtags: str,
+    ) -> str:
+        """
+        Fill a compiled template (hashtag line included) and validate the length.
+        
+        Args:
+            template: Compiled content template
+            topic: Content topic
+            organization: Organization name
+            emoji: Leading emoji
+            hashtags: Hashtag string
+            
+        Returns:
+            Rendered content string
+        """
+        content = template.render((emoji, topic, organization, hashtags))
+        return self._validate_content_length(content)
+    
+    def _focus_components(
+        self, focus: str
+    ) -> Tuple[Sequence[str], Sequence[CompiledTemplate]]:
+        """Return the (topics, compiled templates) for a content focus."""
+        if focus == "hpc":
+            return self.catalog.hpc_topics, self.catalog.hpc_compiled
+        return self.catalog.ai_topics, self.catalog.ai_compiled
+    
+    def generate_batch(
+        self, n: int, focus: str = "hpc", rng: Optional["np.random.Generator"] = None
+    ) -> Tuple[List[str], Dict[str, "np.ndarray"]]:
+        """
+        Generate many posts at once.
+        
+        Combinations are drawn for the whole batch as NumPy arrays from the
+        length index (so none needs truncating), and each distinct
+        combination is rendered only once no matter how often it was drawn.
+        
+        Args:
+            n: Number of posts to generate
+            focus: Content focus ('hpc' or 'ai')
+            rng: NumPy generator to draw from instead of the instance's own
+            
+        Returns:
+            Tuple of (posts, indices) where indices maps 'topic', 'template',
+            'organization' and 'emoji' to integer arrays of length n
+        """
+        # NumPy is only needed for bulk generation; keep it off the import path
+        import numpy as np
+        
+        if n < 0:
+            raise ValueError(f"Batch size must be non-negative, got {n}")
+        
+        topics, templates = self._focus_components(focus)
+        index = self.length_index(focus)
+        radices = index.space.radices
+        
+        if rng is None:
+            if self._batch_rng is None:
+                self._batch_rng = np.random.default_rng(self.seed)
+            rng = self._batch_rng
+        
+        # Each draw is one flat code, so duplicates collapse and render once
+        codes = index.as_array()[rng.integers(0, index.feasible, size=n)]
+        indices = dict(
+            zip(
+                ("topic", "template", "organization", "emoji"),
+                np.unravel_index(codes, radices),
+            )
+        )
+        unique_codes, inverse = np.unique(codes, return_inverse=True)
+        components = [a.tolist() for a in np.unravel_index(unique_codes, radices)]
+        
+        hashtags: Dict[int, str] = {}
+        rendered = []
+        for t, tpl, org, emo in zip(*components):
+            if t not in hashtags:
+                hashtags[t] = self._generate_hashtags(topics[t], focus)
+            rendered.append(
+                self._render_content(
+                    templates[tpl],
+                    topics[t],
+                    self.organizations[org],
+                    self.emojis[emo],
+                    hashtags[t],
+                )
+            )
+        
+        posts = [rendered[i] for i in inverse.tolist()]
+        POSTS_GENERATED.inc(focus, self.language, amount=n)
+        logger.info(f"Generated batch of {n} {focus} posts ({len(rendered)} distinct)")
+        return posts, indices
+    
+    def iter_content(
+        self,
+        focus: str = "hpc",
+        limit: Optional[int] = None,
+        chunk_size: int = STREAM_CHUNK_SIZE,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Lazily generate post records.
+        
+        Posts are produced ``chunk_size`` at a time through generate_batch,
+        so memory stays constant however many records are consumed. With a
+        post index, already posted content is skipped; the stream ends early
+        if a whole chunk turns out to be duplicates.
+        
+        Args:
+            focus: Content focus ('hpc' or 'ai')
+            limit: Number of records to yield (None for an endless stream)
+            chunk_size: Posts generated per internal batch
+            
+        Yields:
+            Dictionaries with 'focus', 'content' and the 'topic', 'template',
+            'organization' and 'emoji' indices
+        """
+        if chunk_size < 1:
+            raise ValueError(f"Chunk size must be positive, got {chunk_size}")
+        
+        produced = 0
+        while limit is None or produced < limit:
+            n = chunk_size if limit is None else min(chunk_size, limit - produced)
+            posts, indices = self.generate_batch(n, focus=focus)
+            columns = {name: values.tolist() for name, values in indices.items()}
+            
+            fresh = 0
+            for i, content in enumerate(posts):
+                if limit is not None and produced >= limit:
+                    break
+                if self.post_index is not None and self.post_index.contains(content):
+                    continue
+                record: Dict[str, Any] = {"focus": focus, "content": content}
+                for name, values in columns.items():
+                    record[name] = values[i]
+                yield record
+                fresh += 1
+                produced += 1
+            
+            if not fresh:
+                logger.warning(f"Stopping {focus} stream: only posted content left")
+                return
+    
+    def length_index(self, focus: str = "hpc") -> LengthIndex:
+        """
+        Get the index of combinations that fit ``max_length`` for a focus.
+        
+        Built from component lengths once per (language, focus, max_length)
+        and shared by all generators.
+        
+        Args:
+            focus: Content focus ('hpc' or 'ai')
+            
+        Returns:
+            LengthIndex instance
+            
+        Raises:
+            ValueError: If no combination fits ``max_length``
+        """
+        key = (self.catalog.language, focus, self.max_length)
+        index = _LENGTH_INDEXES.get(key)
+        if index is None:
+            topics, templates = self._focus_components(focus)
+            index = LengthIndex(
+                self.content_space(focus),
+                templates,
+                [len(topic) for topic in topics],
+                [len(self._generate_hashtags(topic, focus)) for topic in topics],
+                [len(organization) for organization in self.organizations],
+                [len(emoji) for emoji in self.emojis],
+                self.max_length,
+            )
+            if not index.feasible:
+                raise ValueError(
+                    f"No {focus} content fits MAX_TWEET_LENGTH={self.max_length}"
+                )
+            _LENGTH_INDEXES[key] = index
+        return index
+    
+    def length_stats(self, focus: str = "hpc") -> Dict[str, float]:
+        """
+        Report how often the truncation path fires or would have fired.
+        
+        Args:
+            focus: Content focus ('hpc' or 'ai')
+            
+        Returns:
+            LengthIndex.stats() plus 'truncations', the number of posts this
+            generator actually truncated
+        """
+        stats = self.length_index(focus).stats()
+        stats["truncations"] = self.truncations
+        return stats
+    
+    def content_space(self, focus: str = "hpc") -> ContentSpace:
+        """
+        Get the (topic, template, organization, emoji) space for a focus.
+        
+        Args:
+            focus: Content focus ('hpc' or 'ai')
+            
+        Returns:
+            ContentSpace over the catalog for this language and focus
+        """
+        topics, templates = self._focus_components(focus)
+        return ContentSpace(
+            (len(topics), len(templates), len(self.organizations), len(self.emojis))
+        )
+    
+    def render_combination(self, components: Sequence[int], focus: str = "hpc") -> str:
+        """
+        Render the post for one (topic, template, organization, emoji) tuple.
+        
+        Args:
+            components: Component indices as returned by ContentSpace.decode
+            focus: Content focus ('hpc' or 'ai')
+            
+        Returns:
+            Rendered content string
+        """
+        topics, templates = self._focus_components(focus)
+        t, tpl, org, emo = components
+        topic = topics[t]
+        return self._render_content(
+            templates[tpl],
+            topic,
+            self.organizations[org],
+            self.emojis[emo],
+            self._generate_hashtags(topic, focus),
+        )
+    
+    def iter_unique(
+        self, focus: str = "hpc", seed: int = 0, start: int = 0
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Walk the content space in a seeded order without repeats.
+        
+        The walk covers the combinations in the length index: position ``p``
+        is feasible combination ``FeistelPermutation(feasible, seed)(p)``,
+        so a walk can be resumed from its position alone. The iterator ends
+        once every combination has been produced.
+        
+        Args:
+            focus: Content focus ('hpc' or 'ai')
+            seed: Permutation seed
+            start: Position to resume from
+            
+        Yields:
+            Records like iter_content plus the walk 'position'
+        """
+        index = self.length_index(focus)
+        permutation = FeistelPermutation(index.feasible, seed)
+        
+        for position in range(start, index.feasible):
+            components = index.space.decode(index.codes[permutation(position)])
+            content = self.render_combination(components, focus)
+            if self.post_index is not None and self.post_index.contains(content):
+                continue
+            record: Dict[str, Any] = {"focus": focus, "content": content}
+            for name, value in zip(("topic", "template", "organization", "emoji"), components):
+                record[name] = value
+            record["position"] = position
+            yield record
+    
     def _generate_hashtags(self, topic: str, focus: str) -> str:
         """
         Generate relevant hashtags.
@@ -240,6 +452,8 @@ class ContentGenerator:
             return content
         
         logger.warning(f"Content too long ({len(content)} chars), truncating...")
+        self.truncations += 1
+        TRUNCATIONS.inc(self.language)
         
         # Remove some hashtags if needed
         lines = content.split('\n')
@@ -284,7 +498,7 @@ class ContentGenerator:
             "lines": len(content.split('\n')),
             "hashtags": content.count('#'),
             "mentions": content.count('@'),
-            "emojis": sum(1 for char in content if char in self.emojis)
+            "emojis": sum(1 for char in content if char in self.emoji_set)
         }
 
 
@@ -0,0 +1,190 @@
+"""
+Enumeration of the content combination space
+"""
+
+import json
+import logging
+import os
+import random
+from pathlib import Path
+from typing import Dict, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CURSOR_PATH = "logs/content_cursor.json"
+
+_MASK64 = (1 << 64) - 1
+
+
+class ContentSpace:
+    """
+    Mixed-radix view of the (topic, template, organization, emoji) product.
+
+    Index ``i`` decodes to one combination with the topic as the most
+    significant digit, so no part of the product is ever materialized.
+    """
+
+    def __init__(self, radices: Sequence[int]):
+        """
+        Args:
+            radices: Number of choices for each component, most significant first
+        """
+        if not radices or any(r < 1 for r in radices):
+            raise ValueError(f"Radices must be positive, got {tuple(radices)}")
+        self.radices = tuple(radices)
+        self.size = 1
+        for radix in self.radices:
+            self.size *= radix
+
+    def decode(self, index: int) -> Tuple[int, ...]:
+        """
+        Map an index in ``range(size)`` to component indices.
+
+        Args:
+            index: Combination index
+
+        Returns:
+            Component indices ordered like the radices
+        """
+        if not 0 <= index < self.size:
+            raise IndexError(f"Index {index} out of range for space of {self.size}")
+        digits = []
+        for radix in reversed(self.radices):
+            index, digit = divmod(index, radix)
+            digits.append(digit)
+        return tuple(reversed(digits))
+
+    def encode(self, components: Sequence[int]) -> int:
+        """Inverse of decode."""
+        index = 0
+        for digit, radix in zip(components, self.radices):
+            if not 0 <= digit < radix:
+                raise IndexError(f"Component {digit} out of range for radix {radix}")
+            index = index * radix + digit
+        return index
+
+    def __len__(self) -> int:
+        return self.size
+
+
+class FeistelPermutation:
+    """
+    Seeded pseudo-random permutation of ``range(size)``.
+
+    A balanced Feistel network permutes the smallest even-bit power-of-two
+    domain covering ``size``; values that land outside the range are
+    re-encrypted (cycle walking) until they fall inside it. Any position
+    maps to its element in O(1) expected time, so a walk over the whole
+    range never repeats and can be resumed from a single integer.
+    """
+
+    def __init__(self, size: int, seed: int, rounds: int = 4):
+        """
+        Args:
+            size: Range to permute
+            seed: Permutation seed
+            rounds: Feistel rounds
+        """
+        if size < 1:
+            raise ValueError(f"Size must be positive, got {size}")
+        self.size = size
+        self.seed = seed
+        half_bits = max(1, ((size - 1).bit_length() + 1) // 2)
+        self._half_bits = half_bits
+        self._half_mask = (1 << half_bits) - 1
+        key_rng = random.Random(seed)
+        self._keys = tuple(key_rng.getrandbits(64) for _ in range(rounds))
+
+    def _round(self, value: int, key: int) -> int:
+        # splitmix64-style mixing of one half block
+        x = ((value ^ key) * 0x9E3779B97F4A7C15) & _MASK64
+        x ^= x >> 29
+        x = (x * 0xBF58476D1CE4E5B9) & _MASK64
+        x ^= x >> 32
+        return x & self._half_mask
+
+    def _encrypt(self, value: int) -> int:
+        left = value >> self._half_bits
+        right = value & self._half_mask
+        for key in self._keys:
+            left, right = right, left ^ self._round(right, key)
+        return (left << self._half_bits) | right
+
+    def __call__(self, position: int) -> int:
+        """
+        Element at ``position`` of the permuted sequence.
+
+        Args:
+            position: Position in ``range(size)``
+
+        Returns:
+            Permuted value in ``range(size)``
+        """
+        if not 0 <= position < self.size:
+            raise IndexError(f"Position {position} out of range for size {self.size}")
+        value = self._encrypt(position)
+        while value >= self.size:
+            value = self._encrypt(value)
+        return value
+
+    def __len__(self) -> int:
+        return self.size
+
+
+class EnumerationCursor:
+    """
+    Persisted walk positions, one per content stream (e.g. 'en:hpc').
+
+    Each entry stores the permutation seed, the next position and the size
+    of the space it was created for. A walk that reaches the end of its
+    space starts a new epoch with the next seed.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Args:
+            path: JSON file. Defaults to CONTENT_CURSOR_PATH or logs/content_cursor.json
+        """
+        self.path = Path(path or os.getenv("CONTENT_CURSOR_PATH", DEFAULT_CURSOR_PATH))
+        self._entries: Dict[str, Dict[str, int]] = {}
+        if self.path.exists():
+            self._entries = json.loads(self.path.read_text(encoding="utf-8"))
+
+    def get(self, key: str, size: int, seed: Optional[int] = None) -> Tuple[int, int]:
+        """
+        Current (seed, position) for a stream.
+
+        A new or stale entry (created for a different space size) is reset
+        to position 0 with ``seed`` or a fresh random seed.
+
+        Args:
+            key: Stream key
+            size: Size of the space being walked
+            seed: Seed for a new entry
+
+        Returns:
+            Tuple of (seed, position)
+        """
+        entry = self._entries.get(key)
+        if entry is None or entry.get("size") != size:
+            if entry is not None:
+                logger.warning(f"Content space for {key} changed size; restarting walk")
+            if seed is None:
+                seed = random.SystemRandom().getrandbits(63)
+            entry = {"seed": seed, "position": 0, "size": size}
+            self._entries[key] = entry
+        elif entry["position"] >= size:
+            logger.info(f"Content space for {key} exhausted; starting a new epoch")
+            entry.update(seed=entry["seed"] + 1, position=0)
+        return entry["seed"], entry["position"]
+
+    def advance(self, key: str, position: int) -> None:
+        """Record the next position of a stream."""
+        self._entries[key]["position"] = position
+
+    def save(self) -> None:
+        """Atomically write the cursor file."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        tmp_path.write_text(json.dumps(self._entries, indent=2), encoding="utf-8")
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,358 @@
+"""
+Structured post history with a sparse time index
+"""
+
+import gzip
+import json
+import logging
+import os
+import re
+import zlib
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HISTORY_PATH = "logs/post_history.jsonl"
+DEFAULT_MAX_BYTES = 16 * 1024 * 1024
+
+# Records are indexed (and rotated segments compressed) in blocks of about
+# this size; a range query reads only the blocks that overlap the range
+INDEX_BLOCK_BYTES = 64 * 1024
+
+GROUP_BY = ("day", "mode", "focus")
+
+_TIMESTAMP = re.compile(rb'^\{"timestamp": "([^"]+)"')
+
+# (min_time, max_time, start_offset, end_offset) in Unix seconds / bytes
+Block = Tuple[float, float, int, int]
+
+
+def history_record(
+    mode: str,
+    content: str,
+    tweet_id: Optional[str] = None,
+    focus: Optional[str] = None,
+    latency: Optional[float] = None,
+    error: Optional[str] = None,
+    now: Optional[datetime] = None,
+    media_ids: Optional[List[str]] = None,
+    media: Optional[List[str]] = None,
+) -> str:
+    """
+    Serialize one post attempt as a history line.
+
+    Args:
+        mode: 'mock' or 'real'
+        content: Posted content
+        tweet_id: ID of the created post
+        focus: Content focus ('hpc', 'ai') if known
+        latency: Seconds the API call took
+        error: Error message for a failed attempt
+        now: Attempt time (defaults to the current local time)
+        media_ids: Media attached to the post, if any
+        media: Paths of the attached media files, if any
+
+    Returns:
+        JSON object followed by a newline; the timestamp key comes first so
+        the index can read it without parsing the whole record
+    """
+    now = now or datetime.now().astimezone()
+    record = {
+        "timestamp": now.isoformat(timespec="milliseconds"),
+        "mode": mode,
+        "tweet_id": tweet_id,
+        "focus": focus,
+        "length": len(content),
+        "latency": None if latency is None else round(latency, 4),
+        "error": error,
+        "content": content,
+    }
+    if media_ids:
+        record["media_ids"] = list(media_ids)
+    if media:
+        record["media"] = [str(path) for path in media]
+    return json.dumps(record, ensure_ascii=False) + "\n"
+
+
+def _line_time(line: bytes) -> Optional[float]:
+    match = _TIMESTAMP.match(line)
+    if match is None:
+        return None
+    return datetime.fromisoformat(match.group(1).decode("ascii")).timestamp()
+
+
+def _split_blocks(data: bytes, base: int = 0, final: bool = False) -> Tuple[List[Block], int]:
+    """
+    Index the lines of ``data`` in blocks of about INDEX_BLOCK_BYTES.
+
+    Args:
+        data: Bytes read from ``base`` onwards
+        base: File offset of ``data``
+        final: Close the last partial block too (the data will not grow)
+
+    Returns:
+        The blocks and the offset just past the last one
+    """
+    blocks: List[Block] = []
+    start = pos = 0
+    low = high = None
+    while pos < len(data):
+        end = data.find(b"\n", pos)
+        if end < 0:
+            if not final:
+                break
+            end = len(data)
+        stamp = _line_time(data[pos:end])
+        if stamp is not None:
+            low = stamp if low is None else min(low, stamp)
+            high = stamp if high is None else max(high, stamp)
+        pos = min(end + 1, len(data))
+        if pos - start >= INDEX_BLOCK_BYTES or (final and pos == len(data)):
+            blocks.append((low or 0.0, high or 0.0, base + start, base + pos))
+            start, low, high = pos, None, None
+    return blocks, base + start
+
+
+def compress_segment(path: Path) -> Path:
+    """
+    Compress a rotated segment into gzip members, one per index block.
+
+    Concatenated gzip members are an ordinary .gz file, but each block can
+    also be decompressed on its own from its recorded offset, so queries
+    seek within compressed segments too. The index is saved next to the
+    segment and the plain file removed.
+
+    Args:
+        path: Rotated plain segment
+
+    Returns:
+        Path of the compressed segment
+    """
+    path = Path(path)
+    data = path.read_bytes()
+    blocks, _ = _split_blocks(data, final=True)
+
+    gz_path = path.with_name(path.name + ".gz")
+    tmp_path = gz_path.with_name(gz_path.name + ".tmp")
+    index: List[Block] = []
+    with open(tmp_path, "wb") as out:
+        for low, high, start, end in blocks:
+            offset = out.tell()
+            out.write(gzip.compress(data[start:end]))
+            index.append((low, high, offset, out.tell()))
+        out.flush()
+        os.fsync(out.fileno())
+        stat = os.fstat(out.fileno())
+
+    # The segment never changes again, so its size and mtime identify it
+    _save_index(gz_path, {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "blocks": index})
+    os.replace(tmp_path, gz_path)
+    path.unlink()
+    _index_path(path).unlink(missing_ok=True)
+    return gz_path
+
+
+def _index_path(path: Path) -> Path:
+    return path.with_name(path.name + ".idx")
+
+
+def _load_index(path: Path) -> Optional[dict]:
+    try:
+        return json.loads(_index_path(path).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+
+def _block_checksum(f, block: Block) -> int:
+    f.seek(block[2])
+    return zlib.crc32(f.read(block[3] - block[2]))
+
+
+def _save_index(path: Path, index: dict) -> None:
+    index_path = _index_path(path)
+    tmp_path = index_path.with_name(f"{index_path.name}.{os.getpid()}.tmp")
+    try:
+        tmp_path.write_text(json.dumps(index), encoding="utf-8")
+        os.replace(tmp_path, index_path)
+    except OSError as e:
+        logger.warning(f"Could not save history index {index_path}: {e}")
+
+
+class PostHistory:
+    """
+    Reader for the JSONL post history and its rotated segments.
+
+    The active file and every rotated segment (plain or gzip) carry a sparse
+    index of blocks with their time bounds. A range query reads only the
+    blocks that overlap the range. The active file's index is extended
+    incrementally, covering just the bytes appended since the last query.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Args:
+            path: Active history file. Defaults to POST_HISTORY_PATH or
+                logs/post_history.jsonl
+        """
+        self.path = Path(path or os.getenv("POST_HISTORY_PATH", DEFAULT_HISTORY_PATH))
+
+    def segments(self) -> List[Path]:
+        """Rotated segments followed by the active file, oldest first."""
+        prefix = self.path.stem + "."
+        found: Dict[str, Path] = {}
+        if self.path.parent.exists():
+            for candidate in self.path.parent.iterdir():
+                name = candidate.name
+                if not name.startswith(prefix) or candidate == self.path:
+                    continue
+                if name.endswith(self.path.suffix + ".gz"):
+                    found[name[:-3]] = candidate
+                elif name.endswith(self.path.suffix):
+                    # A segment still being compressed has both forms
+                    found.setdefault(name, candidate)
+        ordered = [found[name] for name in sorted(found)]
+        if self.path.exists():
+            ordered.append(self.path)
+        return ordered
+
+    def _plain_blocks(self, path: Path) -> Tuple[List[Block], int]:
+        """
+        Index of a plain file, extended to its current end.
+
+        A saved index is reused only if the inode matches, the file has not
+        shrunk and the first block still has the recorded checksum. The
+        inode alone is not enough: after a rotation the new file can get
+        the old inode back and grow past the indexed size.
+        """
+        with open(path, "rb") as f:
+            stat = os.fstat(f.fileno())
+            index = _load_index(path)
+            if (
+                not index
+                or index.get("inode") != stat.st_ino
+                or index["indexed"] > stat.st_size
+                or (index["blocks"] and index.get("head") != _block_checksum(f, index["blocks"][0]))
+            ):
+                index = {"inode": stat.st_ino, "indexed": 0, "blocks": []}
+
+            if stat.st_size > index["indexed"]:
+                f.seek(index["indexed"])
+                data = f.read(stat.st_size - index["indexed"])
+                blocks, indexed = _split_blocks(data, index["indexed"])
+                if blocks:
+                    if not index["blocks"]:
+                        index["head"] = zlib.crc32(data[: blocks[0][3] - blocks[0][2]])
+                    index["blocks"].extend(blocks)
+                    index["indexed"] = indexed
+                    _save_index(path, index)
+        return [tuple(b) for b in index["blocks"]], index["indexed"]
+
+    def _read_blocks(
+        self, path: Path, since: Optional[float], until: Optional[float]
+    ) -> Iterator[bytes]:
+        """Raw bytes of the blocks of a segment that overlap the range."""
+        def overlaps(block: Block) -> bool:
+            return (since is None or block[1] >= since) and (until is None or block[0] < until)
+
+        if path.suffix == ".gz":
+            index = _load_index(path)
+            stat = path.stat()
+            if index is None or (index.get("size"), index.get("mtime_ns")) != (stat.st_size, stat.st_mtime_ns):
+                # No index for this file (e.g. compressed or replaced by hand): read it whole
+                with gzip.open(path, "rb") as f:
+                    yield f.read()
+                return
+            with open(path, "rb") as f:
+                for block in index["blocks"]:
+                    if overlaps(block):
+                        f.seek(block[2])
+                        yield gzip.decompress(f.read(block[3] - block[2]))
+            return
+
+        blocks, indexed = self._plain_blocks(path)
+        with open(path, "rb") as f:
+            for block in blocks:
+                if overlaps(block):
+                    f.seek(block[2])
+                    yield f.read(block[3] - block[2])
+            # Bytes after the last full block are not indexed yet
+            f.seek(indexed)
+            yield f.read()
+
+    def query(
+        self, since: Optional[datetime] = None, until: Optional[datetime] = None
+    ) -> Iterator[dict]:
+        """
+        Yield history records with ``since <= timestamp < until``.
+
+        Args:
+            since: Inclusive lower bound (None for no bound)
+            until: Exclusive upper bound (None for no bound)
+
+        Yields:
+            Record dictionaries, segment by segment
+        """
+        low = since.timestamp() if since else None
+        high = until.timestamp() if until else None
+        for path in self.segments():
+            for chunk in self._read_blocks(path, low, high):
+                for line in chunk.splitlines():
+                    if not line.strip():
+                        continue
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue
+                    stamp = datetime.fromisoformat(record["timestamp"]).timestamp()
+                    if (low is None or stamp >= low) and (high is None or stamp < high):
+                        yield record
+
+    def aggregate(
+        self,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        group_by: str = "day",
+    ) -> Dict[str, Dict[str, float]]:
+        """
+        Summarize history records by day, mode or focus.
+
+        Args:
+            since: Inclusive lower bound
+            until: Exclusive upper bound
+            group_by: 'day', 'mode' or 'focus'
+
+        Returns:
+            Mapping of group to posts, errors, average length and average
+            latency, sorted by group
+        """
+        if group_by not in GROUP_BY:
+            raise ValueError(f"Unknown grouping '{group_by}' (choose from {', '.join(GROUP_BY)})")
+
+        groups: Dict[str, Dict[str, float]] = {}
+        for record in self.query(since, until):
+            if group_by == "day":
+                key = record["timestamp"][:10]
+            else:
+                key = record.get(group_by) or "unknown"
+            group = groups.setdefault(
+                key, {"posts": 0, "errors": 0, "length": 0, "latency": 0.0, "timed": 0}
+            )
+            group["errors" if record.get("error") else "posts"] += 1
+            group["length"] += record.get("length", 0)
+            if record.get("latency") is not None:
+                group["latency"] += record["latency"]
+                group["timed"] += 1
+
+        summary = {}
+        for key in sorted(groups):
+            group = groups[key]
+            attempts = group["posts"] + group["errors"]
+            summary[key] = {
+                "posts": group["posts"],
+                "errors": group["errors"],
+                "avg_length": group["length"] / attempts,
+                "avg_latency": group["latency"] / group["timed"] if group["timed"] else None,
+            }
+        return summary
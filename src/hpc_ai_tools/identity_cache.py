@@ -0,0 +1,138 @@
+"""
+On-disk cache of verified X API identities
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_PATH = "logs/identity_cache.json"
+DEFAULT_TTL = 24 * 3600.0
+
+
+def credentials_key(credentials: Sequence[str], base_url: str = "") -> str:
+    """
+    Cache key for a set of credentials.
+
+    Only this SHA-256 digest is written to disk, never the credentials.
+    The API root is part of the key so a test server's answer is not
+    reused against the real API.
+
+    Args:
+        credentials: Consumer key/secret and access token/secret
+        base_url: API root the identity was verified against
+
+    Returns:
+        Hex digest
+    """
+    digest = hashlib.sha256(b"hpc-ai-tools identity\0")
+    for part in (base_url, *credentials):
+        digest.update(part.encode("utf-8") + b"\0")
+    return digest.hexdigest()
+
+
+class IdentityCache:
+    """
+    Verified users keyed by a hash of their credentials, with a TTL.
+
+    XPoster used to call users/me on every construction to check the
+    credentials. With the cache that round trip happens at most once per
+    TTL, and the first request of a run is the post itself. An entry is
+    dropped when the API rejects the credentials.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        ttl: Optional[float] = None,
+        clock: Callable[[], float] = time.time,
+    ):
+        """
+        Args:
+            path: Cache file. Defaults to X_IDENTITY_CACHE or logs/identity_cache.json
+            ttl: Seconds an entry stays valid. Defaults to X_IDENTITY_CACHE_TTL
+                or one day; 0 disables the cache
+            clock: Unix time source
+        """
+        self.path = Path(path or os.getenv("X_IDENTITY_CACHE", DEFAULT_CACHE_PATH))
+        if ttl is None:
+            ttl = float(os.getenv("X_IDENTITY_CACHE_TTL", str(DEFAULT_TTL)))
+        self.ttl = ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Dict[str, str]]:
+        """
+        Cached user for a credentials key.
+
+        Args:
+            key: Result of credentials_key()
+
+        Returns:
+            User dictionary ('id', 'username'), or None if absent or expired
+        """
+        if self.ttl <= 0:
+            return None
+        with self._lock:
+            entry = self._load().get(key)
+        if entry is None or self._clock() - entry.get("verified_at", 0) >= self.ttl:
+            return None
+        return {"id": entry["id"], "username": entry["username"]}
+
+    def put(self, key: str, user: Dict[str, str]) -> None:
+        """
+        Remember a verified user.
+
+        Args:
+            key: Result of credentials_key()
+            user: 'data' object of users/me
+        """
+        if self.ttl <= 0:
+            return
+        now = self._clock()
+        with self._lock:
+            entries = {
+                k: v for k, v in self._load().items()
+                if now - v.get("verified_at", 0) < self.ttl
+            }
+            entries[key] = {
+                "id": str(user["id"]),
+                "username": user["username"],
+                "verified_at": now,
+            }
+            self._save(entries)
+
+    def invalidate(self, key: str) -> None:
+        """Drop the entry for a credentials key."""
+        with self._lock:
+            entries = self._load()
+            if entries.pop(key, None) is not None:
+                self._save(entries)
+
+    def _load(self) -> Dict[str, Dict]:
+        try:
+            entries = json.loads(self.path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return {}
+        except ValueError:
+            logger.warning(f"Ignoring unreadable identity cache: {self.path}")
+            return {}
+        return entries if isinstance(entries, dict) else {}
+
+    def _save(self, entries: Dict[str, Dict]) -> None:
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(entries, f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning(f"Could not save identity cache {self.path}: {e}")
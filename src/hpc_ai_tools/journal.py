@@ -0,0 +1,287 @@
+"""
+Group-commit journal for post logs
+"""
+
+import atexit
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+FSYNC_POLICIES = ("always", "interval", "never")
+DEFAULT_FSYNC = "interval"
+DEFAULT_FSYNC_INTERVAL = 1.0
+DEFAULT_FLUSH_INTERVAL = 0.05
+
+# Records buffered before the writer is woken early
+GROUP_COMMIT_RECORDS = 256
+
+
+def _flock(fd: int, operation: str) -> None:
+    """Take or release ('LOCK_EX' / 'LOCK_UN') an flock; a no-op without fcntl."""
+    if fcntl is not None:
+        fcntl.flock(fd, getattr(fcntl, operation))
+
+
+class JournalWriter:
+    """
+    Appends records to a file in group commits from a background thread.
+
+    write() only appends to an in-memory buffer. The writer thread wakes
+    every ``flush_interval`` seconds (or as soon as GROUP_COMMIT_RECORDS are
+    waiting), joins everything buffered and appends it with one write under
+    an exclusive ``flock``. The file is opened with O_APPEND and every
+    record is written whole, so records from several processes never
+    interleave. Where flock is unavailable (Windows) writes are not locked
+    across processes, and rotation is only safe with a single writer.
+
+    The fsync policy controls durability: ``always`` syncs after every
+    group commit, ``interval`` at most once per ``fsync_interval`` seconds,
+    and ``never`` leaves it to the OS.
+
+    With ``max_bytes`` set, the commit that takes the file past that size
+    renames it to a timestamped segment while still holding the lock and
+    hands the segment to ``on_rotate``. Writers in other processes notice
+    the rename under the lock and reopen the new file.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        fsync: Optional[str] = None,
+        flush_interval: Optional[float] = None,
+        fsync_interval: Optional[float] = None,
+        max_bytes: Optional[int] = None,
+        on_rotate: Optional[Callable[[Path], None]] = None,
+    ):
+        """
+        Args:
+            path: Journal file (created on first write)
+            fsync: always, interval or never. Defaults to JOURNAL_FSYNC or interval
+            flush_interval: Seconds between group commits. Defaults to
+                JOURNAL_FLUSH_INTERVAL or 0.05
+            fsync_interval: Seconds between syncs under the interval policy.
+                Defaults to JOURNAL_FSYNC_INTERVAL or 1
+            max_bytes: Rotate the file once it reaches this size (None never rotates)
+            on_rotate: Called from the writer thread with each rotated segment
+
+        Raises:
+            ValueError: If the fsync policy is unknown
+        """
+        self.path = Path(path)
+        self.fsync = fsync or os.getenv("JOURNAL_FSYNC", DEFAULT_FSYNC)
+        if self.fsync not in FSYNC_POLICIES:
+            raise ValueError(
+                f"Unknown fsync policy '{self.fsync}' (choose from {', '.join(FSYNC_POLICIES)})"
+            )
+        if flush_interval is None:
+            flush_interval = float(os.getenv("JOURNAL_FLUSH_INTERVAL", str(DEFAULT_FLUSH_INTERVAL)))
+        if fsync_interval is None:
+            fsync_interval = float(os.getenv("JOURNAL_FSYNC_INTERVAL", str(DEFAULT_FSYNC_INTERVAL)))
+        self.flush_interval = flush_interval
+        self.fsync_interval = fsync_interval
+        self.max_bytes = max_bytes
+        self.on_rotate = on_rotate
+
+        self._buffer: List[str] = []
+        self._submitted = 0
+        self._written = 0
+        self._last_sync = time.monotonic()
+        self._fd: Optional[int] = None
+        self._closed = False
+        self._cond = threading.Condition()
+        self._thread = threading.Thread(
+            target=self._run, name=f"journal-{self.path.name}", daemon=True
+        )
+        self._thread.start()
+
+    def write(self, record: str) -> None:
+        """
+        Queue a record for the next group commit.
+
+        Args:
+            record: Complete record, including its trailing newline
+        """
+        with self._cond:
+            if self._closed:
+                raise ValueError(f"Journal is closed: {self.path}")
+            self._buffer.append(record)
+            self._submitted += 1
+            if len(self._buffer) >= GROUP_COMMIT_RECORDS:
+                self._cond.notify_all()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until every record written so far is in the file.
+
+        Args:
+            timeout: Longest wait in seconds (None waits indefinitely)
+
+        Returns:
+            True if the journal caught up
+        """
+        with self._cond:
+            target = self._submitted
+            self._cond.notify_all()
+            return self._cond.wait_for(lambda: self._written >= target, timeout)
+
+    def close(self) -> None:
+        """Write out buffered records and stop the writer thread."""
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                self._cond.wait_for(
+                    lambda: self._closed or len(self._buffer) >= GROUP_COMMIT_RECORDS,
+                    self.flush_interval,
+                )
+                batch, self._buffer = self._buffer, []
+                closing = self._closed
+
+            if batch:
+                try:
+                    self._commit("".join(batch).encode("utf-8"))
+                except OSError as e:
+                    logger.error(f"Failed to write {len(batch)} records to {self.path}: {e}")
+
+            with self._cond:
+                self._written += len(batch)
+                self._cond.notify_all()
+
+            if closing:
+                if self._fd is not None:
+                    self._sync()
+                    os.close(self._fd)
+                    self._fd = None
+                return
+
+    def _lock_current(self) -> None:
+        """Open the file if needed and lock it, following any rotation."""
+        while True:
+            if self._fd is None:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                self._fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            _flock(self._fd, "LOCK_EX")
+            if self.max_bytes is None:
+                return
+            try:
+                current = os.stat(self.path)
+            except FileNotFoundError:
+                current = None
+            opened = os.fstat(self._fd)
+            if current is not None and (current.st_ino, current.st_dev) == (
+                opened.st_ino, opened.st_dev
+            ):
+                return
+            # Rotated by another process while we waited
+            _flock(self._fd, "LOCK_UN")
+            os.close(self._fd)
+            self._fd = None
+
+    def _commit(self, data: bytes) -> None:
+        self._lock_current()
+        rotated = None
+        try:
+            view = memoryview(data)
+            while view:
+                view = view[os.write(self._fd, view):]
+            if self.max_bytes is not None and os.fstat(self._fd).st_size >= self.max_bytes:
+                rotated = self._segment_path()
+                os.rename(self.path, rotated)
+        finally:
+            _flock(self._fd, "LOCK_UN")
+
+        if rotated is not None:
+            self._sync()
+            os.close(self._fd)
+            self._fd = None
+            logger.info(f"Rotated {self.path} to {rotated}")
+            if self.on_rotate is not None:
+                try:
+                    self.on_rotate(rotated)
+                except Exception as e:
+                    logger.error(f"Failed to process rotated segment {rotated}: {e}")
+        elif self.fsync == "always" or (
+            self.fsync == "interval"
+            and time.monotonic() - self._last_sync >= self.fsync_interval
+        ):
+            self._sync()
+
+    def _segment_path(self) -> Path:
+        stamp = time.strftime("%Y%m%dT%H%M%S")
+        for n in range(1000):
+            suffix = f"-{n}" if n else ""
+            segment = self.path.with_name(
+                f"{self.path.stem}.{stamp}-{os.getpid()}{suffix}{self.path.suffix}"
+            )
+            if not segment.exists() and not segment.with_name(segment.name + ".gz").exists():
+                return segment
+        raise FileExistsError(f"No free segment name for {self.path}")
+
+    def _sync(self) -> None:
+        if self.fsync != "never":
+            os.fsync(self._fd)
+        self._last_sync = time.monotonic()
+
+
+_journals: Dict[Path, JournalWriter] = {}
+_journals_lock = threading.Lock()
+
+
+def get_journal(path: str, **kwargs) -> JournalWriter:
+    """
+    Shared JournalWriter for a file, so every poster in the process writes
+    through the same buffer and thread.
+
+    Args:
+        path: Journal file; relative paths are resolved against the
+            current directory
+        **kwargs: JournalWriter options, used when the writer is created
+
+    Returns:
+        JournalWriter for the file
+    """
+    key = Path(path).resolve()
+    with _journals_lock:
+        journal = _journals.get(key)
+        if journal is None:
+            journal = _journals[key] = JournalWriter(str(key), **kwargs)
+        return journal
+
+
+def flush_journals(timeout: Optional[float] = None) -> None:
+    """Wait until every shared journal has written its buffered records."""
+    with _journals_lock:
+        journals = list(_journals.values())
+    for journal in journals:
+        journal.flush(timeout)
+
+
+def close_journals() -> None:
+    """Flush and close every shared journal."""
+    with _journals_lock:
+        journals = list(_journals.values())
+        _journals.clear()
+    for journal in journals:
+        journal.close()
+
+
+atexit.register(close_journals)
+# Writer threads do not survive fork; children open their own journals
+if hasattr(os, "register_at_fork"):  # Unix only
+    os.register_at_fork(after_in_child=_journals.clear)
@@ -0,0 +1,108 @@
+"""
+Index of content combinations that fit the post length limit
+"""
+
+from array import array
+from typing import TYPE_CHECKING, Dict, Sequence
+
+from .enumerator import ContentSpace
+from .templates import TEMPLATE_FIELDS, CompiledTemplate
+
+if TYPE_CHECKING:
+    import numpy as np
+
+
+class LengthIndex:
+    """
+    Flat indices (in ContentSpace order) of the combinations whose rendered
+    length is within ``max_length``.
+
+    Every component is a static string, so each combination's length is the
+    template's static length plus the lengths of the values dropped into its
+    slots. Lengths are summed per component rather than by rendering, and
+    samplers draw from ``codes`` so nothing is rendered only to be
+    truncated.
+    """
+
+    def __init__(
+        self,
+        space: ContentSpace,
+        templates: Sequence[CompiledTemplate],
+        topic_lengths: Sequence[int],
+        hashtag_lengths: Sequence[int],
+        organization_lengths: Sequence[int],
+        emoji_lengths: Sequence[int],
+        max_length: int,
+    ):
+        """
+        Args:
+            space: Space of (topic, template, organization, emoji) combinations
+            templates: Compiled templates for the focus
+            topic_lengths: Length of each topic
+            hashtag_lengths: Length of each topic's hashtag string
+            organization_lengths: Length of each organization
+            emoji_lengths: Length of each emoji
+            max_length: Maximum post length
+        """
+        self.space = space
+        self.max_length = max_length
+
+        fields = {name: i for i, name in enumerate(TEMPLATE_FIELDS)}
+        codes = array("I")
+        code = 0
+        for t in range(len(topic_lengths)):
+            for template in templates:
+                counts = template.field_counts()
+                base = (
+                    template.static_length
+                    + counts[fields["topic"]] * topic_lengths[t]
+                    + counts[fields["hashtags"]] * hashtag_lengths[t]
+                )
+                org_factor = counts[fields["organization"]]
+                emoji_factor = counts[fields["emoji"]]
+                for org_length in organization_lengths:
+                    budget = max_length - base - org_factor * org_length
+                    for emoji_length in emoji_lengths:
+                        if emoji_factor * emoji_length <= budget:
+                            codes.append(code)
+                        code += 1
+
+        self.codes = codes
+        self._array = None
+
+    @property
+    def total(self) -> int:
+        """Number of combinations in the space."""
+        return self.space.size
+
+    @property
+    def feasible(self) -> int:
+        """Number of combinations that fit without truncation."""
+        return len(self.codes)
+
+    def as_array(self) -> "np.ndarray":
+        """The feasible codes as a NumPy array (built once)."""
+        if self._array is None:
+            import numpy as np
+
+            self._array = np.frombuffer(self.codes, dtype=np.uint32).astype(np.int64)
+        return self._array
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Report how often unconstrained sampling would have been truncated.
+
+        Returns:
+            Dictionary with combination counts and the truncation rate a
+            uniform draw over the whole space would have had
+        """
+        infeasible = self.total - self.feasible
+        return {
+            "combinations": self.total,
+            "feasible": self.feasible,
+            "infeasible": infeasible,
+            "truncation_rate": infeasible / self.total,
+        }
+
+    def __len__(self) -> int:
+        return len(self.codes)
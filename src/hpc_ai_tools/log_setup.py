@@ -0,0 +1,118 @@
+"""
+Package logging through a background queue listener
+"""
+
+import atexit
+import logging
+import logging.handlers
+import os
+import queue
+import threading
+from pathlib import Path
+from typing import Optional
+
+PACKAGE_LOGGER = "hpc_ai_tools"
+
+DEFAULT_LOG_FILE = "logs/hpc_ai_tools.log"
+DEFAULT_LOG_LEVEL = "INFO"
+DEFAULT_MAX_BYTES = 10 * 1024 * 1024
+DEFAULT_BACKUP_COUNT = 5
+LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
+_lock = threading.Lock()
+_queue_handler: Optional[logging.handlers.QueueHandler] = None
+_listener: Optional[logging.handlers.QueueListener] = None
+_log_file: Optional[Path] = None
+
+
+def _file_handler(log_file: Path) -> logging.Handler:
+    """Rotating file handler chosen by LOG_ROTATION (size or time)."""
+    backup_count = int(os.getenv("LOG_BACKUP_COUNT", str(DEFAULT_BACKUP_COUNT)))
+    if os.getenv("LOG_ROTATION", "size").lower() == "time":
+        return logging.handlers.TimedRotatingFileHandler(
+            log_file,
+            when=os.getenv("LOG_ROTATE_WHEN", "midnight"),
+            backupCount=backup_count,
+            encoding="utf-8",
+        )
+    return logging.handlers.RotatingFileHandler(
+        log_file,
+        maxBytes=int(os.getenv("LOG_MAX_BYTES", str(DEFAULT_MAX_BYTES))),
+        backupCount=backup_count,
+        encoding="utf-8",
+    )
+
+
+def configure_logging(log_file: Optional[str] = None, level: Optional[str] = None) -> None:
+    """
+    Send package log records to a rotating file from a background thread.
+
+    The package logger gets a single QueueHandler, which only puts records
+    on an unbounded queue, so callers never wait for disk. A QueueListener
+    thread formats them and writes them to the file. Calling this again is
+    a no-op unless a different file is requested, in which case the old
+    handler and listener are replaced rather than stacked.
+
+    Args:
+        log_file: Log file. Defaults to LOG_FILE or logs/hpc_ai_tools.log
+        level: Level name. Defaults to LOG_LEVEL or INFO
+    """
+    global _queue_handler, _listener, _log_file
+
+    path = Path(log_file or os.getenv("LOG_FILE", DEFAULT_LOG_FILE)).resolve()
+    level_name = (level or os.getenv("LOG_LEVEL", DEFAULT_LOG_LEVEL)).upper()
+
+    with _lock:
+        package_logger = logging.getLogger(PACKAGE_LOGGER)
+        package_logger.setLevel(level_name)
+        if _listener is not None and _log_file == path:
+            return
+        _shutdown_locked()
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        handler = _file_handler(path)
+        handler.setFormatter(logging.Formatter(LOG_FORMAT))
+
+        log_queue: queue.SimpleQueue = queue.SimpleQueue()
+        _queue_handler = logging.handlers.QueueHandler(log_queue)
+        _listener = logging.handlers.QueueListener(
+            log_queue, handler, respect_handler_level=True
+        )
+        _listener.start()
+        package_logger.addHandler(_queue_handler)
+        _log_file = path
+
+
+def shutdown_logging() -> None:
+    """Write out queued records, stop the listener and close the file."""
+    with _lock:
+        _shutdown_locked()
+
+
+def _shutdown_locked() -> None:
+    global _queue_handler, _listener, _log_file
+
+    if _queue_handler is not None:
+        logging.getLogger(PACKAGE_LOGGER).removeHandler(_queue_handler)
+        _queue_handler = None
+    if _listener is not None:
+        # stop() drains the queue before returning
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+    _log_file = None
+
+
+def _reset_after_fork() -> None:
+    """The listener thread does not survive fork; let the child start its own."""
+    global _queue_handler, _listener, _log_file
+
+    if _queue_handler is not None:
+        logging.getLogger(PACKAGE_LOGGER).removeHandler(_queue_handler)
+    _queue_handler = _listener = _log_file = None
+
+
+atexit.register(shutdown_logging)
+if hasattr(os, "register_at_fork"):  # Unix only
+    os.register_at_fork(after_in_child=_reset_after_fork)
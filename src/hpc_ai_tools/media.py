@@ -0,0 +1,289 @@
+"""
+Media uploads with a content-addressed media_id cache
+"""
+
+import hashlib
+import logging
+import mimetypes
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from .x_api import DEFAULT_CHUNK_SIZE, XApiClient
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MEDIA_CACHE_PATH = "logs/media_cache.sqlite3"
+
+# X accepts up to four images per post, or a single video or GIF
+MAX_MEDIA_PER_POST = 4
+
+# Upload size limits per media category
+MEDIA_LIMITS = {
+    "tweet_image": 5 * 1024 * 1024,
+    "tweet_gif": 15 * 1024 * 1024,
+    "tweet_video": 512 * 1024 * 1024,
+}
+
+# Lifetime assumed when the upload response does not report one
+DEFAULT_MEDIA_TTL = 24 * 3600.0
+
+# Cached IDs this close to expiry are uploaded again rather than risk
+# expiring between lookup and create_tweet
+EXPIRY_MARGIN = 600.0
+
+
+def file_sha256(path: Path) -> bytes:
+    """SHA-256 of a file, read in blocks."""
+    with open(path, "rb") as f:
+        return hashlib.file_digest(f, "sha256").digest()
+
+
+def media_category(path: Path) -> Tuple[str, str]:
+    """
+    MIME type and X media category of a file.
+
+    Args:
+        path: Media file
+
+    Returns:
+        Tuple of (media_type, media_category)
+
+    Raises:
+        ValueError: If the file is not an image or video
+    """
+    media_type, _ = mimetypes.guess_type(str(path))
+    if media_type == "image/gif":
+        return media_type, "tweet_gif"
+    if media_type and media_type.startswith("image/"):
+        return media_type, "tweet_image"
+    if media_type and media_type.startswith("video/"):
+        return media_type, "tweet_video"
+    raise ValueError(f"Unsupported media type for {path}: {media_type or 'unknown'}")
+
+
+def check_media_file(path: Path) -> Tuple[str, str, int]:
+    """
+    MIME type, X media category and size of a file within its size limit.
+
+    Args:
+        path: Media file
+
+    Returns:
+        Tuple of (media_type, media_category, size)
+
+    Raises:
+        ValueError: If the file type is unsupported or the file too large
+    """
+    media_type, category = media_category(path)
+    size = path.stat().st_size
+    if size > MEDIA_LIMITS[category]:
+        raise ValueError(
+            f"Media file too large: {path} "
+            f"({size} bytes, max {MEDIA_LIMITS[category]} for {category})"
+        )
+    return media_type, category, size
+
+
+def validate_media(paths: Sequence[str]) -> None:
+    """
+    Check the files of one post before anything is uploaded.
+
+    Args:
+        paths: Media files of the post
+
+    Raises:
+        ValueError: If there are too many files, a file is invalid, or a
+            video/GIF is combined with other media
+    """
+    if len(paths) > MAX_MEDIA_PER_POST:
+        raise ValueError(f"At most {MAX_MEDIA_PER_POST} media files per post")
+    categories = [check_media_file(Path(path))[1] for path in paths]
+    if len(paths) > 1 and any(category != "tweet_image" for category in categories):
+        raise ValueError("A video or GIF must be the only media in a post")
+
+
+class MediaCache:
+    """
+    media_id of uploaded files, keyed by SHA-256 of the file and account.
+
+    X keeps uploaded media for a limited time (``expires_after_secs``), and
+    a media_id can be attached to any number of posts until then. Posting
+    the same image again reuses the cached ID and skips the upload. IDs
+    belong to the uploading account, so the account is part of the key.
+    """
+
+    def __init__(self, path: Optional[str] = None, clock: Callable[[], float] = time.time):
+        """
+        Initialize the cache (the database is opened on first use).
+
+        Args:
+            path: sqlite file. Defaults to MEDIA_CACHE_PATH or logs/media_cache.sqlite3
+            clock: Unix time source
+        """
+        self.path = Path(path or os.getenv("MEDIA_CACHE_PATH", DEFAULT_MEDIA_CACHE_PATH))
+        self._clock = clock
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS media ("
+                " digest BLOB NOT NULL,"
+                " account TEXT NOT NULL,"
+                " media_id TEXT NOT NULL,"
+                " expires_at REAL NOT NULL,"
+                " PRIMARY KEY (digest, account)"
+                ") WITHOUT ROWID"
+            )
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def get(self, digest: bytes, account: str = "") -> Optional[str]:
+        """
+        Cached media_id, unless it expires within EXPIRY_MARGIN.
+
+        Args:
+            digest: SHA-256 of the file
+            account: Owner of the upload
+
+        Returns:
+            media_id string or None
+        """
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT media_id FROM media"
+                " WHERE digest = ? AND account = ? AND expires_at > ?",
+                (digest, account, self._clock() + EXPIRY_MARGIN),
+            ).fetchone()
+        return row[0] if row else None
+
+    def put(self, digest: bytes, media_id: str, expires_at: float, account: str = "") -> None:
+        """
+        Remember an upload and drop expired entries.
+
+        Args:
+            digest: SHA-256 of the file
+            media_id: Uploaded media ID
+            expires_at: Unix time the ID stops being usable
+            account: Owner of the upload
+        """
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO media (digest, account, media_id, expires_at)"
+                    " VALUES (?, ?, ?, ?)",
+                    (digest, account, media_id, expires_at),
+                )
+                conn.execute("DELETE FROM media WHERE expires_at <= ?", (self._clock(),))
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+class MediaUploader:
+    """
+    Uploads media for a post through an XApiClient, consulting a MediaCache.
+
+    Images that fit in one chunk go up in a single request; larger files
+    and videos/GIFs use the chunked INIT/APPEND/FINALIZE commands. The
+    files of one post are uploaded concurrently, one worker per file, over
+    the client's pooled session.
+    """
+
+    def __init__(
+        self,
+        client: XApiClient,
+        cache: Optional[MediaCache] = None,
+        account: str = "",
+        chunk_size: Optional[int] = None,
+        clock: Callable[[], float] = time.time,
+    ):
+        """
+        Args:
+            client: API client
+            cache: media_id cache. If None, the default on-disk cache is used
+            account: Cache key of the uploading account
+            chunk_size: Bytes per APPEND. Defaults to MEDIA_CHUNK_SIZE or 4MB
+            clock: Unix time source
+        """
+        self.client = client
+        self.cache = cache if cache is not None else MediaCache(clock=clock)
+        self.account = account
+        self.chunk_size = chunk_size or int(os.getenv("MEDIA_CHUNK_SIZE", str(DEFAULT_CHUNK_SIZE)))
+        self._clock = clock
+
+    def upload(self, path: str) -> str:
+        """
+        media_id for a file, uploading it unless a live ID is cached.
+
+        Args:
+            path: Media file
+
+        Returns:
+            media_id string
+
+        Raises:
+            ValueError: If the file type is unsupported or the file too large
+            XApiError: If the upload fails
+        """
+        path = Path(path)
+        media_type, category, size = check_media_file(path)
+
+        digest = file_sha256(path)
+        media_id = self.cache.get(digest, self.account)
+        if media_id is not None:
+            logger.info(f"Reusing uploaded media {media_id} for {path.name}")
+            return media_id
+
+        started = self._clock()
+        if category == "tweet_image" and size <= self.chunk_size:
+            result = self.client.upload_media(str(path))
+        else:
+            result = self.client.upload_media_chunked(
+                str(path), media_type, category, chunk_size=self.chunk_size
+            )
+        media_id = str(result["media_id_string"])
+        ttl = float(result.get("expires_after_secs") or DEFAULT_MEDIA_TTL)
+        self.cache.put(digest, media_id, started + ttl, self.account)
+        logger.info(f"Uploaded {path.name} as media {media_id}")
+        return media_id
+
+    def upload_all(self, paths: Sequence[str]) -> List[str]:
+        """
+        media_ids for the files of one post, uploaded concurrently.
+
+        Args:
+            paths: Up to MAX_MEDIA_PER_POST images, or one video/GIF
+
+        Returns:
+            media_id strings in the order of ``paths``
+
+        Raises:
+            ValueError: If the files break validate_media's rules
+            XApiError: If an upload fails
+        """
+        validate_media(paths)
+        if len(paths) <= 1:
+            return [self.upload(path) for path in paths]
+
+        # The same file listed twice is uploaded once
+        unique: Dict[str, None] = dict.fromkeys(str(Path(p).resolve()) for p in paths)
+        with ThreadPoolExecutor(max_workers=len(unique), thread_name_prefix="media") as executor:
+            ids = dict(zip(unique, executor.map(self.upload, unique)))
+        return [ids[str(Path(p).resolve())] for p in paths]
@@ -0,0 +1,374 @@
+"""
+In-process metrics registry with Prometheus textfile export
+"""
+
+import atexit
+import logging
+import os
+import threading
+from bisect import bisect_left
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TEXTFILE_NAME = "hpc_ai_tools.prom"
+DEFAULT_EXPORT_INTERVAL = 15.0
+
+# Upper bounds in seconds
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+WAIT_BUCKETS = (1.0, 5.0, 15.0, 60.0, 300.0, 900.0)
+
+Labels = Tuple[str, ...]
+
+
+class _Metric:
+    """
+    Base for metrics aggregated per thread.
+
+    Each thread updates its own shard (a dict keyed by label values), so
+    updates take no lock. A shard is registered once, under a lock, when
+    its thread first touches the metric; readers sum copies of all shards.
+    Shards of finished threads are folded into a retired total whenever a
+    shard is registered or read, so short-lived worker threads do not
+    leave one shard each behind.
+    """
+
+    kind = ""
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._local = threading.local()
+        self._shards: List[Tuple[threading.Thread, dict]] = []
+        self._retired: dict = {}
+        self._shards_lock = threading.Lock()
+
+    def _shard(self) -> dict:
+        try:
+            return self._local.shard
+        except AttributeError:
+            shard = self._local.shard = {}
+            with self._shards_lock:
+                self._retire_locked()
+                self._shards.append((threading.current_thread(), shard))
+            return shard
+
+    def _retire_locked(self) -> None:
+        # A finished thread can no longer update its shard, so it is safe to merge
+        live = []
+        for thread, shard in self._shards:
+            if thread.is_alive():
+                live.append((thread, shard))
+            else:
+                self._merge(self._retired, shard)
+        self._shards = live
+
+    def _merge(self, totals: dict, shard: dict) -> None:
+        """Add a shard into ``totals`` without mutating values ``totals`` shares."""
+        raise NotImplementedError
+
+    def _check(self, labels: Labels) -> None:
+        if len(labels) != len(self.labelnames):
+            raise ValueError(
+                f"{self.name} takes labels ({', '.join(self.labelnames)}), got {labels}"
+            )
+
+    def _copies(self) -> List[dict]:
+        with self._shards_lock:
+            self._retire_locked()
+            shards = [shard for _, shard in self._shards]
+            # Retired values are replaced, never mutated, so a shallow copy is a snapshot
+            retired = self._retired.copy()
+        # dict.copy() is atomic under the GIL, unlike iterating a dict
+        # another thread may be adding to
+        return [retired] + [shard.copy() for shard in shards]
+
+    def samples(self) -> List[Tuple[str, Dict[str, str], float]]:
+        """(name, labels, value) exposition samples."""
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """A monotonically increasing count per label set."""
+
+    kind = "counter"
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        """Add ``amount`` to the count for the given label values."""
+        shard = self._shard()
+        value = shard.get(labels)
+        if value is None:
+            self._check(labels)
+            value = 0.0
+        shard[labels] = value + amount
+
+    def _merge(self, totals: dict, shard: dict) -> None:
+        for labels, value in shard.items():
+            totals[labels] = totals.get(labels, 0.0) + value
+
+    def values(self) -> Dict[Labels, float]:
+        """Total per label set across all threads."""
+        totals: Dict[Labels, float] = {}
+        for shard in self._copies():
+            self._merge(totals, shard)
+        return totals
+
+    def samples(self) -> List[Tuple[str, Dict[str, str], float]]:
+        return [
+            (self.name, dict(zip(self.labelnames, labels)), value)
+            for labels, value in sorted(self.values().items())
+        ]
+
+
+class Histogram(_Metric):
+    """Observations counted into fixed buckets, with their sum and count."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, *labels: str) -> None:
+        """Record one observation for the given label values."""
+        shard = self._shard()
+        cells = shard.get(labels)
+        if cells is None:
+            self._check(labels)
+            # One count per bucket plus +Inf, then the sum and the count
+            cells = shard[labels] = [0] * (len(self.buckets) + 1) + [0.0, 0]
+        cells[bisect_left(self.buckets, value)] += 1
+        cells[-2] += value
+        cells[-1] += 1
+
+    def _merge(self, totals: dict, shard: dict) -> None:
+        for labels, cells in shard.items():
+            merged = totals.get(labels)
+            # The owning thread may be updating its cells; read a copy
+            cells = list(cells)
+            totals[labels] = cells if merged is None else [a + b for a, b in zip(merged, cells)]
+
+    def values(self) -> Dict[Labels, List[float]]:
+        """Per label set: per-bucket counts (+Inf last), then sum and count."""
+        totals: Dict[Labels, List[float]] = {}
+        for shard in self._copies():
+            self._merge(totals, shard)
+        return totals
+
+    def totals(self) -> Dict[Labels, Tuple[int, float]]:
+        """(count, sum) per label set."""
+        return {labels: (int(cells[-1]), cells[-2]) for labels, cells in self.values().items()}
+
+    def samples(self) -> List[Tuple[str, Dict[str, str], float]]:
+        samples = []
+        for labels, cells in sorted(self.values().items()):
+            base = dict(zip(self.labelnames, labels))
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), cells):
+                cumulative += count
+                samples.append((f"{self.name}_bucket", {**base, "le": _format_value(bound)}, cumulative))
+            samples.append((f"{self.name}_sum", base, cells[-2]))
+            samples.append((f"{self.name}_count", base, cells[-1]))
+        return samples
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+class MetricsRegistry:
+    """Named metrics of one process, rendered in the Prometheus text format."""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                if type(existing) is not type(metric) or existing.labelnames != metric.labelnames:
+                    raise ValueError(f"Metric {metric.name} is already registered differently")
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Counter:
+        """Get or create a counter."""
+        return self._register(Counter(name, help, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        help: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ) -> Histogram:
+        """Get or create a histogram."""
+        return self._register(Histogram(name, help, labelnames, buckets))
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format."""
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda m: m.name)
+        lines = []
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {_escape(metric.help)}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for name, labels, value in metric.samples():
+                if labels:
+                    rendered = ",".join(f'{k}="{_escape(str(v))}"' for k, v in labels.items())
+                    name = f"{name}{{{rendered}}}"
+                lines.append(f"{name} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+    def write_textfile(self, path: Path) -> None:
+        """
+        Write render() to a file atomically.
+
+        The temporary file does not end in .prom, so node_exporter's
+        textfile collector never reads a half-written snapshot.
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        tmp_path.write_text(self.render(), encoding="utf-8")
+        os.replace(tmp_path, path)
+
+
+class TextfileExporter:
+    """
+    Writes a registry to a textfile-collector directory every ``interval``
+    seconds from a daemon thread, and once more on stop().
+    """
+
+    def __init__(self, registry: MetricsRegistry, path: Path, interval: float = DEFAULT_EXPORT_INTERVAL):
+        """
+        Args:
+            registry: Metrics to export
+            path: .prom file to write
+            interval: Seconds between snapshots
+        """
+        self.registry = registry
+        self.path = Path(path)
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="metrics-textfile", daemon=True)
+
+    def start(self) -> "TextfileExporter":
+        self._thread.start()
+        return self
+
+    def _write(self) -> None:
+        try:
+            self.registry.write_textfile(self.path)
+        except OSError as e:
+            logger.warning(f"Could not write metrics to {self.path}: {e}")
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self._write()
+
+    def stop(self) -> None:
+        """Stop the thread and write a final snapshot."""
+        self._stop.set()
+        if self._thread.is_alive():
+            self._thread.join()
+        self._write()
+
+
+_exporter: Optional[TextfileExporter] = None
+_exporter_lock = threading.Lock()
+
+
+def start_textfile_exporter(
+    directory: Optional[str] = None, interval: Optional[float] = None
+) -> Optional[TextfileExporter]:
+    """
+    Export the default registry to a node_exporter textfile directory.
+
+    Does nothing unless a directory is given or METRICS_TEXTFILE_DIR is
+    set. Idempotent; the final snapshot is written at exit.
+
+    Args:
+        directory: Textfile-collector directory. Defaults to METRICS_TEXTFILE_DIR
+        interval: Seconds between snapshots. Defaults to METRICS_EXPORT_INTERVAL or 15
+
+    Returns:
+        The running exporter, or None when export is not configured
+    """
+    global _exporter
+    directory = directory or os.getenv("METRICS_TEXTFILE_DIR")
+    if not directory:
+        return None
+    with _exporter_lock:
+        if _exporter is None:
+            if interval is None:
+                interval = float(os.getenv("METRICS_EXPORT_INTERVAL", str(DEFAULT_EXPORT_INTERVAL)))
+            _exporter = TextfileExporter(REGISTRY, Path(directory) / DEFAULT_TEXTFILE_NAME, interval).start()
+            atexit.register(stop_textfile_exporter)
+        return _exporter
+
+
+def stop_textfile_exporter() -> None:
+    """Write a final snapshot and stop the exporter, if one is running."""
+    global _exporter
+    with _exporter_lock:
+        exporter, _exporter = _exporter, None
+    if exporter is not None:
+        exporter.stop()
+
+
+def _reset_after_fork() -> None:
+    global _exporter
+    # The exporter thread does not survive fork; the child starts its own
+    _exporter = None
+
+
+if hasattr(os, "register_at_fork"):  # Unix only
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+REGISTRY = MetricsRegistry()
+
+POSTS_GENERATED = REGISTRY.counter(
+    "hpc_ai_tools_posts_generated_total", "Posts generated", ("focus", "language")
+)
+TRUNCATIONS = REGISTRY.counter(
+    "hpc_ai_tools_truncations_total",
+    "Generated posts that had to be truncated to MAX_TWEET_LENGTH",
+    ("language",),
+)
+VALIDATION_REJECTS = REGISTRY.counter(
+    "hpc_ai_tools_validation_rejects_total", "Posts rejected before publishing", ("reason",)
+)
+POST_LATENCY = REGISTRY.histogram(
+    "hpc_ai_tools_post_latency_seconds",
+    "Time to publish (or mock-publish) one post",
+    ("mode", "outcome"),
+)
+API_ERRORS = REGISTRY.counter(
+    "hpc_ai_tools_api_errors_total", "Failed X API calls", ("endpoint", "error_class")
+)
+RATE_LIMIT_WAIT = REGISTRY.histogram(
+    "hpc_ai_tools_rate_limit_wait_seconds",
+    "Waits for X API rate-limit budget",
+    ("endpoint",),
+    buckets=WAIT_BUCKETS,
+)
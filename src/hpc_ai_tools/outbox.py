@@ -0,0 +1,412 @@
+"""
+Durable outbox of posts waiting to be published
+"""
+
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    from .x_poster import XPoster
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_OUTBOX_PATH = "logs/outbox.sqlite3"
+DEFAULT_LEASE_SECONDS = 300.0
+DEFAULT_MAX_ATTEMPTS = 5
+DEFAULT_RETRY_DELAY = 60.0
+MAX_RETRY_DELAY = 3600.0
+DEFAULT_BATCH_SIZE = 10
+
+STATUSES = ("pending", "leased", "done", "dead")
+
+
+@dataclass
+class OutboxItem:
+    """A claimed outbox entry."""
+
+    id: int
+    content: str
+    focus: Optional[str]
+    attempts: int
+
+
+@dataclass
+class Outcome:
+    """Result of publishing one claimed item."""
+
+    id: int
+    success: bool
+    tweet_id: Optional[str] = None
+    error: Optional[str] = None
+    retryable: bool = True
+
+
+class Outbox:
+    """
+    Queue of posts in a sqlite database in WAL mode.
+
+    Producers enqueue content; drain workers claim batches under a lease,
+    publish them and record the outcomes in one transaction per batch.
+    Items whose lease expires (the worker died or stalled) become claimable
+    again, failed items are retried with exponential backoff, and items
+    that fail ``max_attempts`` times are moved to the dead-letter status.
+    Claims run in ``BEGIN IMMEDIATE`` transactions, so any number of worker
+    processes can drain the same file.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        lease_seconds: Optional[float] = None,
+        max_attempts: Optional[int] = None,
+        retry_delay: Optional[float] = None,
+    ):
+        """
+        Initialize the outbox (the database is opened on first use).
+
+        Args:
+            path: sqlite file. Defaults to OUTBOX_PATH or logs/outbox.sqlite3
+            lease_seconds: How long a claim is held before another worker may
+                take the item. Defaults to OUTBOX_LEASE_SECONDS or 300
+            max_attempts: Attempts before an item is dead-lettered. Defaults
+                to OUTBOX_MAX_ATTEMPTS or 5
+            retry_delay: Delay before the first retry, doubled on each
+                further attempt. Defaults to OUTBOX_RETRY_DELAY or 60
+        """
+        self.path = Path(path or os.getenv("OUTBOX_PATH", DEFAULT_OUTBOX_PATH))
+        if lease_seconds is None:
+            lease_seconds = float(os.getenv("OUTBOX_LEASE_SECONDS", str(DEFAULT_LEASE_SECONDS)))
+        if max_attempts is None:
+            max_attempts = int(os.getenv("OUTBOX_MAX_ATTEMPTS", str(DEFAULT_MAX_ATTEMPTS)))
+        if retry_delay is None:
+            retry_delay = float(os.getenv("OUTBOX_RETRY_DELAY", str(DEFAULT_RETRY_DELAY)))
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            # Autocommit mode; transactions are opened explicitly below
+            conn = sqlite3.connect(
+                str(self.path), timeout=30, isolation_level=None, check_same_thread=False
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS outbox ("
+                " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+                " content TEXT NOT NULL,"
+                " focus TEXT,"
+                " status TEXT NOT NULL DEFAULT 'pending',"
+                " attempts INTEGER NOT NULL DEFAULT 0,"
+                " available_at REAL NOT NULL,"
+                " lease_owner TEXT,"
+                " lease_expires REAL,"
+                " tweet_id TEXT,"
+                " last_error TEXT,"
+                " created_at REAL NOT NULL,"
+                " updated_at REAL NOT NULL"
+                ")"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS outbox_ready_idx"
+                " ON outbox (status, available_at)"
+            )
+            self._conn = conn
+        return self._conn
+
+    def enqueue(
+        self,
+        contents: Iterable[str],
+        focus: Optional[str] = None,
+        now: Optional[float] = None,
+    ) -> List[int]:
+        """
+        Add posts to the outbox in one transaction.
+
+        Args:
+            contents: Post texts
+            focus: Content focus recorded with each post
+            now: Enqueue time as a Unix timestamp (defaults to time.time())
+
+        Returns:
+            IDs of the new items
+        """
+        now = time.time() if now is None else now
+        ids = []
+        with self._lock:
+            conn = self._connect()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                for content in contents:
+                    cursor = conn.execute(
+                        "INSERT INTO outbox (content, focus, available_at, created_at, updated_at)"
+                        " VALUES (?, ?, ?, ?, ?)",
+                        (content, focus, now, now, now),
+                    )
+                    ids.append(cursor.lastrowid)
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        return ids
+
+    def claim(
+        self, worker_id: str, limit: int = DEFAULT_BATCH_SIZE, now: Optional[float] = None
+    ) -> List[OutboxItem]:
+        """
+        Lease up to ``limit`` ready items to a worker.
+
+        Pending items whose retry time has come and leased items whose lease
+        has expired are both claimable. A reclaimed item that has already
+        used all its attempts is dead-lettered instead.
+
+        Args:
+            worker_id: Lease owner
+            limit: Maximum items to claim
+            now: Current time as a Unix timestamp (defaults to time.time())
+
+        Returns:
+            Claimed items, oldest first
+        """
+        now = time.time() if now is None else now
+        with self._lock:
+            conn = self._connect()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                rows = conn.execute(
+                    "SELECT id, content, focus, attempts, status FROM outbox"
+                    " WHERE (status = 'pending' AND available_at <= ?)"
+                    " OR (status = 'leased' AND lease_expires <= ?)"
+                    " ORDER BY id LIMIT ?",
+                    (now, now, limit),
+                ).fetchall()
+
+                items = []
+                for item_id, content, focus, attempts, status in rows:
+                    if status == "leased" and attempts >= self.max_attempts:
+                        conn.execute(
+                            "UPDATE outbox SET status = 'dead', lease_owner = NULL,"
+                            " last_error = 'Lease expired on the final attempt',"
+                            " updated_at = ? WHERE id = ?",
+                            (now, item_id),
+                        )
+                        continue
+                    if status == "leased":
+                        logger.warning(f"Reclaiming outbox item {item_id} after an expired lease")
+                    conn.execute(
+                        "UPDATE outbox SET status = 'leased', lease_owner = ?,"
+                        " lease_expires = ?, attempts = attempts + 1, updated_at = ?"
+                        " WHERE id = ?",
+                        (worker_id, now + self.lease_seconds, now, item_id),
+                    )
+                    items.append(OutboxItem(item_id, content, focus, attempts + 1))
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        return items
+
+    def finish(
+        self, worker_id: str, outcomes: Iterable[Outcome], now: Optional[float] = None
+    ) -> None:
+        """
+        Record a batch of outcomes in one transaction.
+
+        Successes are always recorded, since the post exists whoever held
+        the lease. Failures only apply while the worker still owns the lease;
+        they schedule a retry, or dead-letter the item when it is out of
+        attempts or the failure is not retryable.
+
+        Args:
+            worker_id: Lease owner that produced the outcomes
+            outcomes: Outcomes of claimed items
+            now: Current time as a Unix timestamp (defaults to time.time())
+        """
+        now = time.time() if now is None else now
+        with self._lock:
+            conn = self._connect()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                for outcome in outcomes:
+                    if outcome.success:
+                        conn.execute(
+                            "UPDATE outbox SET status = 'done', tweet_id = ?,"
+                            " lease_owner = NULL, last_error = NULL, updated_at = ?"
+                            " WHERE id = ?",
+                            (outcome.tweet_id, now, outcome.id),
+                        )
+                        continue
+
+                    row = conn.execute(
+                        "SELECT attempts FROM outbox"
+                        " WHERE id = ? AND status = 'leased' AND lease_owner = ?",
+                        (outcome.id, worker_id),
+                    ).fetchone()
+                    if row is None:
+                        logger.warning(f"Lease on outbox item {outcome.id} was lost; dropping outcome")
+                        continue
+
+                    attempts = row[0]
+                    if not outcome.retryable or attempts >= self.max_attempts:
+                        status, available_at = "dead", now
+                    else:
+                        delay = min(self.retry_delay * 2 ** (attempts - 1), MAX_RETRY_DELAY)
+                        status, available_at = "pending", now + delay
+                    conn.execute(
+                        "UPDATE outbox SET status = ?, available_at = ?, lease_owner = NULL,"
+                        " last_error = ?, updated_at = ? WHERE id = ?",
+                        (status, available_at, outcome.error, now, outcome.id),
+                    )
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+
+    def requeue_dead(self, now: Optional[float] = None) -> int:
+        """
+        Move dead-lettered items back to pending with a fresh attempt count.
+
+        Returns:
+            Number of requeued items
+        """
+        now = time.time() if now is None else now
+        with self._lock:
+            cursor = self._connect().execute(
+                "UPDATE outbox SET status = 'pending', attempts = 0, available_at = ?,"
+                " updated_at = ? WHERE status = 'dead'",
+                (now, now),
+            )
+        return cursor.rowcount
+
+    def counts(self) -> Dict[str, int]:
+        """Number of items in each status."""
+        with self._lock:
+            rows = self._connect().execute(
+                "SELECT status, COUNT(*) FROM outbox GROUP BY status"
+            ).fetchall()
+        counts = dict.fromkeys(STATUSES, 0)
+        counts.update(rows)
+        return counts
+
+    def dead_letters(self, limit: int = 100) -> List[Tuple[int, str, Optional[str]]]:
+        """(id, content, last_error) of dead-lettered items, oldest first."""
+        with self._lock:
+            return self._connect().execute(
+                "SELECT id, content, last_error FROM outbox WHERE status = 'dead'"
+                " ORDER BY id LIMIT ?",
+                (limit,),
+            ).fetchall()
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+def default_worker_id() -> str:
+    """Lease owner name for this process."""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+class OutboxWorker:
+    """
+    Drains an Outbox through an XPoster.
+
+    Each round claims a batch, posts the items one by one and commits all
+    outcomes together. If the worker dies mid-batch its leases expire and
+    another worker picks the items up; the posted-content index keeps an
+    item that was already published from being posted twice.
+    """
+
+    def __init__(
+        self,
+        outbox: Outbox,
+        poster: "XPoster",
+        worker_id: Optional[str] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ):
+        """
+        Args:
+            outbox: Outbox to drain
+            poster: Publisher; its mode decides mock or real posting
+            worker_id: Lease owner name. Defaults to host:pid
+            batch_size: Items claimed and committed together
+        """
+        if batch_size < 1:
+            raise ValueError(f"Batch size must be positive, got {batch_size}")
+        self.outbox = outbox
+        self.poster = poster
+        self.worker_id = worker_id or default_worker_id()
+        self.batch_size = batch_size
+
+    def _publish(self, item: OutboxItem) -> Outcome:
+        # Content that can never be posted is dead-lettered without retries
+        success, message, tweet_id, retryable = self.poster._publish(item.content, item.focus)
+        if success:
+            return Outcome(item.id, True, tweet_id=tweet_id)
+        if self.poster.post_index.contains(item.content):
+            # Posted by an earlier lease holder that died before finishing its batch
+            logger.info(f"Outbox item {item.id} was already posted; marking it done")
+            return Outcome(item.id, True)
+        return Outcome(item.id, False, error=message, retryable=retryable)
+
+    def run_once(self) -> List[Outcome]:
+        """
+        Claim, publish and commit one batch.
+
+        Returns:
+            Outcomes of the batch (empty when nothing was ready)
+        """
+        items = self.outbox.claim(self.worker_id, self.batch_size)
+        outcomes = []
+        for item in items:
+            try:
+                outcomes.append(self._publish(item))
+            except Exception as e:
+                logger.error(f"Unexpected error publishing outbox item {item.id}: {e}")
+                outcomes.append(Outcome(item.id, False, error=f"Unexpected error: {e}"))
+        if outcomes:
+            self.outbox.finish(self.worker_id, outcomes)
+        return outcomes
+
+    def run(
+        self,
+        follow: bool = False,
+        poll_interval: float = 5.0,
+        stop: Optional[threading.Event] = None,
+    ) -> Dict[str, int]:
+        """
+        Drain until nothing is ready.
+
+        Args:
+            follow: Keep polling for new items instead of returning
+            poll_interval: Seconds between polls when idle
+            stop: Event that ends a following worker
+
+        Returns:
+            Counts of posted and failed items
+        """
+        totals = {"posted": 0, "failed": 0}
+        stop = stop or threading.Event()
+        while not stop.is_set():
+            outcomes = self.run_once()
+            for outcome in outcomes:
+                totals["posted" if outcome.success else "failed"] += 1
+            if not outcomes:
+                if not follow:
+                    break
+                stop.wait(poll_interval)
+        return totals
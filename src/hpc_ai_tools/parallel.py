@@ -0,0 +1,122 @@
+"""
+Process-pool content generation
+"""
+
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .content_generator import ContentGenerator
+
+logger = logging.getLogger(__name__)
+
+# Posts per task. Chunk boundaries (and so the seed each chunk gets) depend
+# only on the requested count, never on the number of workers.
+PARALLEL_CHUNK_SIZE = 4096
+
+# Separate seed streams per focus so 'hpc' and 'ai' runs never overlap
+FOCUS_SEED_KEYS = {"hpc": 0, "ai": 1}
+
+# Generator reused by every task that runs in this process
+_worker_generator: Optional[ContentGenerator] = None
+
+
+def _init_worker(language: str) -> None:
+    """Build the per-process generator once, when a worker starts."""
+    global _worker_generator
+    _worker_generator = ContentGenerator(language=language)
+
+
+def _generate_chunk(
+    task: Tuple[str, int, np.random.SeedSequence]
+) -> Tuple[List[str], Dict[str, np.ndarray]]:
+    """Generate one chunk from its own seed stream."""
+    focus, count, seed_seq = task
+    rng = np.random.default_rng(seed_seq)
+    return _worker_generator.generate_batch(count, focus=focus, rng=rng)
+
+
+def resolve_seed(seed: Optional[int]) -> int:
+    """
+    Return ``seed``, or fresh entropy that can be passed back to replay a run.
+
+    Args:
+        seed: Requested seed or None
+
+    Returns:
+        Integer seed
+    """
+    if seed is not None:
+        return seed
+    return np.random.SeedSequence().entropy
+
+
+def generate_parallel(
+    n: int,
+    focus: str = "hpc",
+    language: str = "en",
+    workers: Optional[int] = None,
+    seed: Optional[int] = None,
+    chunk_size: int = PARALLEL_CHUNK_SIZE,
+) -> Tuple[List[str], Dict[str, np.ndarray]]:
+    """
+    Generate ``n`` posts across a process pool.
+
+    The count is split into fixed-size chunks and chunk ``i`` draws from
+    ``SeedSequence(seed, spawn_key=(focus, i))``. Results are merged in chunk
+    order, so for a given seed the output is identical for any worker count.
+
+    Args:
+        n: Number of posts to generate
+        focus: Content focus ('hpc' or 'ai')
+        language: Content language
+        workers: Worker processes (None for all CPUs, 1 to run in-process)
+        seed: Run seed (None for fresh entropy, see resolve_seed)
+        chunk_size: Posts per task
+
+    Returns:
+        Tuple of (posts, indices) as returned by ContentGenerator.generate_batch
+    """
+    if n < 0:
+        raise ValueError(f"Batch size must be non-negative, got {n}")
+    if chunk_size < 1:
+        raise ValueError(f"Chunk size must be positive, got {chunk_size}")
+
+    seed = resolve_seed(seed)
+    focus_key = FOCUS_SEED_KEYS.get(focus, len(FOCUS_SEED_KEYS))
+    tasks = [
+        (
+            focus,
+            min(chunk_size, n - start),
+            np.random.SeedSequence(seed, spawn_key=(focus_key, i)),
+        )
+        for i, start in enumerate(range(0, n, chunk_size))
+    ]
+
+    workers = workers or os.cpu_count() or 1
+    workers = min(workers, max(len(tasks), 1))
+
+    if workers == 1:
+        _init_worker(language)
+        results = [_generate_chunk(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker, initargs=(language,)
+        ) as executor:
+            results = list(executor.map(_generate_chunk, tasks))
+
+    logger.info(f"Generated {n} {focus} posts in {len(tasks)} chunks on {workers} workers")
+
+    posts = [post for chunk_posts, _ in results for post in chunk_posts]
+    names = ("topic", "template", "organization", "emoji")
+    if results:
+        indices = {
+            name: np.concatenate([chunk[name] for _, chunk in results])
+            for name in names
+        }
+    else:
+        indices = {name: np.empty(0, dtype=np.int64) for name in names}
+    return posts, indices
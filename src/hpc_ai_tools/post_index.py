@@ -0,0 +1,146 @@
+"""
+Persistent index of posted content
+"""
+
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INDEX_PATH = "logs/post_index.sqlite3"
+DEFAULT_RETENTION_DAYS = 30.0
+
+
+class PostIndex:
+    """
+    Content-hash index of posted content backed by sqlite.
+
+    Each entry is keyed by the SHA-256 of the stripped content, so a lookup
+    is a single primary-key probe regardless of history size. Entries older
+    than the retention window are ignored by lookups and evicted on open
+    and by evict().
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        retention_days: Optional[float] = None,
+    ):
+        """
+        Initialize the index (the database is opened on first use).
+
+        Args:
+            path: sqlite file. Defaults to POST_INDEX_PATH or logs/post_index.sqlite3
+            retention_days: How long posted content blocks a repeat. Defaults
+                to POST_RETENTION_DAYS or 30
+        """
+        self.path = Path(path or os.getenv("POST_INDEX_PATH", DEFAULT_INDEX_PATH))
+        if retention_days is None:
+            retention_days = float(
+                os.getenv("POST_RETENTION_DAYS", str(DEFAULT_RETENTION_DAYS))
+            )
+        self.retention_seconds = retention_days * 86400
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def content_hash(content: str) -> bytes:
+        """SHA-256 digest identifying a piece of content."""
+        return hashlib.sha256(content.strip().encode("utf-8")).digest()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path), check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS posted ("
+                " hash BLOB PRIMARY KEY,"
+                " posted_at REAL NOT NULL"
+                ") WITHOUT ROWID"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS posted_at_idx ON posted (posted_at)"
+            )
+            conn.commit()
+            self._conn = conn
+            self._evict_locked(time.time())
+        return self._conn
+
+    def contains(self, content: str, now: Optional[float] = None) -> bool:
+        """
+        Check whether content was posted within the retention window.
+
+        Args:
+            content: Content to look up
+            now: Current time as a Unix timestamp (defaults to time.time())
+
+        Returns:
+            True if the content is a duplicate
+        """
+        now = time.time() if now is None else now
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT posted_at FROM posted WHERE hash = ?",
+                (self.content_hash(content),),
+            ).fetchone()
+        return row is not None and row[0] >= now - self.retention_seconds
+
+    def add(self, content: str, now: Optional[float] = None) -> None:
+        """
+        Record content as posted.
+
+        Args:
+            content: Posted content
+            now: Post time as a Unix timestamp (defaults to time.time())
+        """
+        now = time.time() if now is None else now
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO posted (hash, posted_at) VALUES (?, ?)",
+                (self.content_hash(content), now),
+            )
+            conn.commit()
+
+    def evict(self, now: Optional[float] = None) -> int:
+        """
+        Delete entries older than the retention window.
+
+        Args:
+            now: Current time as a Unix timestamp (defaults to time.time())
+
+        Returns:
+            Number of evicted entries
+        """
+        now = time.time() if now is None else now
+        with self._lock:
+            self._connect()
+            return self._evict_locked(now)
+
+    def _evict_locked(self, now: float) -> int:
+        cursor = self._conn.execute(
+            "DELETE FROM posted WHERE posted_at < ?",
+            (now - self.retention_seconds,),
+        )
+        self._conn.commit()
+        if cursor.rowcount:
+            logger.info(f"Evicted {cursor.rowcount} expired entries from {self.path}")
+        return cursor.rowcount
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connect().execute("SELECT COUNT(*) FROM posted").fetchone()[0]
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
@@ -0,0 +1,207 @@
+"""
+Running posting counters kept beside the post logs
+"""
+
+import logging
+import mmap
+import os
+import re
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Optional
+
+if TYPE_CHECKING:
+    from .history import PostHistory
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_STATS_PATH = "logs/post_stats.sqlite3"
+
+COUNTERS = ("total_posts", "real_posts", "mock_posts", "errors", "last_post_at")
+
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# Record headers written by XPoster, anchored to the start of a line so
+# post text that mentions "REAL POST" is not counted
+_POST_HEADER = re.compile(rb"^\[([0-9: -]{19})\] (MOCK|REAL) POST", re.MULTILINE)
+_ERROR_HEADER = re.compile(rb"^\[[0-9: -]{19}\] ERROR$", re.MULTILINE)
+
+
+class PostCounters:
+    """
+    Posting totals stored as counter rows in a small sqlite file.
+
+    Each logged post or error bumps its counters in one short transaction,
+    so reading the totals costs the same however long the history is.
+    rebuild() recomputes them from the logs for installs that predate the
+    counters or after the file is lost.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Initialize the counters (the database is opened on first use).
+
+        Args:
+            path: sqlite file. Defaults to POST_STATS_PATH or logs/post_stats.sqlite3
+        """
+        self.path = Path(path or os.getenv("POST_STATS_PATH", DEFAULT_STATS_PATH))
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS counters ("
+                " name TEXT PRIMARY KEY,"
+                " value REAL NOT NULL"
+                ") WITHOUT ROWID"
+            )
+            conn.executemany(
+                "INSERT OR IGNORE INTO counters (name, value) VALUES (?, 0)",
+                [(name,) for name in COUNTERS],
+            )
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def record(self, kind: str, now: Optional[float] = None) -> None:
+        """
+        Count one logged post or error.
+
+        Args:
+            kind: 'mock', 'real' or 'error'
+            now: Event time as a Unix timestamp (defaults to time.time())
+        """
+        now = time.time() if now is None else now
+        if kind == "error":
+            names = ("errors",)
+        elif kind in ("mock", "real"):
+            names = ("total_posts", f"{kind}_posts")
+        else:
+            raise ValueError(f"Unknown post kind: {kind}")
+
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.execute(
+                    f"UPDATE counters SET value = value + 1"
+                    f" WHERE name IN ({', '.join('?' * len(names))})",
+                    names,
+                )
+                if kind != "error":
+                    conn.execute(
+                        "UPDATE counters SET value = MAX(value, ?) WHERE name = 'last_post_at'",
+                        (now,),
+                    )
+
+    def snapshot(self) -> Dict[str, object]:
+        """
+        Current counters.
+
+        Returns:
+            Dictionary with total_posts, real_posts, mock_posts, errors and
+            last_post_at (formatted local time, or None before the first post)
+        """
+        with self._lock:
+            rows = dict(self._connect().execute("SELECT name, value FROM counters"))
+        stats: Dict[str, object] = {name: int(rows.get(name, 0)) for name in COUNTERS[:-1]}
+        last = rows.get("last_post_at")
+        stats["last_post_at"] = (
+            datetime.fromtimestamp(last).strftime(TIMESTAMP_FORMAT) if last else None
+        )
+        return stats
+
+    def rebuild(
+        self,
+        history: "PostHistory",
+        tweet_log: Optional[Path] = None,
+        error_log: Optional[Path] = None,
+    ) -> Dict[str, object]:
+        """
+        Recompute the counters from the post history and any legacy logs.
+
+        The JSONL history (every segment, compressed or not) is streamed
+        block by block. The free-text logs written before it are
+        memory-mapped and scanned for record headers, so they are streamed
+        through the page cache rather than read into memory.
+
+        Args:
+            history: Post history
+            tweet_log: Legacy post log (tweet_log.txt)
+            error_log: Legacy error log (post_errors.log)
+
+        Returns:
+            The rebuilt counters, as snapshot() reports them
+        """
+        values = dict.fromkeys(COUNTERS, 0.0)
+
+        if tweet_log is not None:
+            with _mapped(tweet_log) as data:
+                last = None
+                for match in _POST_HEADER.finditer(data):
+                    kind = match.group(2).decode("ascii").lower()
+                    values["total_posts"] += 1
+                    values[f"{kind}_posts"] += 1
+                    last = match.group(1)
+                if last is not None:
+                    values["last_post_at"] = datetime.strptime(
+                        last.decode("ascii"), TIMESTAMP_FORMAT
+                    ).timestamp()
+
+        if error_log is not None:
+            with _mapped(error_log) as data:
+                values["errors"] = float(sum(1 for _ in _ERROR_HEADER.finditer(data)))
+
+        for record in history.query():
+            if record.get("error"):
+                values["errors"] += 1
+                continue
+            values["total_posts"] += 1
+            values[f"{record['mode']}_posts"] += 1
+            posted_at = datetime.fromisoformat(record["timestamp"]).timestamp()
+            values["last_post_at"] = max(values["last_post_at"], posted_at)
+
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.executemany(
+                    "UPDATE counters SET value = ? WHERE name = ?",
+                    [(value, name) for name, value in values.items()],
+                )
+        logger.info(f"Rebuilt posting counters from {history.path}")
+        return self.snapshot()
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+class _mapped:
+    """Read-only mmap of a file; empty bytes for a missing or empty file."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._file = None
+        self._map = None
+
+    def __enter__(self):
+        if not self.path.exists() or self.path.stat().st_size == 0:
+            return b""
+        self._file = open(self.path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._map
+
+    def __exit__(self, *exc_info):
+        if self._map is not None:
+            self._map.close()
+            self._file.close()
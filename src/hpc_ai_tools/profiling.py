@@ -0,0 +1,174 @@
+"""
+CPU and memory profiling of CLI commands
+"""
+
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Optional, TextIO
+
+PROFILE_MODES = ("cpu", "mem")
+DEFAULT_PROFILE_DIR = "logs/profiles"
+DEFAULT_TOP = 15
+
+# Frames kept per allocation; more lines up callers but slows tracing
+TRACEMALLOC_FRAMES = 1
+
+
+def profile_path(command: str, mode: str, output: Optional[str] = None) -> Path:
+    """
+    Where to write a command's profile.
+
+    Args:
+        command: Subcommand name
+        mode: 'cpu' or 'mem'
+        output: The command's --output file, if any
+
+    Returns:
+        ``<output>.pstats`` / ``<output>.mem.txt`` next to a file output,
+        else a timestamped file in PROFILE_DIR (default logs/profiles)
+    """
+    suffix = ".pstats" if mode == "cpu" else ".mem.txt"
+    if output and output != "-":
+        path = Path(output)
+        return path.with_name(path.name + suffix)
+    directory = Path(os.getenv("PROFILE_DIR", DEFAULT_PROFILE_DIR))
+    return directory / f"{command}-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}{suffix}"
+
+
+def _function_name(key) -> str:
+    filename, line, name = key
+    if filename == "~":
+        # Built-ins are keyed as ('~', 0, '<built-in method ...>')
+        return name
+    return f"{name} ({Path(filename).name}:{line})"
+
+
+def profile_cpu(
+    run: Callable[[], int], path: Path, top: int = DEFAULT_TOP, stream: Optional[TextIO] = None
+) -> int:
+    """
+    Run a callable under cProfile, save the stats and print the hottest functions.
+
+    Only the calling thread is profiled; work handed to worker threads
+    shows up as time spent waiting on them.
+
+    Args:
+        run: Command to profile
+        path: .pstats file (readable with ``python -m pstats`` or snakeviz)
+        top: Functions to list, by own time
+        stream: Where to print the summary (default: stderr)
+
+    Returns:
+        The callable's return value
+    """
+    import cProfile
+    import pstats
+
+    stream = stream or sys.stderr
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        return run()
+    finally:
+        profiler.disable()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        profiler.dump_stats(str(path))
+
+        stats = pstats.Stats(profiler)
+        calls = sum(nc for _, nc, _, _, _ in stats.stats.values())
+        print(
+            f"🔥 CPU profile: {stats.total_tt:.3f}s in {calls:,} calls, saved to {path}",
+            file=stream,
+        )
+        print(f"   {'own s':>8} {'total s':>8} {'calls':>9}  function", file=stream)
+        hottest = sorted(stats.stats.items(), key=lambda item: item[1][2], reverse=True)
+        for key, (_, nc, tt, ct, _) in hottest[:top]:
+            print(f"   {tt:>8.3f} {ct:>8.3f} {nc:>9,}  {_function_name(key)}", file=stream)
+
+
+def profile_memory(
+    run: Callable[[], int], path: Path, top: int = DEFAULT_TOP, stream: Optional[TextIO] = None
+) -> int:
+    """
+    Run a callable under tracemalloc and report the top allocation sites.
+
+    Memory still held when the command returns is attributed to the line
+    that allocated it; the peak covers everything traced during the run.
+
+    Args:
+        run: Command to profile
+        path: Text file for the top allocation sites
+        top: Allocation sites to keep, by size
+        stream: Where to print the summary (default: stderr)
+
+    Returns:
+        The callable's return value
+    """
+    import tracemalloc
+
+    stream = stream or sys.stderr
+    tracemalloc.start(TRACEMALLOC_FRAMES)
+    try:
+        return run()
+    finally:
+        snapshot = tracemalloc.take_snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        snapshot = snapshot.filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+            tracemalloc.Filter(False, "<unknown>"),
+        ))
+        largest = snapshot.statistics("lineno")[:top]
+        lines = [f"current {current / 1024:,.1f} KiB, peak {peak / 1024:,.1f} KiB"]
+        lines += [
+            f"{stat.size / 1024:>10,.1f} KiB {stat.count:>9,} blocks  "
+            f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}"
+            for stat in largest
+        ]
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+        print(f"🧠 Memory profile: {lines[0]}, saved to {path}", file=stream)
+        print(f"   {'size KiB':>10} {'blocks':>9}  allocated at", file=stream)
+        for stat in largest:
+            frame = stat.traceback[0]
+            print(
+                f"   {stat.size / 1024:>10,.1f} {stat.count:>9,}  {Path(frame.filename).name}:{frame.lineno}",
+                file=stream,
+            )
+
+
+def run_profiled(
+    run: Callable[[], int],
+    mode: str,
+    path: Path,
+    top: Optional[int] = None,
+    stream: Optional[TextIO] = None,
+) -> int:
+    """
+    Run a command under the CPU or memory profiler.
+
+    Args:
+        run: Command to profile
+        mode: 'cpu' or 'mem'
+        path: Profile output file
+        top: Entries in the summary. Defaults to PROFILE_TOP or 15
+        stream: Where to print the summary (default: stderr)
+
+    Returns:
+        The command's return value
+
+    Raises:
+        ValueError: If the mode is unknown
+    """
+    if mode not in PROFILE_MODES:
+        raise ValueError(f"Unknown profile mode '{mode}' (choose from {', '.join(PROFILE_MODES)})")
+    if top is None:
+        top = int(os.getenv("PROFILE_TOP", str(DEFAULT_TOP)))
+    profile = profile_cpu if mode == "cpu" else profile_memory
+    return profile(run, path, top, stream)
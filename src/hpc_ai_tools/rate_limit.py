@@ -0,0 +1,150 @@
+"""
+Rate-limit aware scheduling of X API calls
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, Mapping, Optional
+
+from .metrics import RATE_LIMIT_WAIT
+from .x_api import XApiError
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_STATE_PATH = "logs/rate_limits.json"
+DEFAULT_MAX_WAIT = 900.0
+
+# Wait used after a 429 that carries no reset header
+FALLBACK_RESET_SECONDS = 60.0
+
+
+class RateLimitExceeded(XApiError):
+    """The endpoint's budget is spent and the reset is too far away to wait for."""
+
+    def __init__(self, endpoint: str, reset: float, wait: float):
+        super().__init__(429, f"Rate limit for {endpoint} exhausted; resets in {wait:.0f}s")
+        self.endpoint = endpoint
+        self.reset = reset
+
+
+class RateLimitManager:
+    """
+    One token bucket per API endpoint, fed by X's rate-limit headers.
+
+    A bucket holds ``x-rate-limit-remaining`` tokens and refills to
+    ``x-rate-limit-limit`` at ``x-rate-limit-reset``. acquire() takes a token
+    before each call and sleeps until the reset when none is left, so calls
+    wait for budget instead of failing with 429. Buckets are saved to a JSON
+    file after every update so the next process starts with the same view
+    of the window.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        max_wait: Optional[float] = None,
+        clock: Callable[[], float] = time.time,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        """
+        Args:
+            path: State file. Defaults to X_RATE_LIMIT_STATE or logs/rate_limits.json
+            max_wait: Longest delay acquire() accepts before raising
+                RateLimitExceeded. Defaults to X_RATE_LIMIT_MAX_WAIT or 900s
+            clock: Unix time source
+            sleep: Sleep function
+        """
+        self.path = Path(path or os.getenv("X_RATE_LIMIT_STATE", DEFAULT_STATE_PATH))
+        if max_wait is None:
+            max_wait = float(os.getenv("X_RATE_LIMIT_MAX_WAIT", str(DEFAULT_MAX_WAIT)))
+        self.max_wait = max_wait
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._buckets: Dict[str, Dict[str, float]] = {}
+        if self.path.exists():
+            try:
+                self._buckets = json.loads(self.path.read_text(encoding="utf-8"))
+            except ValueError:
+                logger.warning(f"Ignoring unreadable rate-limit state: {self.path}")
+
+    def acquire(self, endpoint: str) -> float:
+        """
+        Take one call's worth of budget, waiting for the reset if needed.
+
+        Args:
+            endpoint: Endpoint name (e.g. 'create_tweet')
+
+        Returns:
+            Seconds spent waiting
+
+        Raises:
+            RateLimitExceeded: If the wait would exceed max_wait
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                bucket = self._buckets.get(endpoint)
+                if bucket is None:
+                    return waited
+                now = self._clock()
+                if now >= bucket["reset"]:
+                    # Window rolled over; the next response reports the new one
+                    del self._buckets[endpoint]
+                    return waited
+                if bucket["remaining"] > 0:
+                    bucket["remaining"] -= 1
+                    return waited
+                wait = bucket["reset"] - now
+                reset = bucket["reset"]
+
+            if waited + wait > self.max_wait:
+                raise RateLimitExceeded(endpoint, reset, wait)
+            logger.warning(f"Rate limit for {endpoint} reached; waiting {wait:.1f}s")
+            RATE_LIMIT_WAIT.observe(wait, endpoint)
+            self._sleep(wait)
+            waited += wait
+
+    def update(self, endpoint: str, headers: Mapping[str, str], status_code: int = 200) -> None:
+        """
+        Refresh a bucket from a response.
+
+        Args:
+            endpoint: Endpoint name
+            headers: Response headers
+            status_code: Response status; a 429 empties the bucket
+        """
+        lowered = {k.lower(): v for k, v in headers.items()}
+        remaining = lowered.get("x-rate-limit-remaining")
+        reset = lowered.get("x-rate-limit-reset")
+        limit = lowered.get("x-rate-limit-limit")
+
+        if status_code == 429:
+            remaining = 0
+            if reset is None:
+                reset = self._clock() + FALLBACK_RESET_SECONDS
+        elif remaining is None or reset is None:
+            return
+
+        with self._lock:
+            self._buckets[endpoint] = {
+                "limit": float(limit) if limit is not None else float(remaining),
+                "remaining": float(remaining),
+                "reset": float(reset),
+            }
+            self._save_locked()
+
+    def state(self) -> Dict[str, Dict[str, float]]:
+        """Copy of the current buckets."""
+        with self._lock:
+            return {name: dict(bucket) for name, bucket in self._buckets.items()}
+
+    def _save_locked(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps(self._buckets), encoding="utf-8")
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,237 @@
+"""
+In-process daily scheduler for the serve daemon
+"""
+
+import asyncio
+import json
+import logging
+import os
+import random
+import signal
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from datetime import time as dtime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_STATE_PATH = "logs/serve_state.json"
+DEFAULT_JITTER = 300.0
+DEFAULT_CATCH_UP = 6 * 3600.0
+
+# Longest single sleep; waits are re-checked against the wall clock so a
+# suspended machine or a clock change does not delay a run by hours
+MAX_SLEEP = 60.0
+
+
+def parse_clock(value: str) -> dtime:
+    """
+    Parse a daily time of the form HH:MM (as in GENERATE_MORNING_AT).
+
+    Raises:
+        ValueError: If the value is not a valid time
+    """
+    try:
+        return datetime.strptime(value.strip(), "%H:%M").time()
+    except ValueError:
+        raise ValueError(f"Invalid time '{value}' (expected HH:MM)") from None
+
+
+@dataclass
+class Job:
+    """A callable run once a day at a local time."""
+
+    name: str
+    at: dtime
+    action: Callable[[], object]
+
+
+class Scheduler:
+    """
+    Runs daily jobs on an asyncio loop in one long-lived process.
+
+    Each job waits for its next slot plus a random delay of up to
+    ``jitter`` seconds, then runs on a worker thread. Jobs never overlap,
+    because they share the warm generator and poster. The slot of each
+    completed run is saved to a state file. After a restart (or a
+    suspended machine), a slot that was missed by less than ``catch_up``
+    seconds runs at once and older ones are skipped. Slots before the
+    first start are not treated as missed. stop(), or SIGINT/SIGTERM
+    under run(), lets the running job finish and then returns.
+    """
+
+    def __init__(
+        self,
+        jobs: Sequence[Job],
+        state_path: Optional[str] = None,
+        jitter: Optional[float] = None,
+        catch_up: Optional[float] = None,
+        clock: Callable[[], float] = time.time,
+        rng: Optional[random.Random] = None,
+    ):
+        """
+        Args:
+            jobs: Jobs to run
+            state_path: Last-run file. Defaults to SERVE_STATE_PATH or logs/serve_state.json
+            jitter: Maximum random delay after a slot. Defaults to SERVE_JITTER or 300s
+            catch_up: How late a missed slot may still run. Defaults to
+                SERVE_CATCH_UP or 6 hours
+            clock: Unix time source
+            rng: Random source for the jitter
+        """
+        self.jobs = list(jobs)
+        self.state_path = Path(state_path or os.getenv("SERVE_STATE_PATH", DEFAULT_STATE_PATH))
+        if jitter is None:
+            jitter = float(os.getenv("SERVE_JITTER", str(DEFAULT_JITTER)))
+        if catch_up is None:
+            catch_up = float(os.getenv("SERVE_CATCH_UP", str(DEFAULT_CATCH_UP)))
+        self.jitter = jitter
+        self.catch_up = catch_up
+        self._clock = clock
+        self._rng = rng or random.Random()
+        self._state: Dict[str, float] = {}
+        if self.state_path.exists():
+            try:
+                self._state = json.loads(self.state_path.read_text(encoding="utf-8"))
+            except ValueError:
+                logger.warning(f"Ignoring unreadable scheduler state: {self.state_path}")
+        self._stop = asyncio.Event()
+        self._run_lock = asyncio.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="serve-job")
+
+    def _slot(self, job: Job, day: datetime) -> float:
+        return datetime.combine(day.date(), job.at).timestamp()
+
+    def next_run(self, job: Job) -> Tuple[float, float]:
+        """
+        Slot and run time of a job's next run.
+
+        Returns:
+            Tuple of (slot, run_at) as Unix timestamps; run_at is now for a
+            missed slot within the catch-up window
+        """
+        now = self._clock()
+        today = datetime.fromtimestamp(now)
+        if job.name not in self._state:
+            self._save(job.name, now)
+        last = self._state[job.name]
+
+        # Latest slot that has passed but was not run
+        missed = self._slot(job, today)
+        if missed > now:
+            missed = self._slot(job, today - timedelta(days=1))
+        if missed > last:
+            if now - missed <= self.catch_up:
+                logger.info(f"Catching up missed {job.name} run of {datetime.fromtimestamp(missed)}")
+                return missed, now
+            logger.warning(
+                f"Skipping {job.name} run of {datetime.fromtimestamp(missed)} "
+                f"(missed by more than {self.catch_up:.0f}s)"
+            )
+            self._save(job.name, missed)
+
+        slot = self._slot(job, today)
+        if slot <= now:
+            slot = self._slot(job, today + timedelta(days=1))
+        return slot, slot + self._rng.uniform(0, self.jitter)
+
+    def _save(self, name: str, slot: float) -> None:
+        self._state[name] = slot
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.state_path.with_name(f"{self.state_path.name}.{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps(self._state), encoding="utf-8")
+        os.replace(tmp_path, self.state_path)
+
+    async def _sleep_until(self, run_at: float) -> bool:
+        """Wait for ``run_at``; False if stopped first."""
+        while not self._stop.is_set():
+            remaining = run_at - self._clock()
+            if remaining <= 0:
+                return True
+            try:
+                await asyncio.wait_for(self._stop.wait(), timeout=min(remaining, MAX_SLEEP))
+            except asyncio.TimeoutError:
+                pass
+        return False
+
+    async def _run_job(self, job: Job) -> None:
+        loop = asyncio.get_running_loop()
+        while not self._stop.is_set():
+            slot, run_at = self.next_run(job)
+            logger.info(f"Next {job.name} run at {datetime.fromtimestamp(run_at):%Y-%m-%d %H:%M:%S}")
+            if not await self._sleep_until(run_at):
+                return
+            async with self._run_lock:
+                if self._stop.is_set():
+                    return
+                logger.info(f"Running {job.name}")
+                started = time.perf_counter()
+                try:
+                    await loop.run_in_executor(self._executor, job.action)
+                    logger.info(f"{job.name} finished in {time.perf_counter() - started:.2f}s")
+                except Exception as e:
+                    logger.error(f"{job.name} failed: {e}")
+                # Failed runs are not retried here; posts left in the outbox
+                # are retried by the next drain
+                self._save(job.name, slot)
+
+    async def serve(self) -> None:
+        """Run the jobs until stop() is called."""
+        try:
+            await asyncio.gather(*(self._run_job(job) for job in self.jobs))
+        finally:
+            self._executor.shutdown(wait=True)
+
+    def stop(self) -> None:
+        """Ask serve() to return once the running job (if any) is done."""
+        self._stop.set()
+
+    def run(self, on_start: Optional[Callable[[], None]] = None) -> None:
+        """
+        Run serve() on a new event loop, stopping on SIGINT or SIGTERM.
+
+        Args:
+            on_start: Called once the signal handlers are installed
+        """
+        async def main() -> None:
+            loop = asyncio.get_running_loop()
+            for sig in (signal.SIGINT, signal.SIGTERM):
+                loop.add_signal_handler(sig, self._on_signal, sig)
+            if on_start is not None:
+                on_start()
+            await self.serve()
+
+        asyncio.run(main())
+
+    def _on_signal(self, sig: int) -> None:
+        logger.info(f"Received {signal.Signals(sig).name}; shutting down after the running job")
+        self.stop()
+
+    def state(self) -> Dict[str, float]:
+        """Slot of the last run of each job."""
+        return dict(self._state)
+
+
+def jobs_from_env(actions: Dict[str, Callable[[], object]]) -> List[Job]:
+    """
+    Jobs for the configured daily times.
+
+    Args:
+        actions: Callable per job name ('generate_morning', 'post_afternoon', ...)
+
+    Returns:
+        One Job per action, at the time from its <NAME>_AT setting
+    """
+    defaults = {
+        "generate_morning": "08:00",
+        "generate_afternoon": "14:00",
+        "post_morning": "09:00",
+        "post_afternoon": "15:00",
+    }
+    return [
+        Job(name, parse_clock(os.getenv(f"{name.upper()}_AT", defaults[name])), action)
+        for name, action in actions.items()
+    ]
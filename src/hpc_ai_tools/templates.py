@@ -0,0 +1,99 @@
+"""
+Precompiled content templates
+"""
+
+from string import Formatter
+from typing import List, Sequence, Tuple, Union
+
+# Order of the values passed to CompiledTemplate.render
+TEMPLATE_FIELDS = ("emoji", "topic", "organization", "hashtags")
+
+_FIELD_INDEX = {name: i for i, name in enumerate(TEMPLATE_FIELDS)}
+
+
+class CompiledTemplate:
+    """
+    A content template parsed once into literal fragments and field slots.
+
+    Rendering copies the fragment list, drops the field values into their
+    slots and joins the result, so the format string is never re-parsed.
+    """
+
+    __slots__ = (
+        "source", "slots", "static_length", "_parts", "_positions", "_counts"
+    )
+
+    def __init__(self, source: str):
+        """
+        Compile a template.
+
+        Args:
+            source: Template using ``{field}`` placeholders from TEMPLATE_FIELDS
+
+        Raises:
+            ValueError: If the template uses an unknown field, a conversion
+                or a format spec
+        """
+        self.source = source
+
+        slots: List[Union[str, int]] = []
+        for literal, field, spec, conversion in Formatter().parse(source):
+            if literal:
+                slots.append(literal)
+            if field is None:
+                continue
+            if field not in _FIELD_INDEX:
+                raise ValueError(f"Unknown template field '{field}' in: {source!r}")
+            if spec or conversion:
+                raise ValueError(f"Format specs are not supported: {source!r}")
+            slots.append(_FIELD_INDEX[field])
+
+        self.slots: Tuple[Union[str, int], ...] = tuple(slots)
+        self.static_length = sum(len(s) for s in slots if isinstance(s, str))
+        self._parts = ["" if isinstance(s, int) else s for s in slots]
+        self._positions = tuple(
+            (pos, s) for pos, s in enumerate(slots) if isinstance(s, int)
+        )
+        self._counts = tuple(
+            sum(1 for _, f in self._positions if f == field)
+            for field in range(len(TEMPLATE_FIELDS))
+        )
+
+    def render(self, values: Sequence[str]) -> str:
+        """
+        Render the template.
+
+        Args:
+            values: Field values ordered as TEMPLATE_FIELDS
+
+        Returns:
+            Rendered string
+        """
+        parts = self._parts.copy()
+        for pos, field in self._positions:
+            parts[pos] = values[field]
+        return "".join(parts)
+
+    def field_counts(self) -> Tuple[int, ...]:
+        """How many times each field (ordered as TEMPLATE_FIELDS) is used."""
+        return self._counts
+
+    def rendered_length(self, values: Sequence[str]) -> int:
+        """Length of the rendered string without rendering it."""
+        return self.static_length + sum(len(values[f]) for _, f in self._positions)
+
+    def __repr__(self) -> str:
+        return f"CompiledTemplate({self.source[:40]!r}...)"
+
+
+def compile_templates(templates: Sequence[str]) -> List[CompiledTemplate]:
+    """
+    Compile post templates, appending the hashtag line to each.
+
+    Args:
+        templates: Template strings
+
+    Returns:
+        List of compiled templates
+    """
+    return [CompiledTemplate(t + "\n\n{hashtags}") for t in templates]
@@ -0,0 +1,197 @@
+"""
+Splitting long content into numbered threads, with resumable progress
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import unicodedata
+from pathlib import Path
+from typing import List, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_THREAD_STATE_DIR = "logs/threads"
+
+_ZWJ = "\u200d"
+
+# Split points, coarsest first: after sentence-ending punctuation or at
+# line breaks, then at whitespace. The separator stays with the text
+# before it.
+_SENTENCE_BREAK = re.compile(r"(?<=[.!?…。！？])\s+|\n+")
+_WORD_BREAK = re.compile(r"\s+")
+
+
+def _extends_cluster(ch: str) -> bool:
+    """Characters that attach to the preceding grapheme cluster."""
+    cp = ord(ch)
+    return (
+        unicodedata.category(ch) in ("Mn", "Me", "Mc")
+        or 0xFE00 <= cp <= 0xFE0F  # variation selectors
+        or 0x1F3FB <= cp <= 0x1F3FF  # emoji skin tones
+        or 0xE0020 <= cp <= 0xE007F  # emoji tag sequences (flags)
+    )
+
+
+def _is_regional_indicator(ch: str) -> bool:
+    return 0x1F1E6 <= ord(ch) <= 0x1F1FF
+
+
+def graphemes(text: str) -> List[str]:
+    """
+    Split text into user-perceived characters.
+
+    Covers the cases that occur in post text: combining marks, emoji
+    modifiers and variation selectors, ZWJ emoji sequences, flag pairs and
+    CRLF. Cutting between two code points of a cluster would leave a
+    broken character at the end of one post and the start of the next.
+
+    Args:
+        text: Text to split
+
+    Returns:
+        Grapheme clusters, in order
+    """
+    clusters: List[str] = []
+    for ch in text:
+        if clusters:
+            last = clusters[-1]
+            if (
+                _extends_cluster(ch)
+                or ch == _ZWJ
+                or last.endswith(_ZWJ)
+                or (last == "\r" and ch == "\n")
+                or (
+                    _is_regional_indicator(ch)
+                    and len(last) == 1
+                    and _is_regional_indicator(last)
+                )
+            ):
+                clusters[-1] = last + ch
+                continue
+        clusters.append(ch)
+    return clusters
+
+
+def _units(text: str, level: int) -> List[str]:
+    """Pieces of ``text`` at a split level, each with its trailing whitespace."""
+    if level == 2:
+        return graphemes(text)
+    pattern = _SENTENCE_BREAK if level == 0 else _WORD_BREAK
+    units, start = [], 0
+    for match in pattern.finditer(text):
+        units.append(text[start:match.end()])
+        start = match.end()
+    if start < len(text):
+        units.append(text[start:])
+    return units
+
+
+def _pack(text: str, budget: int, level: int = 0) -> List[str]:
+    """Greedily fill parts of at most ``budget`` characters."""
+    parts: List[str] = []
+    current = ""
+    for unit in _units(text, level):
+        if len((current + unit).rstrip()) <= budget:
+            current += unit
+            continue
+        if current.strip():
+            parts.append(current.strip())
+        current = ""
+        if len(unit.rstrip()) <= budget:
+            current = unit
+            continue
+        # The unit alone is too long: split it one level finer
+        if level == 1 and unit.startswith("#"):
+            raise ValueError(f"Hashtag longer than a post: {unit.strip()[:30]}...")
+        pieces = _pack(unit, budget, level + 1)
+        parts.extend(pieces[:-1])
+        current = pieces[-1] + unit[len(unit.rstrip()):]
+    if current.strip():
+        parts.append(current.strip())
+    return parts
+
+
+def split_thread(content: str, max_length: int) -> List[str]:
+    """
+    Split content into numbered thread parts.
+
+    Parts break at sentence ends where possible, then between words, and
+    only inside a word (at grapheme boundaries) when a single word is
+    longer than a post. Hashtags are never split. Each part gets an
+    " i/n" suffix and stays within ``max_length`` including it.
+
+    Args:
+        content: Text to post
+        max_length: Character limit per post
+
+    Returns:
+        The parts in posting order; content that fits is returned as a
+        single unnumbered part
+
+    Raises:
+        ValueError: If a hashtag does not fit in one post
+    """
+    content = content.strip()
+    if len(content) <= max_length:
+        return [content]
+
+    # Reserve room for the widest suffix, widening it if the thread turns
+    # out to need more digits
+    total = 9
+    while True:
+        parts = _pack(content, max_length - len(f" {total}/{total}"))
+        if len(parts) <= total:
+            break
+        total = total * 10 + 9
+    return [f"{part} {i}/{len(parts)}" for i, part in enumerate(parts, 1)]
+
+
+class ThreadProgress:
+    """
+    Posted part IDs of a thread, saved after every part.
+
+    If posting stops partway (an API error or a crash), running the same
+    content again continues from the last posted part as a reply to it,
+    instead of starting a second thread. The file is keyed by a hash of
+    the content and removed once the thread is complete.
+    """
+
+    def __init__(self, content: str, directory: Optional[str] = None):
+        """
+        Args:
+            content: Full thread content
+            directory: State directory. Defaults to THREAD_STATE_DIR or logs/threads
+        """
+        directory = Path(directory or os.getenv("THREAD_STATE_DIR", DEFAULT_THREAD_STATE_DIR))
+        digest = hashlib.sha256(content.strip().encode("utf-8")).hexdigest()[:16]
+        self.path = directory / f"thread-{digest}.json"
+        self.parts: List[str] = []
+        self.ids: List[str] = []
+        if self.path.exists():
+            try:
+                state = json.loads(self.path.read_text(encoding="utf-8"))
+                self.parts, self.ids = state["parts"], state["ids"]
+            except (ValueError, KeyError):
+                logger.warning(f"Ignoring unreadable thread progress: {self.path}")
+
+    def start(self, parts: List[str]) -> None:
+        """Use saved progress if it is for the same parts, else start over."""
+        if self.parts != parts:
+            if self.ids:
+                logger.warning(f"Thread split changed; discarding progress in {self.path}")
+            self.parts, self.ids = list(parts), []
+
+    def record(self, tweet_id: str) -> None:
+        """Save the ID of the next posted part."""
+        self.ids.append(tweet_id)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps({"parts": self.parts, "ids": self.ids}), encoding="utf-8")
+        os.replace(tmp_path, self.path)
+
+    def clear(self) -> None:
+        """Forget the thread once every part is posted."""
+        self.path.unlink(missing_ok=True)
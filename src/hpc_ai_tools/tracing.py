@@ -0,0 +1,214 @@
+"""
+Lightweight span tracing to Chrome trace-event JSON (viewable in Perfetto)
+"""
+
+import atexit
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_EVENTS = 1_000_000
+
+
+def _now_us() -> float:
+    return time.perf_counter_ns() / 1000
+
+
+class _NullSpan:
+    """Shared do-nothing span handed out while tracing is off."""
+
+    __slots__ = ()
+
+    def __enter__(self) -> "_NullSpan":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        return None
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Span:
+    """A timed section recorded as one complete ('X') event on exit."""
+
+    __slots__ = ("tracer", "name", "args", "start")
+
+    def __init__(self, tracer: "Tracer", name: str, args: Dict[str, Any]):
+        self.tracer = tracer
+        self.name = name
+        self.args = args
+        self.start = 0.0
+
+    def __enter__(self) -> "Span":
+        self.start = _now_us()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is not None:
+            self.args["error"] = exc_type.__name__
+        self.tracer.complete(self.name, self.start, _now_us() - self.start, self.args)
+
+
+class Stages:
+    """
+    Consecutive stages of one operation, timed with a mark at the end of each.
+
+    Cheaper than nesting a Span per stage in tight loops: each stage costs
+    one clock read and one event.
+    """
+
+    __slots__ = ("tracer", "span", "last")
+
+    def __init__(self, tracer: "Tracer", name: str, args: Dict[str, Any]):
+        self.tracer = tracer
+        self.span = Span(tracer, name, args)
+        self.span.__enter__()
+        self.last = self.span.start
+
+    def mark(self, stage: str) -> None:
+        """End the current stage (which began at the previous mark)."""
+        now = _now_us()
+        self.tracer.complete(stage, self.last, now - self.last, None)
+        self.last = now
+
+    def end(self) -> None:
+        """End the operation's enclosing span."""
+        self.span.__exit__(None, None, None)
+
+
+class Tracer:
+    """
+    Collects spans in memory and writes them as a Chrome trace-event file.
+
+    While disabled, span() returns a shared no-op object, and hot paths can
+    check ``enabled`` once and skip tracing entirely. Events are appended
+    to a list from any thread without a lock; after ``max_events`` further
+    events are dropped and counted.
+    """
+
+    def __init__(self, max_events: int = DEFAULT_MAX_EVENTS):
+        self.enabled = False
+        self.path: Optional[Path] = None
+        self.max_events = max_events
+        self.dropped = 0
+        self._events: List[Dict[str, Any]] = []
+        self._threads: Dict[int, str] = {}
+        self._pid = os.getpid()
+        self._exit_hook = False
+
+    def enable(self, path: str) -> None:
+        """Start recording; events are written to ``path`` by write() and at exit."""
+        if not self._exit_hook:
+            atexit.register(self.write)
+            self._exit_hook = True
+        self.path = Path(path)
+        self.enabled = True
+        logger.info(f"Tracing spans to {self.path}")
+
+    def span(self, name: str, **args: Any):
+        """
+        Context manager timing a section.
+
+        Args:
+            name: Span name, shown on the timeline
+            **args: Details shown when the span is selected
+        """
+        if not self.enabled:
+            return _NULL_SPAN
+        return Span(self, name, args)
+
+    def stages(self, name: str, **args: Any) -> Optional[Stages]:
+        """Stages of an operation, or None while tracing is off."""
+        if not self.enabled:
+            return None
+        return Stages(self, name, args)
+
+    def complete(self, name: str, start: float, duration: float, args: Optional[Dict[str, Any]]) -> None:
+        """Record a complete event (times in microseconds)."""
+        if len(self._events) >= self.max_events:
+            self.dropped += 1
+            return
+        thread = threading.current_thread()
+        tid = thread.ident or 0
+        if tid not in self._threads:
+            self._threads[tid] = thread.name
+        event = {"name": name, "ph": "X", "ts": start, "dur": duration, "pid": self._pid, "tid": tid}
+        if args:
+            event["args"] = args
+        self._events.append(event)
+
+    def events(self) -> List[Dict[str, Any]]:
+        """Recorded events, preceded by thread-name metadata."""
+        metadata = [
+            {"name": "thread_name", "ph": "M", "pid": self._pid, "tid": tid, "args": {"name": name}}
+            for tid, name in list(self._threads.items())
+        ]
+        return metadata + list(self._events)
+
+    def write(self, path: Optional[str] = None) -> Optional[Path]:
+        """
+        Write the trace as Chrome trace-event JSON (atomically).
+
+        Args:
+            path: Output file. Defaults to the path given to enable()
+
+        Returns:
+            The file written, or None if there is nowhere to write
+        """
+        path = Path(path) if path else self.path
+        if path is None:
+            return None
+        if self.dropped:
+            logger.warning(f"Trace buffer full; dropped {self.dropped} events")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": self.events(), "displayTimeUnit": "ms"}, f, default=str)
+        os.replace(tmp_path, path)
+        return path
+
+    def reset(self) -> None:
+        """Stop recording and drop all events (nothing is written at exit)."""
+        self.enabled = False
+        self.path = None
+        self.dropped = 0
+        self._events = []
+        self._threads = {}
+
+
+def _reset_after_fork() -> None:
+    # The child's events would interleave with the parent's under the same
+    # file; it starts empty and traces only if it enables tracing itself
+    TRACER.reset()
+    TRACER._pid = os.getpid()
+
+
+TRACER = Tracer()
+span = TRACER.span
+
+if hasattr(os, "register_at_fork"):  # Unix only
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def configure_tracing(path: Optional[str] = None) -> bool:
+    """
+    Enable tracing if a trace file is given or TRACE_FILE is set.
+
+    Args:
+        path: Trace file. Defaults to TRACE_FILE
+
+    Returns:
+        Whether tracing is on
+    """
+    path = path or os.getenv("TRACE_FILE")
+    if path:
+        TRACER.max_events = int(os.getenv("TRACE_MAX_EVENTS", str(DEFAULT_MAX_EVENTS)))
+        TRACER.enable(path)
+    return TRACER.enabled
@@ -0,0 +1,299 @@
+"""
+Minimal X/Twitter API client on a pooled HTTP session
+"""
+
+import logging
+import os
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests_oauthlib import OAuth1
+
+from .metrics import API_ERRORS
+from .tracing import span
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_API_URL = "https://api.twitter.com"
+DEFAULT_UPLOAD_URL = "https://upload.twitter.com"
+MEDIA_UPLOAD_PATH = "/1.1/media/upload.json"
+
+# Bytes per APPEND command of a chunked upload
+DEFAULT_CHUNK_SIZE = 4 * 1024 * 1024
+
+# Attempts per call when the server answers 429 despite the local budget
+MAX_RATE_LIMIT_ATTEMPTS = 2
+
+CREDENTIAL_VARS = ("X_API_KEY", "X_API_SECRET", "X_ACCESS_TOKEN", "X_ACCESS_TOKEN_SECRET")
+
+
+class XApiError(Exception):
+    """Non-2xx response from the X API."""
+
+    def __init__(self, status_code: int, message: str, headers: Optional[Dict] = None):
+        super().__init__(f"{status_code} {message}")
+        self.status_code = status_code
+        self.message = message
+        self.headers = dict(headers or {})
+
+
+class XApiClient:
+    """
+    X API v2 client with OAuth 1.0a user auth.
+
+    All calls share one keep-alive ``requests.Session`` whose connection pool
+    holds ``pool_size`` connections, so up to that many requests can be in
+    flight from worker threads without reconnecting. The base URLs can be
+    overridden (X_API_BASE_URL, X_UPLOAD_BASE_URL) to point the client at a
+    local test server.
+
+    With a rate limiter, calls tagged with an endpoint name take budget
+    from it first and feed the response's rate-limit headers back to it.
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        api_secret: str,
+        access_token: str,
+        access_token_secret: str,
+        base_url: Optional[str] = None,
+        pool_size: int = 10,
+        timeout: float = 30.0,
+        upload_url: Optional[str] = None,
+        rate_limiter: Optional[Any] = None,
+    ):
+        """
+        Args:
+            api_key: Consumer key
+            api_secret: Consumer secret
+            access_token: User access token
+            access_token_secret: User access token secret
+            base_url: API root. Defaults to X_API_BASE_URL or https://api.twitter.com
+            pool_size: Connections kept in the session pool
+            timeout: Per-request timeout in seconds
+            upload_url: Media upload root. Defaults to X_UPLOAD_BASE_URL, the
+                overridden base URL, or https://upload.twitter.com
+            rate_limiter: RateLimitManager consulted for endpoint-tagged calls
+        """
+        self.base_url = (base_url or os.getenv("X_API_BASE_URL", DEFAULT_API_URL)).rstrip("/")
+        default_upload = DEFAULT_UPLOAD_URL if self.base_url == DEFAULT_API_URL else self.base_url
+        self.upload_url = (
+            upload_url or os.getenv("X_UPLOAD_BASE_URL", default_upload)
+        ).rstrip("/")
+        self.timeout = timeout
+        self.rate_limiter = rate_limiter
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.auth = OAuth1(api_key, api_secret, access_token, access_token_secret)
+
+    @classmethod
+    def from_env(cls, **kwargs: Any) -> "XApiClient":
+        """
+        Build a client from the X_API_* environment variables.
+
+        Raises:
+            ValueError: If any credential is missing
+        """
+        missing = [var for var in CREDENTIAL_VARS if not os.getenv(var)]
+        if missing:
+            raise ValueError(f"Missing X API credentials: {', '.join(missing)}")
+        return cls(*(os.environ[var] for var in CREDENTIAL_VARS), **kwargs)
+
+    def request(
+        self, method: str, path: str, endpoint: Optional[str] = None, **kwargs: Any
+    ) -> requests.Response:
+        """
+        Send a request and raise on any non-2xx status.
+
+        Args:
+            method: HTTP method
+            path: Path below the base URL, or an absolute URL
+            endpoint: Rate-limit bucket name for this call
+            **kwargs: Passed to requests.Session.request
+
+        Returns:
+            Response object
+
+        Raises:
+            XApiError: On a non-2xx response
+        """
+        url = path if path.startswith("http") else self.base_url + path
+        kwargs.setdefault("timeout", self.timeout)
+        limiter = self.rate_limiter if endpoint else None
+
+        for _ in range(MAX_RATE_LIMIT_ATTEMPTS):
+            if limiter is not None:
+                with span("rate_limit_wait", endpoint=endpoint):
+                    limiter.acquire(endpoint)
+            try:
+                with span("http", method=method, endpoint=endpoint or path):
+                    response = self.session.request(method, url, **kwargs)
+            except requests.RequestException:
+                API_ERRORS.inc(endpoint or "other", "network")
+                raise
+            if limiter is None:
+                break
+            limiter.update(endpoint, response.headers, response.status_code)
+            if response.status_code != 429:
+                break
+            # The bucket is now empty, so the next acquire() waits for the reset
+            logger.warning(f"429 from {endpoint}; retrying after the window resets")
+
+        if not 200 <= response.status_code < 300:
+            API_ERRORS.inc(endpoint or "other", error_class(response.status_code))
+            raise XApiError(response.status_code, _error_message(response), response.headers)
+        return response
+
+    def create_tweet(
+        self,
+        text: str,
+        reply_to: Optional[str] = None,
+        media_ids: Optional[List[str]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Create a post.
+
+        Args:
+            text: Post text
+            reply_to: ID of the post this one replies to
+            media_ids: Uploaded media to attach
+
+        Returns:
+            The 'data' object of the response (contains 'id')
+        """
+        payload: Dict[str, Any] = {"text": text}
+        if reply_to:
+            payload["reply"] = {"in_reply_to_tweet_id": reply_to}
+        if media_ids:
+            payload["media"] = {"media_ids": list(media_ids)}
+        response = self.request("POST", "/2/tweets", endpoint="create_tweet", json=payload)
+        return response.json()["data"]
+
+    def get_me(self) -> Dict[str, Any]:
+        """Get the authenticated user ('data' object with 'id' and 'username')."""
+        return self.request("GET", "/2/users/me", endpoint="users/me").json()["data"]
+
+    def upload_media(self, filename: str) -> Dict[str, Any]:
+        """
+        Upload a media file in a single request.
+
+        Args:
+            filename: Path to the file
+
+        Returns:
+            Upload response (contains 'media_id_string' and usually
+            'expires_after_secs')
+        """
+        with open(filename, "rb") as f:
+            response = self.request(
+                "POST",
+                self.upload_url + MEDIA_UPLOAD_PATH,
+                endpoint="media_upload",
+                files={"media": f},
+            )
+        return response.json()
+
+    def upload_media_chunked(
+        self,
+        filename: str,
+        media_type: str,
+        media_category: Optional[str] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> Dict[str, Any]:
+        """
+        Upload a media file with the INIT/APPEND/FINALIZE commands.
+
+        The file is read and sent one chunk at a time, so memory use does
+        not grow with the file. If FINALIZE reports server-side processing
+        (videos, GIFs), STATUS is polled until it finishes.
+
+        Args:
+            filename: Path to the file
+            media_type: MIME type (e.g. 'image/png', 'video/mp4')
+            media_category: 'tweet_image', 'tweet_gif' or 'tweet_video'
+            chunk_size: Bytes per APPEND (X accepts up to 5MB)
+            sleep: Sleep function used while polling STATUS
+
+        Returns:
+            FINALIZE (or final STATUS) response, with 'media_id_string'
+
+        Raises:
+            XApiError: If a command fails or processing fails
+        """
+        url = self.upload_url + MEDIA_UPLOAD_PATH
+        init = {"command": "INIT", "total_bytes": os.path.getsize(filename), "media_type": media_type}
+        if media_category:
+            init["media_category"] = media_category
+        media_id = str(
+            self.request("POST", url, endpoint="media_upload", data=init).json()["media_id_string"]
+        )
+
+        with open(filename, "rb") as f:
+            segment = 0
+            while True:
+                chunk = f.read(chunk_size)
+                if not chunk:
+                    break
+                self.request(
+                    "POST",
+                    url,
+                    endpoint="media_upload",
+                    data={"command": "APPEND", "media_id": media_id, "segment_index": segment},
+                    files={"media": chunk},
+                )
+                segment += 1
+
+        result = self.request(
+            "POST", url, endpoint="media_upload", data={"command": "FINALIZE", "media_id": media_id}
+        ).json()
+        while True:
+            info = result.get("processing_info")
+            if not info or info.get("state") == "succeeded":
+                return result
+            if info.get("state") == "failed":
+                error = info.get("error", {})
+                raise XApiError(400, f"Media processing failed: {error.get('message', error)}")
+            sleep(float(info.get("check_after_secs", 1)))
+            result = self.request(
+                "GET",
+                url,
+                endpoint="media_status",
+                params={"command": "STATUS", "media_id": media_id},
+            ).json()
+
+    def close(self) -> None:
+        """Close pooled connections."""
+        self.session.close()
+
+
+def error_class(status_code: int) -> str:
+    """Coarse class of an error status, used as a metrics label."""
+    if status_code == 429:
+        return "rate_limited"
+    if status_code in (401, 403):
+        return "auth"
+    if 400 <= status_code < 500:
+        return "client"
+    return "server"
+
+
+def _error_message(response: requests.Response) -> str:
+    """Best-effort error text from an API error response."""
+    try:
+        body = response.json()
+    except ValueError:
+        return response.reason or response.text[:200]
+    if isinstance(body, dict):
+        if body.get("detail"):
+            return str(body["detail"])
+        errors = body.get("errors")
+        if errors:
+            return "; ".join(str(e.get("message", e)) for e in errors)
+    return response.reason or str(body)[:200]
@@ -4,69 +4,81 @@ X/Twitter Publishing Tool
 
 import os
 import sys
+import time
 import logging
-from datetime import datetime
-from typing import Optional, Dict, Tuple
+import importlib.util
+from typing import Optional, Dict, List, Tuple
 from pathlib import Path
-from dotenv import load_dotenv
 
-# Try to import tweepy, provide fallback if not installed
-try:
-    import tweepy
-    TWEEPY_AVAILABLE = True
-except ImportError:
-    TWEEPY_AVAILABLE = False
+from .history import DEFAULT_MAX_BYTES, PostHistory, compress_segment, history_record
+from .identity_cache import IdentityCache, credentials_key
+from .journal import get_journal
+from .metrics import API_ERRORS, POST_LATENCY, VALIDATION_REJECTS
+from .post_index import PostIndex
+from .post_stats import PostCounters
+from .tracing import span
+
+# The API client drags in requests/oauthlib, so only check that they are
+# installed here and import the client when real mode needs it
+CLIENT_AVAILABLE = importlib.util.find_spec("requests_oauthlib") is not None
 
 logger = logging.getLogger(__name__)
 
+# Free-text logs written before the JSONL history; still read by
+# `stats --rebuild`
+TWEET_LOG = Path("logs") / "tweet_log.txt"
+ERROR_LOG = Path("logs") / "post_errors.log"
+
 
 class XPoster:
     """X/Twitter Publisher"""
     
-    def __init__(self, mock_mode: Optional[bool] = None):
+    def __init__(
+        self,
+        mock_mode: Optional[bool] = None,
+        post_index: Optional[PostIndex] = None,
+        counters: Optional[PostCounters] = None,
+    ):
         """
         Initialize X/Twitter publisher.
         
         Args:
             mock_mode: If True, run in mock mode (no actual posting).
                        If None, auto-detect based on environment.
+            post_index: Index of posted content used to skip duplicates.
+                        If None, the default on-disk index is used.
+            counters: Running posting counters. If None, the default
+                      sidecar next to the logs is used.
         """
+        from dotenv import load_dotenv
+        
         load_dotenv()
         
         # Determine mode
         if mock_mode is None:
             env_mock = os.getenv("MOCK_MODE", "true").lower()
-            self.mock_mode = (env_mock == "true") or not TWEEPY_AVAILABLE
+            self.mock_mode = (env_mock == "true") or not CLIENT_AVAILABLE
         else:
             self.mock_mode = mock_mode
         
+        self.post_index = post_index if post_index is not None else PostIndex()
+        self.counters = counters if counters is not None else PostCounters()
+        self.history = PostHistory()
+        self.identity_cache = IdentityCache()
+        self.identity_key: Optional[str] = None
+        self.media_uploader = None
+        
         # Initialize client
         self.client = None
+        self.rate_limits = None
         if not self.mock_mode:
-            self._init_tweepy_client()
-        
-        # Setup logging
-        self._setup_logging()
+            self._init_client()
         
         mode_str = "mock" if self.mock_mode else "real"
         logger.info(f"XPoster initialized in {mode_str} mode")
     
-    def _setup_logging(self) -> None:
-        """Setup logging directory and file."""
-        log_dir = Path("logs")
-        log_dir.mkdir(exist_ok=True)
-        
-        log_file = log_dir / "x_poster.log"
-        file_handler = logging.FileHandler(log_file, encoding="utf-8")
-        file_handler.setLevel(logging.INFO)
-        formatter = logging.Formatter(
-            '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-        )
-        file_handler.setFormatter(formatter)
-        logger.addHandler(file_handler)
-    
-    def _init_tweepy_client(self) -> None:
-        """Initialize Tweepy client."""
+    def _init_client(self) -> None:
+        """Initialize the X API client and its rate-limit manager."""
         try:
             api_key = os.getenv("X_API_KEY")
             api_secret = os.getenv("X_API_SECRET")
@@ -90,18 +102,36 @@ class XPoster:
                 self.mock_mode = True
                 return
             
-            # Initialize client
-            self.client = tweepy.Client(
-                consumer_key=api_key,
-                consumer_secret=api_secret,
-                access_token=access_token,
-                access_token_secret=access_token_secret
+            from .rate_limit import RateLimitManager
+            from .x_api import XApiClient
+            
+            # Initialize client; calls wait for rate-limit budget instead of
+            # failing with 429
+            self.rate_limits = RateLimitManager()
+            self.client = XApiClient(
+                api_key,
+                api_secret,
+                access_token,
+                access_token_secret,
+                rate_limiter=self.rate_limits,
             )
             
-            # Test connection
+            # Verify the credentials, at most once per cache TTL
+            self.identity_key = credentials_key(
+                (api_key, api_secret, access_token, access_token_secret),
+                self.client.base_url,
+            )
             try:
-                user = self.client.get_me()
-                logger.info(f"Tweepy client initialized successfully. User: @{user.data.username}")
+                with span("credential_check"):
+                    user = self.identity_cache.get(self.identity_key)
+                    cached = user is not None
+                    if not cached:
+                        user = self.client.get_me()
+                        self.identity_cache.put(self.identity_key, user)
+                if not cached:
+                    logger.info(f"X API client initialized successfully. User: @{user['username']}")
+                else:
+                    logger.info(f"X API client initialized (verified identity cached). User: @{user['username']}")
             except Exception as e:
                 logger.error(f"Failed to verify X API credentials: {e}")
                 logger.warning("Switching to mock mode")
@@ -109,34 +139,87 @@ class XPoster:
                 self.client = None
             
         except Exception as e:
-            logger.error(f"Failed to initialize Tweepy client: {e}")
+            logger.error(f"Failed to initialize X API client: {e}")
             self.mock_mode = True
             self.client = None
     
-    def post_to_x(self, content: str, mock: Optional[bool] = None) -> Tuple[bool, str]:
+    def post_to_x(
+        self,
+        content: str,
+        mock: Optional[bool] = None,
+        focus: Optional[str] = None,
+    ) -> Tuple[bool, str]:
         """
         Post content to X/Twitter.
         
         Args:
             content: Content to post
             mock: Override mock mode for this call
+            focus: Content focus ('hpc', 'ai') recorded in the post history
             
         Returns:
             Tuple of (success, message)
         """
-        use_mock = mock if mock is not None else self.mock_mode
+        success, message, _, _ = self._publish(content, focus, mock=mock)
+        return success, message
+    
+    def _publish(
+        self,
+        content: str,
+        focus: Optional[str] = None,
+        mock: Optional[bool] = None,
+        client=None,
+        media_paths: Optional[List[str]] = None,
+    ) -> Tuple[bool, str, Optional[str], bool]:
+        """
+        Validate, deduplicate, post and record one piece of content.
         
-        # Validate content
-        validation_result = self._validate_content(content)
-        if not validation_result[0]:
-            return validation_result
+        The posting path shared by post_to_x, post_with_images, the outbox
+        worker and the async poster. Safe to call from several threads at
+        once.
         
-        logger.info(f"Posting to X: {content[:50]}...")
+        Args:
+            content: Content to post
+            focus: Content focus ('hpc', 'ai') recorded in the post history
+            mock: Override mock mode for this call
+            client: XApiClient to post with (default: this poster's client)
+            media_paths: Media files uploaded and attached after validation
+            
+        Returns:
+            Tuple of (success, message, tweet_id, retryable); retryable is
+            False when posting the same content again cannot succeed
+        """
+        use_mock = mock if mock is not None else self.mock_mode
         
-        if use_mock:
-            return self._mock_post(content)
-        else:
-            return self._real_post(content)
+        with span("post", mode="mock" if use_mock else "real", focus=focus):
+            with span("validate"):
+                # Validate content
+                valid, message = self._validate_content(content)
+                if not valid:
+                    return False, message, None, False
+                
+                # X rejects duplicates with a 403; don't spend an API call on them.
+                # Mock posts are checked too but never recorded.
+                if self.post_index.contains(content):
+                    VALIDATION_REJECTS.inc("duplicate")
+                    logger.warning(f"Skipping duplicate content: {content[:50]}...")
+                    return (
+                        False,
+                        "Duplicate content: already posted within the retention window",
+                        None,
+                        False,
+                    )
+            
+            logger.info(f"Posting to X: {content[:50]}...")
+            
+            if use_mock:
+                success, message = self._mock_post(content, focus, media_paths)
+                return success, message, None, True
+            
+            result = self._real_post(content, focus, client, media_paths)
+            if result[0]:
+                self.post_index.add(content)
+            return result
     
     def _validate_content(self, content: str) -> Tuple[bool, str]:
         """
@@ -151,88 +234,245 @@ class XPoster:
         # Check length
         max_length = int(os.getenv("MAX_TWEET_LENGTH", "280"))
         if len(content) > max_length:
+            VALIDATION_REJECTS.inc("too_long")
             return False, f"Content too long ({len(content)} > {max_length} characters)"
         
         # Check for empty content
         if not content.strip():
+            VALIDATION_REJECTS.inc("empty")
             return False, "Content is empty"
         
         # Check for minimum length
         if len(content.strip()) < 10:
+            VALIDATION_REJECTS.inc("too_short")
             return False, "Content is too short (minimum 10 characters)"
         
         return True, "Content validation passed"
     
-    def _mock_post(self, content: str) -> Tuple[bool, str]:
+    def _write_history(self, record: str) -> None:
+        """Queue a history record on the shared journal."""
+        max_bytes = int(os.getenv("POST_HISTORY_MAX_BYTES", str(DEFAULT_MAX_BYTES)))
+        get_journal(
+            self.history.path, max_bytes=max_bytes, on_rotate=compress_segment
+        ).write(record)
+    
+    def _mock_post(
+        self,
+        content: str,
+        focus: Optional[str] = None,
+        media_paths: Optional[List[str]] = None,
+    ) -> Tuple[bool, str]:
         """Mock posting (logs but doesn't actually post)."""
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        
-        # Log to file
-        log_file = Path("logs") / "tweet_log.txt"
-        with open(log_file, "a", encoding="utf-8") as f:
-            f.write(f"[{timestamp}] MOCK POST\n")
-            f.write(f"{content}\n")
-            f.write("=" * 50 + "\n")
+        start = time.perf_counter()
+        with span("log_write"):
+            self._write_history(history_record("mock", content, focus=focus, media=media_paths))
+            self.counters.record("mock")
         
         # Log to console
         logger.info(f"[MOCK] Would post: {content[:100]}...")
         
-        # Also save to output directory
-        output_dir = Path("output")
-        output_dir.mkdir(exist_ok=True)
-        
-        timestamp_str = datetime.now().strftime("%Y%m%d_%H%M%S")
-        output_file = output_dir / f"mock_post_{timestamp_str}.txt"
-        output_file.write_text(content, encoding="utf-8")
-        
-        return True, f"Mock post successful (saved to {output_file})"
+        POST_LATENCY.observe(time.perf_counter() - start, "mock", "ok")
+        return True, f"Mock post successful (logged to {self.history.path})"
     
-    def _real_post(self, content: str) -> Tuple[bool, str]:
-        """Real posting to X/Twitter."""
-        if not self.client:
-            return False, "X/Twitter client not initialized"
+    def _real_post(
+        self,
+        content: str,
+        focus: Optional[str] = None,
+        client=None,
+        media_paths: Optional[List[str]] = None,
+    ) -> Tuple[bool, str, Optional[str], bool]:
+        """Real posting to X/Twitter; see _publish for the result."""
+        client = client or self.client
+        if not client:
+            return False, "X/Twitter client not initialized", None, True
+        
+        from .x_api import XApiError
         
+        media_ids = None
+        start = time.perf_counter()
         try:
-            # Post tweet
-            response = self.client.create_tweet(text=content)
-            
-            # Extract tweet ID
-            tweet_id = response.data['id']
-            tweet_url = f"https://twitter.com/user/status/{tweet_id}"
-            
-            # Log success
-            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            log_file = Path("logs") / "tweet_log.txt"
-            with open(log_file, "a", encoding="utf-8") as f:
-                f.write(f"[{timestamp}] REAL POST - ID: {tweet_id}\n")
-                f.write(f"{content}\n")
-                f.write(f"URL: {tweet_url}\n")
-                f.write("=" * 50 + "\n")
+            if media_paths:
+                # Upload media (or reuse cached media IDs)
+                media_ids = self._get_media_uploader().upload_all(media_paths)
             
-            logger.info(f"Posted successfully! Tweet ID: {tweet_id}")
-            logger.info(f"Tweet URL: {tweet_url}")
-            
-            return True, f"Posted successfully! Tweet ID: {tweet_id}"
-            
-        except tweepy.TweepyException as e:
-            error_msg = str(e)
-            logger.error(f"Failed to post to X: {error_msg}")
-            
-            # Log error
-            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            error_log = Path("logs") / "post_errors.log"
-            with open(error_log, "a", encoding="utf-8") as f:
-                f.write(f"[{timestamp}] ERROR\n")
-                f.write(f"Content: {content}\n")
-                f.write(f"Error: {error_msg}\n")
-                f.write("=" * 50 + "\n")
+            # Post tweet
+            data = client.create_tweet(content, media_ids=media_ids)
             
-            return False, f"Failed to post: {error_msg}"
+        except ValueError as e:
+            # Media that can never be attached (too many files, bad type)
+            return False, str(e), None, False
+        
+        except XApiError as e:
+            if e.status_code == 401:
+                # Revoked or rotated credentials: verify again next time
+                self.identity_cache.invalidate(self.identity_key)
+            _, message = self._log_post_error(
+                content, str(e), time.perf_counter() - start, focus
+            )
+            # 4xx other than 429 means X rejected this post, not a transient fault
+            retryable = e.status_code == 429 or e.status_code >= 500
+            return False, message, None, retryable
         
         except Exception as e:
+            POST_LATENCY.observe(time.perf_counter() - start, "real", "error")
             error_msg = str(e)
             logger.error(f"Unexpected error posting to X: {error_msg}")
-            return False, f"Unexpected error: {error_msg}"
+            return False, f"Unexpected error: {error_msg}", None, True
+        
+        # Extract tweet ID
+        tweet_id = str(data['id'])
+        _, message = self._log_real_post(
+            content, tweet_id, time.perf_counter() - start, focus, media_ids, media_paths
+        )
+        return True, message, tweet_id, True
+    
+    def _log_real_post(
+        self,
+        content: str,
+        tweet_id: str,
+        latency: Optional[float] = None,
+        focus: Optional[str] = None,
+        media_ids: Optional[List[str]] = None,
+        media_paths: Optional[List[str]] = None,
+    ) -> Tuple[bool, str]:
+        """Record a successful real post and build the result."""
+        if latency is not None:
+            POST_LATENCY.observe(latency, "real", "ok")
+        tweet_url = f"https://twitter.com/user/status/{tweet_id}"
+        
+        with span("log_write"):
+            self._write_history(
+                history_record(
+                    "real",
+                    content,
+                    tweet_id=tweet_id,
+                    focus=focus,
+                    latency=latency,
+                    media_ids=media_ids,
+                    media=media_paths,
+                )
+            )
+            self.counters.record("real")
+        
+        logger.info(f"Posted successfully! Tweet ID: {tweet_id}")
+        logger.info(f"Tweet URL: {tweet_url}")
+        
+        return True, f"Posted successfully! Tweet ID: {tweet_id}"
+    
+    def _log_post_error(
+        self,
+        content: str,
+        error_msg: str,
+        latency: Optional[float] = None,
+        focus: Optional[str] = None,
+    ) -> Tuple[bool, str]:
+        """Record a failed post and build the result."""
+        if latency is not None:
+            POST_LATENCY.observe(latency, "real", "error")
+        logger.error(f"Failed to post to X: {error_msg}")
+        
+        with span("log_write"):
+            self._write_history(
+                history_record("real", content, focus=focus, latency=latency, error=error_msg)
+            )
+            self.counters.record("error")
+        
+        return False, f"Failed to post: {error_msg}"
+    
+    def post_thread(
+        self,
+        content: str,
+        mock: Optional[bool] = None,
+        focus: Optional[str] = None,
+    ) -> Tuple[bool, str]:
+        """
+        Post long content as a numbered thread of replies.
+        
+        The content is split up front (see threads.split_thread). Each reply
+        is sent as soon as its parent's ID comes back; logging and counting
+        of the posted part runs on a background worker so it does not delay
+        the next request. Progress is saved after every part, and calling
+        this again with the same content resumes after the last posted part.
+        
+        Args:
+            content: Content to post (any length)
+            mock: Override mock mode for this call
+            focus: Content focus ('hpc', 'ai') recorded in the post history
+            
+        Returns:
+            Tuple of (success, message)
+        """
+        from .threads import ThreadProgress, split_thread
+        
+        use_mock = mock if mock is not None else self.mock_mode
+        
+        if len(content.strip()) < 10:
+            return False, "Content is too short (minimum 10 characters)"
+        
+        max_length = int(os.getenv("MAX_TWEET_LENGTH", "280"))
+        try:
+            parts = split_thread(content, max_length)
+        except ValueError as e:
+            return False, str(e)
+        
+        if use_mock:
+            for part in parts:
+                self._mock_post(part, focus)
+            return True, f"Mock thread of {len(parts)} posts successful (logged to {self.history.path})"
+        
+        if not self.client:
+            return False, "X/Twitter client not initialized"
+        
+        progress = ThreadProgress(content)
+        progress.start(parts)
+        if not progress.ids and self.post_index.contains(content):
+            logger.warning(f"Skipping duplicate thread: {content[:50]}...")
+            return False, "Duplicate content: already posted within the retention window"
+        if progress.ids:
+            logger.info(f"Resuming thread after part {len(progress.ids)}/{len(parts)}")
+        
+        from concurrent.futures import ThreadPoolExecutor
+        from .x_api import XApiError
+        
+        def bookkeep(part: str, tweet_id: str, latency: float) -> None:
+            self._log_real_post(part, tweet_id, latency, focus)
+            self.post_index.add(part)
+        
+        stopped = None
+        logged = []
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="thread-log") as log_worker:
+            for number in range(len(progress.ids) + 1, len(parts) + 1):
+                part = parts[number - 1]
+                start = time.perf_counter()
+                try:
+                    data = self.client.create_tweet(
+                        part, reply_to=progress.ids[-1] if progress.ids else None
+                    )
+                except XApiError as e:
+                    self._log_post_error(part, str(e), time.perf_counter() - start, focus)
+                    stopped = (
+                        f"Thread stopped at part {number}/{len(parts)}: {e} "
+                        f"(run again to resume from {progress.path})"
+                    )
+                    break
+                tweet_id = str(data['id'])
+                progress.record(tweet_id)
+                logged.append(
+                    (tweet_id, log_worker.submit(bookkeep, part, tweet_id, time.perf_counter() - start))
+                )
+        
+        # The parts are posted either way; don't let a failed history or
+        # index write go unnoticed
+        for tweet_id, future in logged:
+            error = future.exception()
+            if error is not None:
+                logger.error(f"Failed to record thread post {tweet_id}: {error}")
+        if stopped:
+            return False, stopped
+        
+        progress.clear()
+        self.post_index.add(content)
+        return True, f"Posted thread of {len(parts)} posts! First tweet ID: {progress.ids[0]}"
     
     def post_with_image(self, content: str, image_path: str) -> Tuple[bool, str]:
         """
@@ -245,62 +485,106 @@ class XPoster:
         Returns:
             Tuple of (success, message)
         """
-        if self.mock_mode:
-            logger.info(f"[MOCK] Would post with image: {image_path}")
-            return self._mock_post(f"{content}\n[Image: {image_path}]")
+        return self.post_with_images(content, [image_path])
+    
+    def post_with_images(
+        self,
+        content: str,
+        image_paths: List[str],
+        mock: Optional[bool] = None,
+        focus: Optional[str] = None,
+    ) -> Tuple[bool, str]:
+        """
+        Post content with up to four images (or one video/GIF) to X/Twitter.
         
-        if not self.client:
-            return False, "X/Twitter client not initialized"
+        The files (count, type, size) and the content are validated and
+        checked for duplicates before any upload, in mock mode too. Files
+        already uploaded with a still-valid media_id are not uploaded again;
+        the rest are uploaded concurrently. The file paths are recorded in
+        the post history.
+        
+        Args:
+            content: Text content
+            image_paths: Paths to media files
+            mock: Override mock mode for this call
+            focus: Content focus ('hpc', 'ai') recorded in the post history
+            
+        Returns:
+            Tuple of (success, message)
+        """
+        use_mock = mock if mock is not None else self.mock_mode
         
-        # Check if image exists
-        image_path_obj = Path(image_path)
-        if not image_path_obj.exists():
-            return False, f"Image file not found: {image_path}"
+        # Check that the images exist
+        for image_path in image_paths:
+            if not Path(image_path).exists():
+                return False, f"Image file not found: {image_path}"
         
-        # Check file size (X limit is 5MB for images)
-        if image_path_obj.stat().st_size > 5 * 1024 * 1024:
-            return False, "Image file too large (max 5MB)"
+        from .media import validate_media
         
         try:
-            # Upload media
-            media = self.client.media_upload(filename=str(image_path_obj))
-            
-            # Post tweet with media
-            response = self.client.create_tweet(
-                text=content,
-                media_ids=[media.media_id]
-            )
-            
-            tweet_id = response.data['id']
-            logger.info(f"Posted with image successfully! Tweet ID: {tweet_id}")
-            
-            return True, f"Posted with image successfully! Tweet ID: {tweet_id}"
+            validate_media(image_paths)
+        except ValueError as e:
+            logger.error(f"Invalid media: {e}")
+            return False, str(e)
+        
+        if use_mock:
+            logger.info(f"[MOCK] Would post with images: {', '.join(image_paths)}")
+        
+        success, message, _, _ = self._publish(
+            content, focus, mock=use_mock, media_paths=image_paths
+        )
+        return success, message
+    
+    def _get_media_uploader(self):
+        """Media uploader sharing this poster's client, created on first use."""
+        if self.media_uploader is None:
+            from .media import MediaUploader
             
-        except tweepy.TweepyException as e:
-            logger.error(f"Failed to post with image: {e}")
-            return False, f"Failed to post with image: {e}"
+            self.media_uploader = MediaUploader(self.client, account=self.identity_key or "")
+        return self.media_uploader
     
     def get_posting_stats(self) -> Dict[str, any]:
         """
         Get posting statistics.
         
         Returns:
-            Dictionary with statistics
+            Dictionary with statistics: the persistent totals, plus under
+            'session' this process's posts, failures, average latency,
+            rejects and API errors from the metrics registry
         """
         stats = {
             "mode": "mock" if self.mock_mode else "real",
-            "tweepy_available": TWEEPY_AVAILABLE,
+            "client_available": CLIENT_AVAILABLE,
             "client_initialized": self.client is not None,
         }
+        if self.rate_limits is not None:
+            stats["rate_limits"] = self.rate_limits.state()
         
-        # Count posts from log file
-        log_file = Path("logs") / "tweet_log.txt"
-        if log_file.exists():
-            with open(log_file, "r", encoding="utf-8") as f:
-                content = f.read()
-                stats["total_posts"] = content.count("REAL POST") + content.count("MOCK POST")
-                stats["real_posts"] = content.count("REAL POST")
-                stats["mock_posts"] = content.count("MOCK POST")
+        # Running counters; run `hpc-ai-tools stats --rebuild` to recompute
+        # them from logs written before the counters existed
+        stats.update(self.counters.snapshot())
+        
+        # This process's activity, from the metrics registry that is also
+        # exported to Prometheus
+        posts: Dict[str, int] = {}
+        failed: Dict[str, int] = {}
+        latency: Dict[str, List[float]] = {}
+        for (mode, outcome), (count, total) in POST_LATENCY.totals().items():
+            target = posts if outcome == "ok" else failed
+            target[mode] = target.get(mode, 0) + count
+            sums = latency.setdefault(mode, [0, 0.0])
+            sums[0] += count
+            sums[1] += total
+        api_errors: Dict[str, int] = {}
+        for (_, error_class), count in API_ERRORS.values().items():
+            api_errors[error_class] = api_errors.get(error_class, 0) + int(count)
+        stats["session"] = {
+            "posts": posts,
+            "failed": failed,
+            "avg_latency": {mode: total / count for mode, (count, total) in latency.items()},
+            "rejected": {reason: int(n) for (reason,), n in VALIDATION_REJECTS.values().items()},
+            "api_errors": api_errors,
+        }
         
         return stats
 
@@ -309,6 +593,8 @@ def main():
     """Command-line interface for testing."""
     import argparse
     
+    from .log_setup import configure_logging
+    
     parser = argparse.ArgumentParser(description="Test X/Twitter posting")
     parser.add_argument("--content", "-c", type=str, help="Content to post")
     parser.add_argument("--mock", "-m", action="store_true", help="Use mock mode")
@@ -322,6 +608,7 @@ def main():
         level=logging.INFO,
         format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
     )
+    configure_logging()
     
     # Create poster
     poster = XPoster(mock_mode=args.mock)
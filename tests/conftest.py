@@ -0,0 +1,163 @@
+"""
+测试共享夹具：本地模拟X API服务器
+"""
+
+import json
+import threading
+import time
+from email.parser import BytesParser
+from email.policy import HTTP
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+
+import pytest
+
+
+class FakeXServer:
+    """Local stand-in for the X API that records requests."""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.requests = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.next_id = 1000
+        self.responders = {}
+        self.media = {}
+        self.media_commands = []
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler_class())
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self):
+        host, port = self._server.server_address
+        return f"http://{host}:{port}"
+
+    def respond(self, method, path, responder):
+        """Override the response for a route: responder(body) -> (status, headers, json)."""
+        self.responders[(method, path)] = responder
+
+    def _tweet(self, body):
+        with self._lock:
+            self.next_id += 1
+            tweet_id = str(self.next_id)
+        return 201, {}, {"data": {"id": tweet_id, "text": body.get("text", "")}}
+
+    def _media_upload(self, method, path, headers, body):
+        """Simple and chunked (INIT/APPEND/FINALIZE/STATUS) media uploads."""
+        fields = dict(parse_qsl(urlsplit(path).query))
+        content_type = headers.get("Content-Type", "")
+        if content_type.startswith("multipart/"):
+            message = BytesParser(policy=HTTP).parsebytes(
+                f"Content-Type: {content_type}\r\n\r\n".encode("latin-1") + body
+            )
+            for part in message.iter_parts():
+                name = part.get_param("name", header="content-disposition")
+                fields[name] = part.get_payload(decode=True)
+        elif body:
+            fields.update(parse_qsl(body.decode("utf-8")))
+        for name, value in list(fields.items()):
+            if name != "media" and isinstance(value, bytes):
+                fields[name] = value.decode("utf-8")
+
+        command = fields.get("command", "UPLOAD")
+        with self._lock:
+            self.media_commands.append(command)
+            if command in ("UPLOAD", "INIT"):
+                self.next_id += 1
+                media_id = str(self.next_id)
+                self.media[media_id] = {"chunks": {}, "total": int(fields.get("total_bytes", 0))}
+                if command == "UPLOAD":
+                    self.media[media_id]["chunks"][0] = fields["media"]
+            else:
+                media_id = fields["media_id"]
+            item = self.media[media_id]
+        if command == "APPEND":
+            item["chunks"][int(fields["segment_index"])] = fields["media"]
+            return 204, {}, None
+        if command == "FINALIZE":
+            data = b"".join(item["chunks"][i] for i in sorted(item["chunks"]))
+            if len(data) != item["total"]:
+                return 400, {}, {"errors": [{"message": "Segments do not add up to total_bytes"}]}
+        item["data"] = b"".join(item["chunks"][i] for i in sorted(item["chunks"]))
+        return 200, {}, {"media_id": int(media_id), "media_id_string": media_id, "expires_after_secs": 86400}
+
+    def _handle(self, method, path, headers, body):
+        with self._lock:
+            self.requests.append((method, path, headers, body))
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            time.sleep(self.delay)
+            responder = self.responders.get((method, path))
+            if responder is not None:
+                return responder(body)
+            if (method, path) == ("POST", "/2/tweets"):
+                return self._tweet(body)
+            if (method, path) == ("GET", "/2/users/me"):
+                return 200, {}, {"data": {"id": "1", "username": "hpc_ai_bot"}}
+            if urlsplit(path).path == "/1.1/media/upload.json":
+                return self._media_upload(method, path, headers, body)
+            return 404, {}, {"detail": "Not Found"}
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def _dispatch(self, method):
+                length = int(self.headers.get("Content-Length") or 0)
+                raw = self.rfile.read(length) if length else b""
+                try:
+                    body = json.loads(raw) if raw else {}
+                except ValueError:
+                    body = raw
+                status, headers, payload = server._handle(
+                    method, self.path, dict(self.headers), body
+                )
+                data = b"" if payload is None else json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                for name, value in headers.items():
+                    self.send_header(name, str(value))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                self._dispatch("GET")
+
+            def do_POST(self):
+                self._dispatch("POST")
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+@pytest.fixture
+def fake_x_server():
+    """启动本地模拟X API服务器"""
+    server = FakeXServer().start()
+    yield server
+    server.stop()
+
+
+@pytest.fixture(autouse=True)
+def isolated_log_file(tmp_path, monkeypatch):
+    """CLI配置的日志文件写入临时目录"""
+    monkeypatch.setenv("LOG_FILE", str(tmp_path / "logs" / "hpc_ai_tools.log"))
@@ -0,0 +1,85 @@
+"""
+测试HTTP生成服务与请求微批处理
+"""
+
+import asyncio
+import json
+
+from hpc_ai_tools.api_server import GenerationServer
+
+
+async def fetch(port, target, reader_writer=None):
+    """发送GET请求并返回(状态码, JSON)"""
+    reader, writer = reader_writer or await asyncio.open_connection("127.0.0.1", port)
+    writer.write(f"GET {target} HTTP/1.1\r\nHost: test\r\n\r\n".encode("latin-1"))
+    head = await reader.readuntil(b"\r\n\r\n")
+    length = int(next(
+        line.split(b":", 1)[1] for line in head.split(b"\r\n") if line.lower().startswith(b"content-length")
+    ))
+    body = json.loads(await reader.readexactly(length))
+    if reader_writer is None:
+        writer.close()
+    return int(head.split(b" ")[1]), body
+
+
+class TestGenerationServer:
+    """测试GenerationServer类"""
+
+    def run(self, scenario, **kwargs):
+        """启动服务器并运行测试场景"""
+        async def main():
+            server = GenerationServer(port=0, seed=7, **kwargs)
+            await server.start()
+            try:
+                return await scenario(server)
+            finally:
+                await server.close()
+
+        return asyncio.run(main())
+
+    def test_generate(self):
+        """测试按方向、语言和数量生成"""
+        async def scenario(server):
+            connection = await asyncio.open_connection("127.0.0.1", server.port)
+            ok = await fetch(server.port, "/generate?focus=ai&lang=zh&n=3", connection)
+            default = await fetch(server.port, "/generate", connection)
+            bad = await fetch(server.port, "/generate?n=500", connection)
+            missing = await fetch(server.port, "/missing", connection)
+            connection[1].close()
+            return ok, default, bad, missing
+
+        ok, default, bad, missing = self.run(scenario)
+
+        assert ok[0] == 200 and ok[1]["lang"] == "zh" and len(ok[1]["posts"]) == 3
+        assert default[0] == 200 and default[1]["focus"] == "hpc" and len(default[1]["posts"]) == 1
+        assert bad[0] == 400 and "n must be" in bad[1]["error"]
+        assert missing[0] == 404
+
+    def test_concurrent_requests_are_batched(self):
+        """测试并发请求合并为少量批量生成调用"""
+        async def scenario(server):
+            results = await asyncio.gather(
+                *(fetch(server.port, f"/generate?n={1 + i % 3}") for i in range(60))
+            )
+            return results, server.stats()
+
+        results, stats = self.run(scenario, batch_window=0.02)
+
+        assert all(status == 200 for status, _ in results)
+        assert [len(body["posts"]) for _, body in results] == [1 + i % 3 for i in range(60)]
+        assert stats["requests"] == 60
+        assert stats["batches"] < 20
+
+    def test_invalid_content_length(self):
+        """测试非法Content-Length返回400"""
+        async def scenario(server):
+            reader, writer = await asyncio.open_connection("127.0.0.1", server.port)
+            writer.write(b"GET /generate HTTP/1.1\r\nHost: test\r\nContent-Length: abc\r\n\r\n")
+            response = await reader.read()
+            writer.close()
+            return response
+
+        response = self.run(scenario)
+
+        assert response.startswith(b"HTTP/1.1 400 ")
+        assert b"Invalid Content-Length" in response
@@ -0,0 +1,100 @@
+"""
+测试异步并发发布
+"""
+
+import asyncio
+
+import pytest
+from hpc_ai_tools.async_poster import AsyncXPoster
+from hpc_ai_tools.post_index import PostIndex
+from hpc_ai_tools.x_api import XApiClient
+from hpc_ai_tools.x_poster import XPoster
+
+
+def make_async_poster(server, tmp_path, concurrency):
+    """创建指向本地服务器的真实模式AsyncXPoster"""
+    poster = XPoster(mock_mode=True, post_index=PostIndex(tmp_path / "index.sqlite3"))
+    poster.mock_mode = False
+    client = XApiClient("key", "secret", "token", "token-secret", base_url=server.url, pool_size=concurrency)
+    return AsyncXPoster(poster, concurrency=concurrency, client=client)
+
+
+class TestAsyncXPoster:
+    """测试AsyncXPoster"""
+
+    @pytest.fixture(autouse=True)
+    def chdir(self, tmp_path, monkeypatch):
+        """在临时目录中运行"""
+        monkeypatch.chdir(tmp_path)
+
+    def test_bounded_concurrency(self, fake_x_server, tmp_path):
+        """测试并发请求数受限"""
+        fake_x_server.delay = 0.05
+        async_poster = make_async_poster(fake_x_server, tmp_path, concurrency=4)
+        contents = [f"Queued HPC post number {i} #HPC" for i in range(20)]
+
+        results = asyncio.run(async_poster.post_many(contents))
+        async_poster.close()
+
+        assert [r.key for r in results] == list(range(20))
+        assert all(r.success and r.tweet_id for r in results)
+        assert fake_x_server.max_in_flight == 4
+        assert len(fake_x_server.requests) == 20
+        assert "OAuth" in fake_x_server.requests[0][2]["Authorization"]
+
+    def test_per_item_results(self, fake_x_server, tmp_path):
+        """测试逐条报告结果"""
+        fake_x_server.respond(
+            "POST",
+            "/2/tweets",
+            lambda body: (403, {}, {"detail": "You are not allowed to create a Tweet with duplicate content."})
+            if "rejected" in body["text"]
+            else (201, {}, {"data": {"id": "7", "text": body["text"]}}),
+        )
+        async_poster = make_async_poster(fake_x_server, tmp_path, concurrency=2)
+        seen = []
+
+        results = asyncio.run(
+            async_poster.post_many(
+                ["Accepted HPC post #HPC", "This one gets rejected #HPC", "short"],
+                on_result=seen.append,
+            )
+        )
+        async_poster.close()
+
+        assert [r.success for r in results] == [True, False, False]
+        assert "duplicate content" in results[1].message
+        assert "too short" in results[2].message
+        assert len(seen) == 3
+        assert len(fake_x_server.requests) == 2
+
+    def test_duplicates_in_same_run(self, fake_x_server, tmp_path):
+        """测试同一批次重复内容只发布一次"""
+        async_poster = make_async_poster(fake_x_server, tmp_path, concurrency=4)
+
+        results = asyncio.run(async_poster.post_many(["Same HPC content #HPC"] * 4))
+        async_poster.close()
+
+        assert sum(r.success for r in results) == 1
+        assert len(fake_x_server.requests) == 1
+
+    def test_focus_recorded(self, fake_x_server, tmp_path):
+        """测试队列项的focus写入发布历史"""
+        from hpc_ai_tools.journal import flush_journals
+
+        async_poster = make_async_poster(fake_x_server, tmp_path, concurrency=2)
+
+        async def post_queue():
+            queue: asyncio.Queue = asyncio.Queue()
+            for item in [(1, "Queued AI post with focus #AI", "ai"), (2, "Queued post without focus #HPC")]:
+                queue.put_nowait(item)
+            queue.put_nowait(None)
+            return await async_poster.run(queue)
+
+        results = asyncio.run(post_queue())
+        async_poster.close()
+        flush_journals()
+
+        assert all(r.success for r in results)
+        focus = {r["content"]: r.get("focus") for r in async_poster.poster.history.query()}
+        assert focus == {"Queued AI post with focus #AI": "ai", "Queued post without focus #HPC": None}
@@ -0,0 +1,94 @@
+"""
+测试基准测试套件与回归门限
+
+The regression gate against the stored baseline only runs when
+RUN_BENCHMARKS=1, since the baseline numbers depend on the machine that
+recorded them; BENCH_THRESHOLD loosens it. The other tests run every
+benchmark briefly on small synthetic logs.
+"""
+
+import json
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+from hpc_ai_tools import cli
+from hpc_ai_tools.bench import (
+    BENCHMARKS,
+    DEFAULT_BASELINE_PATH,
+    compare,
+    load_results,
+    run_benchmarks,
+    write_synthetic_logs,
+)
+
+BASELINE = Path(__file__).resolve().parent.parent / DEFAULT_BASELINE_PATH
+
+
+def results(**best_us):
+    """只含best_us的结果"""
+    return {"benchmarks": {name: {"best_us": value} for name, value in best_us.items()}}
+
+
+class TestCompare:
+    """测试compare函数"""
+
+    def test_threshold(self):
+        """测试超过门限才算回归"""
+        baseline = results(a=10.0, b=10.0, c=10.0)
+        current = results(a=12.0, b=13.0, d=50.0)
+
+        regressions = compare(current, baseline, threshold=0.25)
+
+        assert [r.name for r in regressions] == ["b"]
+        assert regressions[0].change == pytest.approx(0.3)
+        assert compare(current, baseline, threshold=0.1)[0].name == "a"
+
+
+class TestRunBenchmarks:
+    """测试run_benchmarks函数"""
+
+    def test_all_benchmarks(self, tmp_path, monkeypatch):
+        """测试每个基准都能在小日志上运行"""
+        monkeypatch.chdir(tmp_path)
+        output = run_benchmarks(tmp_path / "work", records=500, round_time=0.001, repeat=2)
+
+        assert set(output["benchmarks"]) == set(BENCHMARKS)
+        assert output["records"] == 500
+        for result in output["benchmarks"].values():
+            assert 0 < result["best_us"] <= result["median_us"]
+        history, tweet_log, _ = write_synthetic_logs(tmp_path / "work" / "logs", 500)
+        assert len(history.read_text(encoding="utf-8").splitlines()) == 500
+        assert tweet_log.read_text(encoding="utf-8").count("MOCK POST") == 50
+
+    def test_bench_command_gate(self, tmp_path, monkeypatch):
+        """测试bench命令在回归时返回非零"""
+        monkeypatch.chdir(tmp_path)
+        baseline = tmp_path / "baseline.json"
+        argv = ["hpc-ai-tools", "bench", "--only", "generate_hashtags", "--repeat", "2", "--baseline", str(baseline)]
+
+        monkeypatch.setattr(sys, "argv", argv + ["--update-baseline"])
+        assert cli.main() == 0
+        saved = json.loads(baseline.read_text(encoding="utf-8"))
+        assert list(saved["benchmarks"]) == ["generate_hashtags"]
+
+        saved["benchmarks"]["generate_hashtags"]["best_us"] /= 10
+        baseline.write_text(json.dumps(saved), encoding="utf-8")
+        monkeypatch.setattr(sys, "argv", argv + ["-o", str(tmp_path / "results.json")])
+        assert cli.main() == 1
+        assert "generate_hashtags" in json.loads((tmp_path / "results.json").read_text())["benchmarks"]
+
+
+@pytest.mark.skipif(os.getenv("RUN_BENCHMARKS") != "1", reason="set RUN_BENCHMARKS=1 to gate on the baseline")
+@pytest.mark.parametrize("name", list(BENCHMARKS))
+def test_no_regression(name, tmp_path_factory, monkeypatch):
+    """测试相对基线没有超过门限的回归"""
+    monkeypatch.chdir(tmp_path_factory.mktemp("cwd"))
+    baseline = load_results(BASELINE)
+    output = run_benchmarks(tmp_path_factory.getbasetemp() / "bench", names=[name], records=baseline["records"])
+
+    regressions = compare(output, baseline)
+
+    assert not regressions, f"{name} is {regressions[0].change:+.1%} slower than {BASELINE}"
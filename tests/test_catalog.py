@@ -0,0 +1,40 @@
+"""
+测试共享内容目录
+"""
+
+import dataclasses
+
+import pytest
+from hpc_ai_tools.catalog import get_catalog
+from hpc_ai_tools.content_generator import ContentGenerator
+
+
+class TestContentCatalog:
+    """测试ContentCatalog"""
+
+    def test_shared_between_generators(self):
+        """测试多个生成器共享同一目录"""
+        first = ContentGenerator(language="zh")
+        second = ContentGenerator(language="zh")
+
+        assert first.catalog is second.catalog
+        assert first.hpc_templates is second.hpc_templates
+        assert ContentGenerator(language="en").catalog is not first.catalog
+
+    def test_unknown_language_uses_english(self):
+        """测试未知语言回退到英文目录"""
+        assert get_catalog("fr") is get_catalog("en")
+
+    def test_immutable(self):
+        """测试目录不可修改"""
+        catalog = get_catalog("en")
+
+        assert isinstance(catalog.hpc_topics, tuple)
+        assert isinstance(catalog.emoji_set, frozenset)
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            catalog.hpc_topics = ()
+
+    def test_content_stats_emojis(self):
+        """测试统计emoji数量"""
+        generator = ContentGenerator()
+        assert generator.get_content_stats("🚀 GPU 🔬 #HPC")["emojis"] == 2
@@ -0,0 +1,164 @@
+"""
+测试命令行接口
+"""
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from hpc_ai_tools import cli
+
+SRC_DIR = Path(__file__).resolve().parent.parent / "src"
+
+
+def run_cli(monkeypatch, *argv):
+    """以指定参数运行CLI"""
+    monkeypatch.setattr(sys, "argv", ["hpc-ai-tools", *argv])
+    return cli.main()
+
+
+class TestGenerateCommand:
+    """测试generate命令"""
+
+    def test_count(self, monkeypatch, tmp_path):
+        """测试批量生成到文件"""
+        output = tmp_path / "batch.txt"
+        assert run_cli(monkeypatch, "generate", "-n", "20", "-t", "morning", "-o", str(output)) == 0
+
+        posts = output.read_text(encoding="utf-8").split(cli.POST_SEPARATOR)
+        assert len(posts) == 20
+
+    def test_stream_jsonl(self, monkeypatch, tmp_path):
+        """测试流式JSONL输出"""
+        output = tmp_path / "feed.jsonl"
+        assert run_cli(
+            monkeypatch, "generate", "--stream", "--format", "jsonl", "-n", "30", "-o", str(output)
+        ) == 0
+
+        records = [json.loads(line) for line in output.read_text(encoding="utf-8").splitlines()]
+        assert len(records) == 60
+        assert [r["focus"] for r in records[:4]] == ["hpc", "ai", "hpc", "ai"]
+
+    @pytest.mark.parametrize("modes", [("--stream", "--unique"), ("--enqueue", "--stream")])
+    def test_conflicting_modes(self, monkeypatch, capsys, modes):
+        """测试互斥的输出模式被拒绝"""
+        with pytest.raises(SystemExit) as exc:
+            run_cli(monkeypatch, "generate", *modes)
+
+        assert exc.value.code == 2
+        assert "not allowed with argument" in capsys.readouterr().err
+
+    def test_unique_wrap_has_no_repeats(self, monkeypatch, tmp_path, capsys):
+        """测试跨周期的单次运行不重复输出"""
+        from hpc_ai_tools.content_generator import ContentGenerator
+        from hpc_ai_tools.enumerator import EnumerationCursor
+
+        size = ContentGenerator().length_index("hpc").feasible
+        cursor_file = tmp_path / "cursor.json"
+        cursor = EnumerationCursor(cursor_file)
+        cursor.get("en:hpc", size, seed=5)
+        cursor.advance("en:hpc", size - 3)
+        cursor.save()
+
+        output = tmp_path / "unique.jsonl"
+        assert run_cli(
+            monkeypatch, "generate", "--unique", "-t", "morning", "-f", "jsonl", "-n", str(size + 10),
+            "--cursor-file", str(cursor_file), "-o", str(output),
+        ) == 0
+
+        contents = [json.loads(line)["content"] for line in output.read_text(encoding="utf-8").splitlines()]
+        assert len(contents) == len(set(contents)) == size
+        assert f"Only {size} distinct hpc posts" in capsys.readouterr().err
+
+
+class TestPostFromQueue:
+    """测试post --from-queue"""
+
+    @pytest.fixture(autouse=True)
+    def chdir(self, tmp_path, monkeypatch):
+        """在临时目录中运行"""
+        monkeypatch.chdir(tmp_path)
+
+    def test_bad_lines_skipped(self, monkeypatch, tmp_path, capsys):
+        """测试无效行被跳过并以非零状态退出"""
+        queue = tmp_path / "q.jsonl"
+        queue.write_text(
+            '{"content": "First queued HPC post #HPC"}\nnot json\n{"id": 3}\n'
+            '{"content": "Second queued HPC post #HPC"}\n',
+            encoding="utf-8",
+        )
+
+        assert run_cli(monkeypatch, "post", "--from-queue", str(queue), "--concurrency", "2") == 1
+
+        out, err = capsys.readouterr()
+        assert "Posted 2/2 items" in out
+        assert "line 2: not JSON" in err
+        assert "line 3: no 'content' string" in err
+
+    def test_reader_error_stops_workers(self):
+        """测试读取出错时工作协程仍会退出"""
+        import asyncio
+
+        from hpc_ai_tools.async_poster import AsyncXPoster
+        from hpc_ai_tools.post_index import PostIndex
+        from hpc_ai_tools.x_poster import XPoster
+
+        def records():
+            yield 1, "Only readable HPC post #HPC"
+            raise OSError("read failed")
+
+        poster = XPoster(mock_mode=True, post_index=PostIndex("index.sqlite3"))
+        async_poster = AsyncXPoster(poster, concurrency=2)
+        drain = cli._drain_queue_source(async_poster, records(), None)
+        try:
+            with pytest.raises(OSError):
+                asyncio.run(asyncio.wait_for(drain, timeout=10))
+        finally:
+            async_poster.close()
+
+
+class TestProfileOption:
+    """测试--profile选项"""
+
+    def test_cpu_profile(self, monkeypatch, tmp_path, capsys):
+        """测试CPU分析结果保存在输出文件旁"""
+        import pstats
+
+        output = tmp_path / "batch.txt"
+        assert run_cli(monkeypatch, "--profile", "generate", "-n", "5", "-o", str(output)) == 0
+
+        assert "CPU profile" in capsys.readouterr().err
+        stats = pstats.Stats(str(tmp_path / "batch.txt.pstats"))
+        assert any(name == "command_generate" for _, _, name in stats.stats)
+
+    def test_mem_profile(self, monkeypatch, tmp_path, capsys):
+        """测试子命令后的--profile=mem写入分配快照"""
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.setenv("PROFILE_DIR", str(tmp_path / "profiles"))
+        assert run_cli(monkeypatch, "generate", "-t", "morning", "--profile=mem") == 0
+
+        assert "Memory profile" in capsys.readouterr().err
+        (snapshot,) = (tmp_path / "profiles").glob("generate-*.mem.txt")
+        assert snapshot.read_text(encoding="utf-8").startswith("current ")
+
+
+class TestDotenv:
+    """测试.env配置对所有命令生效"""
+
+    def test_env_file_read_before_dispatch(self, tmp_path):
+        """测试.env中的TRACE_FILE在generate命令中生效"""
+        (tmp_path / ".env").write_text("TRACE_FILE=from-dotenv.json\n", encoding="utf-8")
+        env = dict(os.environ, PYTHONPATH=str(SRC_DIR))
+        env.pop("TRACE_FILE", None)
+        subprocess.run(
+            [sys.executable, "-m", "hpc_ai_tools.cli", "generate", "-t", "morning"],
+            cwd=tmp_path,
+            env=env,
+            check=True,
+            stdout=subprocess.DEVNULL,
+        )
+
+        assert (tmp_path / "from-dotenv.json").exists()
@@ -3,73 +3,89 @@
 """
 
 import pytest
-from hpc_ai_tools.content_generator import HPCContentGenerator
+from hpc_ai_tools.content_generator import ContentGenerator
 
 
-class TestHPCContentGenerator:
-    """测试HPCContentGenerator类"""
-    
+class TestContentGenerator:
+    """测试ContentGenerator类"""
+
     def setup_method(self):
         """测试前设置"""
-        self.generator = HPCContentGenerator()
-    
+        self.generator = ContentGenerator(seed=42)
+
     def test_initialization(self):
         """测试初始化"""
-        assert hasattr(self.generator, 'hpc_topics')
-        assert hasattr(self.generator, 'ai_topics')
-        assert hasattr(self.generator, 'organizations')
-        assert hasattr(self.generator, 'emojis')
-        
+        assert self.generator.language == "en"
+
         assert len(self.generator.hpc_topics) > 0
         assert len(self.generator.ai_topics) > 0
         assert len(self.generator.organizations) > 0
         assert len(self.generator.emojis) > 0
-    
-    def test_generate_tweet_hpc(self):
-        """测试生成HPC推文"""
-        tweet = self.generator.generate_tweet("hpc")
-        
-        assert isinstance(tweet, str)
-        assert len(tweet) > 0
-        assert "#" in tweet  # 应该包含话题标签
-    
-    def test_generate_tweet_ai(self):
-        """测试生成AI推文"""
-        tweet = self.generator.generate_tweet("ai")
-        
-        assert isinstance(tweet, str)
-        assert len(tweet) > 0
-        assert "#" in tweet  # 应该包含话题标签
-    
+
+    def test_generate_morning_content(self):
+        """测试生成上午HPC内容"""
+        content = self.generator.generate_morning_content()
+
+        assert isinstance(content, str)
+        assert len(content) > 0
+        assert "#HPC" in content  # 应该包含HPC话题标签
+
+    def test_generate_afternoon_content(self):
+        """测试生成下午AI内容"""
+        content = self.generator.generate_afternoon_content()
+
+        assert isinstance(content, str)
+        assert len(content) > 0
+        assert "#AI" in content  # 应该包含AI话题标签
+
     def test_generate_daily_content(self):
         """测试生成每日内容"""
         content = self.generator.generate_daily_content()
-        
+
         assert isinstance(content, dict)
         assert "morning" in content
         assert "afternoon" in content
-        
+
         assert isinstance(content["morning"], str)
         assert isinstance(content["afternoon"], str)
-        
+
         assert len(content["morning"]) > 0
         assert len(content["afternoon"]) > 0
-    
-    def test_tweet_length(self):
-        """测试推文长度"""
-        tweet = self.generator.generate_tweet("hpc")
-        # X推文最大长度280字符，确保不超过
-        assert len(tweet) <= 280
-    
-    def test_emoji_in_tweet(self):
-        """测试推文包含emoji"""
-        tweet = self.generator.generate_tweet("hpc")
-        # 检查是否包含常见emoji字符
-        has_emoji = any(ord(char) > 0xFFFF for char in tweet[:100])
-        assert has_emoji or "🚀" in tweet or "🔬" in tweet
+
+    def test_content_length(self):
+        """测试内容长度"""
+        for _ in range(50):
+            content = self.generator.generate_morning_content()
+            # X推文最大长度280字符，确保不超过
+            assert len(content) <= self.generator.max_length
+        assert self.generator.truncations == 0
+
+    def test_validate_content_length(self):
+        """测试超长内容先去掉多余话题标签再截断"""
+        content = "x" * 300 + "\n\n#Tech #Innovation #HPC #Supercomputing"
+
+        validated = self.generator._validate_content_length(content)
+
+        assert len(validated) == self.generator.max_length
+        assert validated.endswith("...")
+        assert self.generator._validate_content_length("Short post") == "Short post"
+
+    def test_content_stats(self):
+        """测试内容统计"""
+        stats = self.generator.get_content_stats("🚀 Exascale @ORNL\n\n#HPC #AI")
+
+        assert stats == {"length": 26, "lines": 3, "hashtags": 2, "mentions": 1, "emojis": 1}
+
+    def test_seed_replay(self):
+        """测试相同种子生成相同内容"""
+        replay = ContentGenerator(seed=42)
+
+        assert [self.generator.generate_morning_content() for _ in range(5)] == [
+            replay.generate_morning_content() for _ in range(5)
+        ]
 
 
 if __name__ == "__main__":
     # 运行测试
     import sys
-    sys.exit(pytest.main([__file__, "-v"]))
\ No newline at end of file
+    sys.exit(pytest.main([__file__, "-v"]))
@@ -0,0 +1,73 @@
+"""
+测试内容组合枚举
+"""
+
+from itertools import islice
+
+import pytest
+from hpc_ai_tools.content_generator import ContentGenerator
+from hpc_ai_tools.enumerator import ContentSpace, EnumerationCursor, FeistelPermutation
+
+
+class TestContentSpace:
+    """测试混合进制解码"""
+
+    def test_decode_encode_roundtrip(self):
+        """测试编码解码互逆"""
+        space = ContentSpace((3, 5, 2, 7))
+        assert space.size == 210
+        decoded = {space.decode(i) for i in range(space.size)}
+
+        assert len(decoded) == space.size
+        assert all(space.encode(space.decode(i)) == i for i in range(space.size))
+        assert space.decode(0) == (0, 0, 0, 0)
+        assert space.decode(209) == (2, 4, 1, 6)
+
+    def test_out_of_range(self):
+        """测试越界索引"""
+        with pytest.raises(IndexError):
+            ContentSpace((2, 2)).decode(4)
+
+
+class TestFeistelPermutation:
+    """测试Feistel置换"""
+
+    @pytest.mark.parametrize("size", [1, 2, 7, 1000, 16875])
+    def test_full_cycle(self, size):
+        """测试遍历全部元素且无重复"""
+        permutation = FeistelPermutation(size, seed=11)
+        assert sorted(permutation(i) for i in range(size)) == list(range(size))
+
+    def test_seed_changes_order(self):
+        """测试不同种子顺序不同"""
+        first = [FeistelPermutation(1000, seed=1)(i) for i in range(20)]
+        second = [FeistelPermutation(1000, seed=2)(i) for i in range(20)]
+        assert first != second
+
+
+class TestUniqueWalk:
+    """测试无重复遍历"""
+
+    def test_resume_from_cursor(self, tmp_path):
+        """测试从游标恢复遍历"""
+        generator = ContentGenerator()
+        full = [r["content"] for r in islice(generator.iter_unique("ai", seed=4), 30)]
+
+        cursor = EnumerationCursor(tmp_path / "cursor.json")
+        seed, position = cursor.get("en:ai", generator.content_space("ai").size, seed=4)
+        first = list(islice(generator.iter_unique("ai", seed=seed, start=position), 10))
+        cursor.advance("en:ai", first[-1]["position"] + 1)
+        cursor.save()
+
+        reloaded = EnumerationCursor(tmp_path / "cursor.json")
+        seed, position = reloaded.get("en:ai", generator.content_space("ai").size)
+        rest = list(islice(generator.iter_unique("ai", seed=seed, start=position), 20))
+
+        assert [r["content"] for r in first + rest] == full
+
+    def test_new_epoch_after_exhaustion(self, tmp_path):
+        """测试遍历结束后进入新周期"""
+        cursor = EnumerationCursor(tmp_path / "cursor.json")
+        cursor.get("en:hpc", 10, seed=1)
+        cursor.advance("en:hpc", 10)
+        assert cursor.get("en:hpc", 10) == (2, 0)
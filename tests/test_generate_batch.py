@@ -0,0 +1,71 @@
+"""
+测试批量内容生成
+"""
+
+import pytest
+from hpc_ai_tools.content_generator import ContentGenerator
+
+
+class TestGenerateBatch:
+    """测试ContentGenerator.generate_batch"""
+
+    def setup_method(self):
+        """测试前设置"""
+        self.generator = ContentGenerator()
+
+    def test_batch_size(self):
+        """测试批量大小和索引数组"""
+        posts, indices = self.generator.generate_batch(500, focus="hpc")
+
+        assert len(posts) == 500
+        assert set(indices) == {"topic", "template", "organization", "emoji"}
+        for values in indices.values():
+            assert len(values) == 500
+
+    def test_indices_match_posts(self):
+        """测试索引与内容对应"""
+        posts, indices = self.generator.generate_batch(200, focus="ai")
+
+        for i, post in enumerate(posts):
+            topic = self.generator.ai_topics[indices["topic"][i]]
+            emoji = self.generator.emojis[indices["emoji"][i]]
+            assert post.startswith(emoji)
+            assert topic in post
+
+    def test_batch_length(self):
+        """测试批量内容长度"""
+        posts, _ = self.generator.generate_batch(1000, focus="hpc")
+        assert all(len(post) <= 280 for post in posts)
+
+    def test_empty_batch(self):
+        """测试空批量"""
+        posts, indices = self.generator.generate_batch(0)
+        assert posts == []
+        assert len(indices["topic"]) == 0
+
+    def test_negative_batch(self):
+        """测试非法批量大小"""
+        with pytest.raises(ValueError):
+            self.generator.generate_batch(-1)
+
+
+class TestIterContent:
+    """测试ContentGenerator.iter_content"""
+
+    def setup_method(self):
+        """测试前设置"""
+        self.generator = ContentGenerator()
+
+    def test_limit(self):
+        """测试限制数量"""
+        records = list(self.generator.iter_content(focus="ai", limit=25, chunk_size=10))
+
+        assert len(records) == 25
+        assert all(record["focus"] == "ai" for record in records)
+        assert all(isinstance(record["topic"], int) for record in records)
+
+    def test_endless_stream(self):
+        """测试无限流"""
+        stream = self.generator.iter_content(focus="hpc", chunk_size=8)
+        records = [next(stream) for _ in range(100)]
+        assert len(records) == 100
@@ -0,0 +1,161 @@
+"""
+测试结构化发布历史和时间索引
+"""
+
+import gzip
+import json
+import sys
+from datetime import datetime, timedelta
+
+from hpc_ai_tools import cli
+from hpc_ai_tools.history import PostHistory, compress_segment, history_record
+from hpc_ai_tools.journal import JournalWriter
+from hpc_ai_tools.post_index import PostIndex
+from hpc_ai_tools.x_poster import XPoster
+
+
+def write_history(path, start, count, step=timedelta(minutes=1)):
+    """写入按时间排序的历史记录"""
+    with open(path, "a", encoding="utf-8") as f:
+        for i in range(count):
+            mode = "real" if i % 2 else "mock"
+            f.write(history_record(
+                mode,
+                f"History post {i} " + "x" * 200,
+                tweet_id=str(i) if mode == "real" else None,
+                focus="hpc" if i % 3 else "ai",
+                latency=0.5 if mode == "real" else None,
+                error="503" if i % 10 == 9 else None,
+                now=start + i * step,
+            ))
+
+
+def bytes_read(history, since, until):
+    """范围查询实际读取的字节数"""
+    low, high = since.timestamp(), until.timestamp()
+    return sum(
+        len(chunk) for path in history.segments() for chunk in history._read_blocks(path, low, high)
+    )
+
+
+class TestPostHistory:
+    """测试PostHistory类"""
+
+    def setup_method(self):
+        """测试前设置"""
+        self.start = datetime(2024, 5, 1).astimezone()
+
+    def test_record_fields(self):
+        """测试记录字段"""
+        line = history_record("real", "Posted text", tweet_id="42", focus="hpc", latency=0.25, now=self.start)
+        record = json.loads(line)
+
+        assert line.startswith('{"timestamp": ')
+        assert record == {
+            "timestamp": self.start.isoformat(timespec="milliseconds"),
+            "mode": "real",
+            "tweet_id": "42",
+            "focus": "hpc",
+            "length": 11,
+            "latency": 0.25,
+            "error": None,
+            "content": "Posted text",
+        }
+
+    def test_range_query_seeks(self, tmp_path):
+        """测试范围查询只读取相关数据块"""
+        history = PostHistory(tmp_path / "post_history.jsonl")
+        write_history(history.path, self.start, 3000)
+        since = self.start + timedelta(minutes=1000)
+        until = self.start + timedelta(minutes=1100)
+
+        records = list(history.query(since, until))
+
+        assert len(records) == 100
+        assert records[0]["content"].startswith("History post 1000 ")
+        assert bytes_read(history, since, until) < history.path.stat().st_size / 5
+
+        # New records extend the index without a rebuild
+        write_history(history.path, self.start + timedelta(minutes=3000), 10)
+        assert len(list(history.query(self.start + timedelta(minutes=2995)))) == 15
+
+    def test_index_rebuilt_after_truncate(self, tmp_path):
+        """测试文件被截断重写后（同一inode）索引会重建"""
+        history = PostHistory(tmp_path / "post_history.jsonl")
+        write_history(history.path, self.start, 1000)
+        assert len(list(history.query())) == 1000
+
+        # copytruncate keeps the inode; the new file grows past the old index
+        later = self.start + timedelta(days=30)
+        history.path.write_bytes(b"")
+        write_history(history.path, later, 1500)
+
+        since = later + timedelta(minutes=100)
+        records = list(history.query(since, since + timedelta(minutes=10)))
+        assert [r["content"].split()[2] for r in records] == [str(i) for i in range(100, 110)]
+
+    def test_replaced_segment_ignores_stale_index(self, tmp_path):
+        """测试被替换的压缩分段不再使用旧索引"""
+        history = PostHistory(tmp_path / "post_history.jsonl")
+        segment = tmp_path / "post_history.1.jsonl"
+        write_history(segment, self.start, 500)
+        gz_path = compress_segment(segment)
+
+        replacement = tmp_path / "replacement.jsonl"
+        write_history(replacement, self.start + timedelta(days=30), 800)
+        gz_path.write_bytes(gzip.compress(replacement.read_bytes()))
+
+        assert len(list(history.query())) == 800
+
+    def test_rotated_segments_are_queried(self, tmp_path):
+        """测试轮转并压缩的分段也被查询"""
+        history = PostHistory(tmp_path / "post_history.jsonl")
+        journal = JournalWriter(history.path, fsync="never", max_bytes=200_000, on_rotate=compress_segment)
+        for i in range(2000):
+            journal.write(history_record("mock", f"Rotated post {i} " + "x" * 200, now=self.start + timedelta(minutes=i)))
+            if i % 100 == 99:
+                journal.flush()
+        journal.close()
+
+        segments = history.segments()
+        assert len(segments) > 2
+        assert all(path.suffix == ".gz" for path in segments[:-1])
+        assert len(list(history.query())) == 2000
+
+        since = self.start + timedelta(minutes=500)
+        until = self.start + timedelta(minutes=520)
+        assert [r["content"].split()[2] for r in history.query(since, until)] == [str(i) for i in range(500, 520)]
+        total = sum(path.stat().st_size for path in segments)
+        assert bytes_read(history, since, until) < total
+
+    def test_aggregate(self, tmp_path):
+        """测试按天、模式和方向汇总"""
+        history = PostHistory(tmp_path / "post_history.jsonl")
+        write_history(history.path, self.start, 48, step=timedelta(hours=1))
+
+        by_day = history.aggregate(group_by="day")
+        by_mode = history.aggregate(group_by="mode")
+        by_focus = history.aggregate(self.start, self.start + timedelta(days=1), group_by="focus")
+
+        assert list(by_day) == ["2024-05-01", "2024-05-02"]
+        assert by_day["2024-05-01"]["posts"] + by_day["2024-05-01"]["errors"] == 24
+        assert by_mode["real"]["errors"] == 4 and by_mode["real"]["avg_latency"] == 0.5
+        assert by_mode["mock"]["avg_latency"] is None
+        assert by_focus["ai"]["posts"] + by_focus["ai"]["errors"] == 8
+
+
+class TestStatsCommand:
+    """测试stats分析命令"""
+
+    def test_group_by_mode(self, tmp_path, monkeypatch, capsys):
+        """测试stats --group-by mode"""
+        monkeypatch.chdir(tmp_path)
+        poster = XPoster(mock_mode=True, post_index=PostIndex(tmp_path / "index.sqlite3"))
+        for i in range(3):
+            poster.post_to_x(f"History mock post number {i} #HPC", focus="hpc")
+
+        monkeypatch.setattr(sys, "argv", ["hpc-ai-tools", "stats", "--since", "2000-01-01", "--group-by", "focus"])
+        assert cli.main() == 0
+
+        out = capsys.readouterr().out
+        assert "hpc" in out.splitlines()[-1] and " 3 " in out.splitlines()[-1]
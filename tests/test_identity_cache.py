@@ -0,0 +1,65 @@
+"""
+测试凭据验证缓存
+"""
+
+from hpc_ai_tools.identity_cache import IdentityCache, credentials_key
+from hpc_ai_tools.post_index import PostIndex
+from hpc_ai_tools.x_poster import XPoster
+
+CREDENTIALS = ("key", "consumer-secret", "token", "token-secret")
+
+
+class TestIdentityCache:
+    """测试IdentityCache类"""
+
+    def setup_method(self):
+        """测试前设置"""
+        self.now = 1_700_000_000.0
+        self.key = credentials_key(CREDENTIALS, "https://api.twitter.com")
+
+    def test_ttl(self, tmp_path):
+        """测试条目过期"""
+        cache = IdentityCache(tmp_path / "identity.json", ttl=60, clock=lambda: self.now)
+        cache.put(self.key, {"id": "1", "username": "hpc_ai_bot"})
+
+        assert IdentityCache(tmp_path / "identity.json", ttl=60, clock=lambda: self.now + 59).get(self.key) == {
+            "id": "1",
+            "username": "hpc_ai_bot",
+        }
+        assert IdentityCache(tmp_path / "identity.json", ttl=60, clock=lambda: self.now + 60).get(self.key) is None
+        assert cache.get(credentials_key(CREDENTIALS, "http://127.0.0.1:1")) is None
+
+    def test_secrets_not_stored(self, tmp_path):
+        """测试缓存文件不包含凭据"""
+        cache = IdentityCache(tmp_path / "identity.json", ttl=60)
+        cache.put(self.key, {"id": "1", "username": "hpc_ai_bot"})
+
+        text = (tmp_path / "identity.json").read_text(encoding="utf-8")
+        assert not any(secret in text for secret in CREDENTIALS[1:])
+        assert (tmp_path / "identity.json").stat().st_mode & 0o077 == 0
+
+        cache.invalidate(self.key)
+        assert cache.get(self.key) is None
+
+
+class TestXPosterIdentity:
+    """测试XPoster复用已验证身份"""
+
+    def test_get_me_skipped_when_cached(self, fake_x_server, tmp_path, monkeypatch):
+        """测试缓存命中时首个请求即为发帖"""
+        monkeypatch.chdir(tmp_path)
+        for var, value in zip(("X_API_KEY", "X_API_SECRET", "X_ACCESS_TOKEN", "X_ACCESS_TOKEN_SECRET"), CREDENTIALS):
+            monkeypatch.setenv(var, value)
+        monkeypatch.setenv("X_API_BASE_URL", fake_x_server.url)
+
+        XPoster(mock_mode=False, post_index=PostIndex(tmp_path / "index.sqlite3"))
+        poster = XPoster(mock_mode=False, post_index=PostIndex(tmp_path / "index.sqlite3"))
+        success, message = poster.post_to_x("Posted without verifying again #HPC")
+        assert success, message
+        assert [r[1] for r in fake_x_server.requests] == ["/2/users/me", "/2/tweets"]
+
+        # Rejected credentials are verified again on the next run
+        fake_x_server.respond("POST", "/2/tweets", lambda body: (401, {}, {"detail": "Unauthorized"}))
+        assert not poster.post_to_x("Rejected post #HPC")[0]
+        XPoster(mock_mode=False, post_index=PostIndex(tmp_path / "index.sqlite3"))
+        assert [r[1] for r in fake_x_server.requests][-1] == "/2/users/me"
@@ -0,0 +1,75 @@
+"""
+测试CLI启动导入耗时
+
+Runs each subcommand under ``python -X importtime`` and checks the import
+time spent after interpreter start-up (everything following ``site``)
+against a per-command budget, plus the heavy modules each command must
+not import. Run with ``-s`` to print the measured times.
+Set IMPORT_BUDGET_SCALE to loosen the budgets on slow machines.
+"""
+
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+SRC_DIR = Path(__file__).resolve().parent.parent / "src"
+
+_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+# Total import time budgets in microseconds
+BUDGET_SCALE = float(os.getenv("IMPORT_BUDGET_SCALE", "1.0"))
+
+SUBCOMMANDS = {
+    # name: (argv, budget_us, modules that must not be imported)
+    "generate": (["generate"], 60_000, {"numpy", "requests"}),
+    "generate-batch": (["generate", "-n", "10"], 200_000, {"requests"}),
+    "post-mock": (["post", "--mode", "mock"], 80_000, {"numpy", "requests"}),
+    "setup": (["setup"], 60_000, {"numpy", "requests"}),
+}
+
+
+def measure_imports(argv, cwd):
+    """运行子命令并解析-X importtime输出"""
+    env = dict(os.environ, PYTHONPATH=str(SRC_DIR))
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-m", "hpc_ai_tools.cli", *argv],
+        cwd=cwd,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+
+    # Lines are printed as imports finish; skip interpreter start-up (site)
+    modules = {}
+    started = False
+    for line in result.stderr.splitlines():
+        match = _LINE.match(line)
+        if not match:
+            continue
+        if not started:
+            started = match.group(3) == " " and match.group(4) == "site"
+            continue
+        modules[match.group(4)] = int(match.group(1))
+    return modules
+
+
+@pytest.mark.parametrize("name", sorted(SUBCOMMANDS))
+def test_startup_budget(name, tmp_path):
+    """测试子命令导入耗时预算"""
+    argv, budget, forbidden = SUBCOMMANDS[name]
+    modules = measure_imports(argv, tmp_path)
+    total = sum(modules.values())
+
+    top = sorted(modules.items(), key=lambda item: item[1], reverse=True)[:5]
+    print(f"\n{name}: {total / 1000:.1f} ms imports, top: {top}")
+
+    loaded = {module.split(".")[0] for module in modules}
+    assert not loaded & forbidden, f"{name} imported {sorted(loaded & forbidden)}"
+    assert total <= budget * BUDGET_SCALE, (
+        f"{name} import time {total / 1000:.1f} ms exceeds "
+        f"{budget * BUDGET_SCALE / 1000:.1f} ms budget"
+    )
@@ -0,0 +1,129 @@
+"""
+测试分组提交日志写入器
+"""
+
+import multiprocessing
+import os
+import threading
+
+import pytest
+from hpc_ai_tools import journal as journal_module
+from hpc_ai_tools.journal import JournalWriter, get_journal
+from hpc_ai_tools.post_index import PostIndex
+from hpc_ai_tools.x_poster import XPoster
+
+
+def write_records(path, writer_id, count):
+    """在子进程中写入较大的记录"""
+    journal = JournalWriter(path, fsync="never")
+    for i in range(count):
+        journal.write(f"{writer_id}:{i}:" + "x" * 8000 + "\n")
+    journal.close()
+
+
+def check_records(path, writers, count):
+    """检查每条记录完整且没有交错"""
+    lines = path.read_text(encoding="utf-8").splitlines()
+    assert len(lines) == writers * count
+    seen = set()
+    for line in lines:
+        writer_id, i, payload = line.split(":")
+        assert payload == "x" * 8000
+        seen.add((writer_id, int(i)))
+    assert len(seen) == writers * count
+
+
+class TestJournalWriter:
+    """测试JournalWriter类"""
+
+    def test_threads_share_group_commits(self, tmp_path):
+        """测试多线程写入合并为少量写操作"""
+        path = tmp_path / "journal.log"
+        journal = JournalWriter(path, fsync="never", flush_interval=0.2)
+        writes = []
+        real_write = os.write
+
+        def counting_write(fd, data):
+            writes.append(len(data))
+            return real_write(fd, data)
+
+        threads = [
+            threading.Thread(target=lambda t=t: [journal.write(f"t{t}:{i}:" + "x" * 8000 + "\n") for i in range(100)])
+            for t in range(4)
+        ]
+        with pytest.MonkeyPatch.context() as mp:
+            mp.setattr(journal_module.os, "write", counting_write)
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            assert journal.flush(timeout=5)
+        journal.close()
+
+        check_records(path, 4, 100)
+        assert len(writes) < 400
+
+    def test_processes_do_not_interleave(self, tmp_path):
+        """测试多进程追加的记录不交错"""
+        path = tmp_path / "journal.log"
+        workers = [
+            multiprocessing.Process(target=write_records, args=(path, f"p{i}", 200))
+            for i in range(4)
+        ]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+        check_records(path, 4, 200)
+
+    def test_fsync_policy(self, tmp_path, monkeypatch):
+        """测试fsync策略"""
+        syncs = []
+        monkeypatch.setattr(journal_module.os, "fsync", syncs.append)
+
+        journal = JournalWriter(tmp_path / "journal.log", fsync="always", flush_interval=0.01)
+        for i in range(3):
+            journal.write(f"record {i}\n")
+            journal.flush()
+        journal.close()
+        assert len(syncs) >= 3
+
+        syncs.clear()
+        journal = JournalWriter(tmp_path / "journal.log", fsync="never")
+        journal.write("record\n")
+        journal.close()
+        assert syncs == []
+
+        with pytest.raises(ValueError):
+            JournalWriter(tmp_path / "journal.log", fsync="sometimes")
+
+    def test_without_fcntl(self, tmp_path, monkeypatch):
+        """测试没有fcntl的平台上仍可写入"""
+        monkeypatch.setattr(journal_module, "fcntl", None)
+
+        journal = JournalWriter(tmp_path / "journal.log", fsync="never", max_bytes=100)
+        for i in range(10):
+            journal.write(f"record {i}: " + "x" * 20 + "\n")
+        journal.close()
+
+        lines = [
+            line for path in tmp_path.iterdir() for line in path.read_text(encoding="utf-8").splitlines()
+        ]
+        assert sorted(lines) == sorted(f"record {i}: " + "x" * 20 for i in range(10))
+
+
+class TestPosterJournal:
+    """测试XPoster通过日志写入器记录发布"""
+
+    def test_mock_posts_are_journaled(self, tmp_path, monkeypatch):
+        """测试模拟发布写入发布历史"""
+        monkeypatch.chdir(tmp_path)
+        poster = XPoster(mock_mode=True, post_index=PostIndex(tmp_path / "index.sqlite3"))
+
+        for i in range(5):
+            assert poster.post_to_x(f"Journaled mock post number {i} #HPC")[0]
+
+        assert get_journal(poster.history.path).flush(timeout=5)
+        assert len((tmp_path / poster.history.path).read_text(encoding="utf-8").splitlines()) == 5
+        assert not (tmp_path / "output").exists()
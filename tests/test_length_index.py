@@ -0,0 +1,52 @@
+"""
+测试长度可行组合索引
+"""
+
+import pytest
+from hpc_ai_tools.content_generator import ContentGenerator
+
+
+class TestLengthIndex:
+    """测试LengthIndex"""
+
+    @pytest.mark.parametrize("focus", ["hpc", "ai"])
+    def test_matches_rendered_lengths(self, focus):
+        """测试索引与实际渲染长度一致"""
+        generator = ContentGenerator()
+        index = generator.length_index(focus)
+        feasible = set(index.codes)
+        topics, templates = generator._focus_components(focus)
+
+        for code in range(index.total):
+            t, tpl, org, emo = index.space.decode(code)
+            content = templates[tpl].render(
+                (
+                    generator.emojis[emo],
+                    topics[t],
+                    generator.organizations[org],
+                    generator._generate_hashtags(topics[t], focus),
+                )
+            )
+            assert (code in feasible) == (len(content) <= generator.max_length)
+
+    def test_no_truncation(self):
+        """测试采样内容无需截断"""
+        generator = ContentGenerator(seed=0)
+        posts, _ = generator.generate_batch(5000, focus="hpc")
+        posts += [generator.generate_morning_content() for _ in range(200)]
+
+        assert all(len(post) <= generator.max_length for post in posts)
+        assert generator.truncations == 0
+
+    def test_stats(self):
+        """测试截断统计"""
+        stats = ContentGenerator().length_stats("hpc")
+
+        assert stats["feasible"] + stats["infeasible"] == stats["combinations"]
+        assert 0 <= stats["truncation_rate"] < 1
+
+    def test_truncation_counter(self):
+        """测试实际截断计数"""
+        generator = ContentGenerator()
+        generator._validate_content_length("x" * 400)
+        assert generator.truncations == 1
@@ -0,0 +1,89 @@
+"""
+测试日志队列与轮转配置
+"""
+
+import logging
+import logging.handlers
+import sys
+import time
+
+from hpc_ai_tools import cli
+from hpc_ai_tools.log_setup import PACKAGE_LOGGER, configure_logging, shutdown_logging
+from hpc_ai_tools.post_index import PostIndex
+from hpc_ai_tools.x_poster import XPoster
+
+
+def queue_handlers():
+    """包日志器上的QueueHandler"""
+    return [
+        h for h in logging.getLogger(PACKAGE_LOGGER).handlers
+        if isinstance(h, logging.handlers.QueueHandler)
+    ]
+
+
+class TestLogSetup:
+    """测试configure_logging"""
+
+    def setup_method(self):
+        """测试前停止其他测试留下的配置"""
+        shutdown_logging()
+
+    def teardown_method(self):
+        """测试后停止后台线程"""
+        shutdown_logging()
+
+    def test_posters_share_one_handler(self, tmp_path, monkeypatch):
+        """测试多次创建XPoster不会叠加处理器"""
+        monkeypatch.chdir(tmp_path)
+        configure_logging()
+        for _ in range(5):
+            poster = XPoster(mock_mode=True, post_index=PostIndex(tmp_path / "index.sqlite3"))
+        poster.post_to_x("One line per log record #HPC")
+        shutdown_logging()
+
+        log_text = (tmp_path / "logs" / "hpc_ai_tools.log").read_text(encoding="utf-8")
+        assert log_text.count("[MOCK] Would post: One line") == 1
+        assert log_text.count("XPoster initialized in mock mode") == 5
+        assert queue_handlers() == []
+
+    def test_library_leaves_logging_alone(self, tmp_path, monkeypatch):
+        """测试XPoster不配置日志，由CLI入口配置"""
+        monkeypatch.chdir(tmp_path)
+        XPoster(mock_mode=True, post_index=PostIndex(tmp_path / "index.sqlite3"))
+        assert queue_handlers() == []
+        assert not (tmp_path / "logs").exists()
+
+        monkeypatch.setattr(sys, "argv", ["hpc-ai-tools", "setup"])
+        cli.main()
+        assert len(queue_handlers()) == 1
+
+    def test_size_rotation(self, tmp_path, monkeypatch):
+        """测试按大小轮转"""
+        monkeypatch.setenv("LOG_MAX_BYTES", "2000")
+        monkeypatch.setenv("LOG_BACKUP_COUNT", "2")
+        log_file = tmp_path / "app.log"
+        configure_logging(str(log_file))
+        configure_logging(str(log_file))
+        assert len(queue_handlers()) == 1
+
+        logger = logging.getLogger(f"{PACKAGE_LOGGER}.test")
+        for i in range(200):
+            logger.info(f"rotation line {i}")
+        shutdown_logging()
+
+        assert (tmp_path / "app.log.1").exists() and (tmp_path / "app.log.2").exists()
+        assert not (tmp_path / "app.log.3").exists()
+
+    def test_slow_disk_does_not_block(self, tmp_path, monkeypatch):
+        """测试写盘缓慢时日志调用不阻塞"""
+        def slow_emit(self, record):
+            time.sleep(0.05)
+
+        monkeypatch.setattr(logging.handlers.RotatingFileHandler, "emit", slow_emit)
+        configure_logging(str(tmp_path / "app.log"))
+        logger = logging.getLogger(f"{PACKAGE_LOGGER}.test")
+
+        start = time.perf_counter()
+        for i in range(20):
+            logger.info(f"queued line {i}")
+        assert time.perf_counter() - start < 0.5
@@ -0,0 +1,139 @@
+"""
+测试媒体上传与media_id缓存
+"""
+
+import pytest
+from hpc_ai_tools.media import MEDIA_LIMITS, MediaCache, MediaUploader
+from hpc_ai_tools.post_index import PostIndex
+from hpc_ai_tools.x_api import XApiClient
+from hpc_ai_tools.x_poster import XPoster
+
+
+def write_image(path, size, seed=0):
+    """写入指定大小的测试图片"""
+    path.write_bytes(bytes((i * 31 + seed) % 256 for i in range(size)))
+    return path
+
+
+class TestMediaUploader:
+    """测试MediaUploader类"""
+
+    @pytest.fixture(autouse=True)
+    def setup(self, fake_x_server, tmp_path):
+        """创建指向本地服务器的上传器"""
+        self.server = fake_x_server
+        self.now = 1_700_000_000.0
+        self.client = XApiClient("key", "secret", "token", "token-secret", base_url=fake_x_server.url)
+        self.cache = MediaCache(tmp_path / "media.sqlite3", clock=lambda: self.now)
+        self.uploader = MediaUploader(self.client, self.cache, account="a", chunk_size=1000, clock=lambda: self.now)
+
+    def test_chunked_upload(self, tmp_path):
+        """测试大文件分块上传"""
+        image = write_image(tmp_path / "chart.png", 3500)
+
+        media_id = self.uploader.upload(str(image))
+
+        assert self.server.media_commands == ["INIT", "APPEND", "APPEND", "APPEND", "APPEND", "FINALIZE"]
+        assert self.server.media[media_id]["data"] == image.read_bytes()
+
+    def test_cache_skips_upload(self, tmp_path):
+        """测试重复图片复用缓存的media_id直到过期"""
+        image = write_image(tmp_path / "logo.png", 500)
+        copy = write_image(tmp_path / "logo-copy.png", 500)
+
+        first = self.uploader.upload(str(image))
+        assert self.server.media_commands == ["UPLOAD"]
+        assert self.uploader.upload(str(copy)) == first
+        assert MediaUploader(self.client, self.cache, account="b").upload(str(image)) != first
+
+        self.now += 86400 - 60
+        assert self.uploader.upload(str(image)) != first
+        assert self.server.media_commands == ["UPLOAD"] * 3
+
+    def test_concurrent_uploads(self, tmp_path):
+        """测试一条帖子的图片并发上传"""
+        self.server.delay = 0.05
+        images = [str(write_image(tmp_path / f"img{i}.jpg", 200, seed=i)) for i in range(4)]
+
+        media_ids = self.uploader.upload_all(images)
+
+        assert self.server.max_in_flight == 4
+        assert [self.server.media[m]["data"] for m in media_ids] == [
+            (tmp_path / f"img{i}.jpg").read_bytes() for i in range(4)
+        ]
+        with pytest.raises(ValueError):
+            self.uploader.upload_all(images + images[:1])
+
+    def test_video_or_gif_alone(self, tmp_path):
+        """测试视频或GIF不能与其他媒体混合"""
+        image = str(write_image(tmp_path / "img.png", 200))
+        gif = str(write_image(tmp_path / "anim.gif", 200))
+
+        with pytest.raises(ValueError, match="only media"):
+            self.uploader.upload_all([image, gif])
+        assert self.server.media_commands == []
+
+
+class TestPostWithImages:
+    """测试XPoster带图发布"""
+
+    def test_media_ids_attached(self, fake_x_server, tmp_path, monkeypatch):
+        """测试帖子附带上传的media_id"""
+        monkeypatch.chdir(tmp_path)
+        poster = XPoster(mock_mode=True, post_index=PostIndex(tmp_path / "index.sqlite3"))
+        poster.mock_mode = False
+        poster.client = XApiClient("key", "secret", "token", "token-secret", base_url=fake_x_server.url)
+        images = [str(write_image(tmp_path / f"img{i}.png", 300, seed=i)) for i in range(2)]
+
+        success, message = poster.post_with_images("Cluster dashboards #HPC", images)
+        assert success, message
+        assert poster.post_with_images("Same dashboards again #HPC", images)[0]
+
+        tweets = [r[3] for r in fake_x_server.requests if r[1] == "/2/tweets"]
+        assert tweets[0]["media"] == tweets[1]["media"]
+        assert fake_x_server.media_commands == ["UPLOAD", "UPLOAD"]
+
+    def test_validated_and_recorded(self, fake_x_server, tmp_path, monkeypatch):
+        """测试带图发布经过验证、去重并写入历史"""
+        from hpc_ai_tools.journal import flush_journals
+
+        monkeypatch.chdir(tmp_path)
+        poster = XPoster(mock_mode=True, post_index=PostIndex(tmp_path / "index.sqlite3"))
+        poster.mock_mode = False
+        poster.client = XApiClient("key", "secret", "token", "token-secret", base_url=fake_x_server.url)
+        images = [str(write_image(tmp_path / "img.png", 300, seed=1))]
+
+        assert not poster.post_with_images("short", images)[0]
+        assert poster.post_with_images("Rack photos #HPC", images, focus="hpc")[0]
+        assert "Duplicate" in poster.post_with_images("Rack photos #HPC", images)[1]
+
+        assert fake_x_server.media_commands == ["UPLOAD"]
+        assert poster.post_index.contains("Rack photos #HPC")
+        flush_journals()
+        (record,) = poster.history.query()
+        assert record["focus"] == "hpc"
+        assert len(record["media_ids"]) == 1
+        assert record["media"] == images
+
+    def test_mock_mode_checks_media(self, tmp_path, monkeypatch):
+        """测试模拟模式同样检查媒体数量、类型和大小并记录路径"""
+        from hpc_ai_tools.journal import flush_journals
+
+        monkeypatch.chdir(tmp_path)
+        poster = XPoster(mock_mode=True, post_index=PostIndex(tmp_path / "index.sqlite3"))
+        images = [str(write_image(tmp_path / f"img{i}.png", 100, seed=i)) for i in range(5)]
+        notes = tmp_path / "notes.txt"
+        notes.write_text("not an image", encoding="utf-8")
+        large = tmp_path / "large.png"
+        with open(large, "wb") as f:
+            f.truncate(MEDIA_LIMITS["tweet_image"] + 1)
+
+        assert "At most 4" in poster.post_with_images("Too many images #HPC", images)[1]
+        assert "Unsupported" in poster.post_with_images("Text file #HPC", [str(notes)])[1]
+        assert "too large" in poster.post_with_images("Huge image #HPC", [str(large)])[1]
+        assert poster.post_with_images("Four images #HPC", images[:4])[0]
+
+        flush_journals()
+        (record,) = poster.history.query()
+        assert record["mode"] == "mock"
+        assert record["media"] == images[:4]
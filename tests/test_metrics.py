@@ -0,0 +1,134 @@
+"""
+测试指标注册表与Prometheus文本导出
+"""
+
+import os
+import subprocess
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+from hpc_ai_tools.metrics import MetricsRegistry
+from hpc_ai_tools.post_index import PostIndex
+from hpc_ai_tools.x_api import XApiClient
+from hpc_ai_tools.x_poster import XPoster
+
+SRC_DIR = Path(__file__).resolve().parent.parent / "src"
+
+
+class TestMetricsRegistry:
+    """测试MetricsRegistry类"""
+
+    def setup_method(self):
+        """测试前设置"""
+        self.registry = MetricsRegistry()
+
+    def test_counter_threads(self):
+        """测试多线程计数按线程聚合后求和"""
+        counter = self.registry.counter("posts_total", "Posts", ("focus",))
+
+        def work():
+            for _ in range(1000):
+                counter.inc("hpc")
+            counter.inc("ai", amount=2)
+
+        threads = [threading.Thread(target=work) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert counter.values() == {("hpc",): 8000, ("ai",): 16}
+        assert self.registry.counter("posts_total", "Posts", ("focus",)) is counter
+        with pytest.raises(ValueError):
+            counter.inc("hpc", "en")
+
+    def test_short_lived_threads_retired(self):
+        """测试短生命周期线程的分片被合并，分片数量有上限"""
+        counter = self.registry.counter("uploads_total", "Uploads")
+        histogram = self.registry.histogram("upload_seconds", "Upload time", buckets=(1.0,))
+
+        def work():
+            counter.inc()
+            histogram.observe(0.5)
+
+        for _ in range(50):
+            threads = [threading.Thread(target=work) for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        assert len(counter._shards) <= 4 and len(histogram._shards) <= 4
+        assert counter.values() == {(): 200}
+        assert histogram.totals() == {(): (200, 100.0)}
+        assert len(counter._shards) == len(histogram._shards) == 0
+
+    def test_render_and_write(self, tmp_path):
+        """测试直方图的文本格式与原子写入"""
+        histogram = self.registry.histogram("latency_seconds", "Latency", ("mode",), buckets=(0.01, 1.0))
+        for value in (0.003, 0.2, 20):
+            histogram.observe(value, "mock")
+        self.registry.counter("errors_total", 'Errors "by" class', ("class",)).inc('a"b')
+
+        text = self.registry.render()
+
+        assert '# HELP errors_total Errors \\"by\\" class' in text
+        assert 'errors_total{class="a\\"b"} 1' in text
+        assert 'latency_seconds_bucket{mode="mock",le="0.01"} 1' in text
+        assert 'latency_seconds_bucket{mode="mock",le="1"} 2' in text
+        assert 'latency_seconds_bucket{mode="mock",le="+Inf"} 3' in text
+        assert 'latency_seconds_sum{mode="mock"} 20.203' in text
+        assert 'latency_seconds_count{mode="mock"} 3' in text
+
+        path = tmp_path / "textfile" / "hpc_ai_tools.prom"
+        self.registry.write_textfile(path)
+        assert path.read_text(encoding="utf-8") == text
+        assert [p.name for p in path.parent.iterdir()] == ["hpc_ai_tools.prom"]
+
+
+class TestPosterMetrics:
+    """测试XPoster统计读取指标注册表"""
+
+    @pytest.fixture(autouse=True)
+    def setup(self, fake_x_server, tmp_path, monkeypatch):
+        """创建指向本地服务器的XPoster"""
+        monkeypatch.chdir(tmp_path)
+        self.server = fake_x_server
+        self.poster = XPoster(mock_mode=True, post_index=PostIndex(tmp_path / "index.sqlite3"))
+        self.poster.client = XApiClient("key", "secret", "token", "token-secret", base_url=fake_x_server.url)
+
+    def test_session_stats(self):
+        """测试发布、拒绝与API错误进入会话统计"""
+        before = self.poster.get_posting_stats()["session"]
+
+        self.poster.post_to_x("Mock post counted in the registry #HPC")
+        self.poster.post_to_x("short")
+        self.server.respond("POST", "/2/tweets", lambda body: (503, {}, {"detail": "Service Unavailable"}))
+        assert not self.poster.post_to_x("Real post that fails #HPC", mock=False)[0]
+
+        after = self.poster.get_posting_stats()["session"]
+        assert after["posts"]["mock"] == before["posts"].get("mock", 0) + 1
+        assert after["failed"]["real"] == before["failed"].get("real", 0) + 1
+        assert after["rejected"]["too_short"] == before["rejected"].get("too_short", 0) + 1
+        assert after["api_errors"]["server"] == before["api_errors"].get("server", 0) + 1
+        assert after["avg_latency"]["mock"] > 0
+
+
+class TestPortability:
+    """测试没有fork与fcntl的平台上可以导入"""
+
+    def test_import_without_fork_and_fcntl(self):
+        """测试模拟Windows时导入生成器和发布器"""
+        code = (
+            "import os, sys\n"
+            "del os.register_at_fork\n"
+            "sys.modules['fcntl'] = None\n"
+            "from hpc_ai_tools import ContentGenerator\n"
+            "from hpc_ai_tools.x_poster import XPoster\n"
+        )
+        env = dict(os.environ, PYTHONPATH=str(SRC_DIR))
+        result = subprocess.run([sys.executable, "-c", code], env=env, capture_output=True, text=True)
+
+        assert result.returncode == 0, result.stderr
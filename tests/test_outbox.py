@@ -0,0 +1,179 @@
+"""
+测试持久化发件箱
+"""
+
+import multiprocessing
+import sys
+import time
+
+from hpc_ai_tools import cli
+from hpc_ai_tools.outbox import Outbox, Outcome, OutboxWorker
+from hpc_ai_tools.post_index import PostIndex
+from hpc_ai_tools.x_api import XApiClient
+from hpc_ai_tools.x_poster import XPoster
+
+
+def run_cli(monkeypatch, *argv):
+    """以指定参数运行CLI"""
+    monkeypatch.setattr(sys, "argv", ["hpc-ai-tools", *argv])
+    return cli.main()
+
+
+def drain_in_process(path, worker_id, results):
+    """在子进程中清空发件箱"""
+    outbox = Outbox(path, lease_seconds=60)
+    while True:
+        items = outbox.claim(worker_id, limit=3)
+        if not items:
+            break
+        outbox.finish(worker_id, [Outcome(item.id, True, tweet_id=worker_id) for item in items])
+        results.extend([item.id for item in items])
+    outbox.close()
+
+
+class TestOutbox:
+    """测试Outbox类"""
+
+    def setup_method(self):
+        """测试前设置"""
+        self.now = 1_700_000_000.0
+
+    def make_outbox(self, tmp_path, **kwargs):
+        """创建临时发件箱"""
+        kwargs.setdefault("lease_seconds", 60)
+        kwargs.setdefault("retry_delay", 10)
+        return Outbox(tmp_path / "outbox.sqlite3", **kwargs)
+
+    def test_claim_leases_items_once(self, tmp_path):
+        """测试已租出的条目不会被重复领取"""
+        outbox = self.make_outbox(tmp_path)
+        ids = outbox.enqueue([f"post {i}" for i in range(5)], focus="hpc", now=self.now)
+
+        first = outbox.claim("a", limit=3, now=self.now)
+        second = outbox.claim("b", limit=3, now=self.now)
+
+        assert [item.id for item in first] == ids[:3]
+        assert [item.id for item in second] == ids[3:]
+        assert outbox.claim("c", now=self.now) == []
+        assert first[0].focus == "hpc" and first[0].attempts == 1
+
+    def test_expired_lease_is_reclaimed(self, tmp_path):
+        """测试租约过期后条目可被其他进程领取"""
+        outbox = self.make_outbox(tmp_path)
+        outbox.enqueue(["stalled post"], now=self.now)
+        outbox.claim("crashed", now=self.now)
+
+        assert outbox.claim("b", now=self.now + 30) == []
+        reclaimed = outbox.claim("b", now=self.now + 61)
+
+        assert [item.attempts for item in reclaimed] == [2]
+        # The stale owner can no longer fail the item
+        outbox.finish("crashed", [Outcome(reclaimed[0].id, False, error="late")], now=self.now + 62)
+        assert outbox.counts()["leased"] == 1
+
+    def test_retry_then_dead_letter(self, tmp_path):
+        """测试失败重试并在超过次数后进入死信"""
+        outbox = self.make_outbox(tmp_path, max_attempts=2)
+        (item_id,) = outbox.enqueue(["flaky post"], now=self.now)
+
+        outbox.claim("w", now=self.now)
+        outbox.finish("w", [Outcome(item_id, False, error="503")], now=self.now)
+        assert outbox.claim("w", now=self.now + 5) == []
+
+        outbox.claim("w", now=self.now + 10)
+        outbox.finish("w", [Outcome(item_id, False, error="503")], now=self.now + 10)
+
+        assert outbox.counts()["dead"] == 1
+        assert outbox.dead_letters() == [(item_id, "flaky post", "503")]
+        assert outbox.requeue_dead(now=self.now + 20) == 1
+        assert outbox.counts()["pending"] == 1
+
+    def test_permanent_failure_skips_retries(self, tmp_path):
+        """测试不可重试的失败直接进入死信"""
+        outbox = self.make_outbox(tmp_path)
+        (item_id,) = outbox.enqueue(["rejected post"], now=self.now)
+
+        outbox.claim("w", now=self.now)
+        outbox.finish("w", [Outcome(item_id, False, error="403", retryable=False)], now=self.now)
+
+        assert outbox.counts()["dead"] == 1
+
+    def test_concurrent_processes(self, tmp_path):
+        """测试多个进程同时清空同一发件箱"""
+        path = tmp_path / "outbox.sqlite3"
+        outbox = Outbox(path)
+        outbox.enqueue([f"post {i}" for i in range(60)])
+
+        with multiprocessing.Manager() as manager:
+            results = manager.list()
+            workers = [
+                multiprocessing.Process(target=drain_in_process, args=(path, f"w{i}", results))
+                for i in range(3)
+            ]
+            for worker in workers:
+                worker.start()
+            for worker in workers:
+                worker.join()
+            claimed = list(results)
+
+        assert sorted(claimed) == list(range(1, 61))
+        assert outbox.counts()["done"] == 60
+
+
+class TestOutboxWorker:
+    """测试OutboxWorker"""
+
+    def test_drain_real_mode(self, fake_x_server, tmp_path, monkeypatch):
+        """测试通过本地服务器发布并批量提交结果"""
+        monkeypatch.chdir(tmp_path)
+        poster = XPoster(mock_mode=True, post_index=PostIndex(tmp_path / "index.sqlite3"))
+        poster.mock_mode = False
+        poster.client = XApiClient("key", "secret", "token", "token-secret", base_url=fake_x_server.url)
+        outbox = Outbox(tmp_path / "outbox.sqlite3")
+        outbox.enqueue([f"Outbox HPC post number {i} #HPC" for i in range(4)] + ["short"])
+        fake_x_server.respond("POST", "/2/tweets", lambda body: (
+            (503, {}, {"detail": "Service Unavailable"}) if "number 3" in body["text"]
+            else (201, {}, {"data": {"id": body["text"][-6], "text": body["text"]}})
+        ))
+
+        totals = OutboxWorker(outbox, poster, worker_id="w", batch_size=2).run()
+
+        assert totals == {"posted": 3, "failed": 2}
+        assert outbox.counts() == {"pending": 1, "leased": 0, "done": 3, "dead": 1}
+        assert len(poster.post_index) == 3
+
+    def test_crash_after_post_is_not_dead_lettered(self, fake_x_server, tmp_path, monkeypatch):
+        """测试发布后崩溃的条目在租约过期后标记为完成而非死信"""
+        monkeypatch.chdir(tmp_path)
+        poster = XPoster(mock_mode=True, post_index=PostIndex(tmp_path / "index.sqlite3"))
+        poster.mock_mode = False
+        poster.client = XApiClient("key", "secret", "token", "token-secret", base_url=fake_x_server.url)
+        outbox = Outbox(tmp_path / "outbox.sqlite3", lease_seconds=1)
+        outbox.enqueue(["Crash recovery HPC post #HPC"])
+
+        # The crashed worker posted the item but never committed its batch
+        (item,) = outbox.claim("crashed")
+        assert poster._publish(item.content)[0]
+        monkeypatch.setattr("time.time", lambda real=time.time: real() + 5)
+
+        outcomes = OutboxWorker(outbox, poster, worker_id="w").run_once()
+
+        assert [outcome.success for outcome in outcomes] == [True]
+        assert outbox.counts() == {"pending": 0, "leased": 0, "done": 1, "dead": 0}
+        assert len(fake_x_server.requests) == 1
+
+
+class TestDrainCommand:
+    """测试drain命令"""
+
+    def test_enqueue_and_drain(self, monkeypatch, tmp_path):
+        """测试generate --enqueue后drain发布"""
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.setenv("OUTBOX_PATH", str(tmp_path / "outbox.sqlite3"))
+        monkeypatch.setenv("POST_INDEX_PATH", str(tmp_path / "index.sqlite3"))
+
+        assert run_cli(monkeypatch, "generate", "-n", "3", "--enqueue") == 0
+        assert Outbox().counts()["pending"] == 6
+
+        assert run_cli(monkeypatch, "drain", "--mode", "mock", "--batch-size", "4") == 0
+        assert Outbox().counts()["done"] == 6
@@ -0,0 +1,44 @@
+"""
+测试并行内容生成
+"""
+
+import numpy as np
+from hpc_ai_tools.content_generator import ContentGenerator
+from hpc_ai_tools.parallel import generate_parallel
+
+
+class TestGenerateParallel:
+    """测试generate_parallel"""
+
+    def test_same_output_for_any_worker_count(self):
+        """测试不同进程数输出一致"""
+        serial, serial_idx = generate_parallel(1000, focus="ai", workers=1, seed=42, chunk_size=128)
+        pooled, pooled_idx = generate_parallel(1000, focus="ai", workers=3, seed=42, chunk_size=128)
+
+        assert serial == pooled
+        for name in serial_idx:
+            assert np.array_equal(serial_idx[name], pooled_idx[name])
+
+    def test_different_seeds(self):
+        """测试不同种子输出不同"""
+        first, _ = generate_parallel(200, workers=1, seed=1)
+        second, _ = generate_parallel(200, workers=1, seed=2)
+        assert first != second
+
+    def test_focus_streams_independent(self):
+        """测试不同焦点使用独立种子流"""
+        _, hpc_idx = generate_parallel(200, focus="hpc", workers=1, seed=5)
+        _, ai_idx = generate_parallel(200, focus="ai", workers=1, seed=5)
+        assert not np.array_equal(hpc_idx["organization"], ai_idx["organization"])
+
+
+class TestSeededGenerator:
+    """测试带种子的ContentGenerator"""
+
+    def test_replay(self):
+        """测试相同种子可复现"""
+        first = ContentGenerator(seed=123)
+        second = ContentGenerator(seed=123)
+
+        assert first.generate_daily_content() == second.generate_daily_content()
+        assert first.generate_batch(50)[0] == second.generate_batch(50)[0]
@@ -0,0 +1,79 @@
+"""
+测试已发布内容索引
+"""
+
+from hpc_ai_tools.content_generator import ContentGenerator
+from hpc_ai_tools.post_index import PostIndex
+from hpc_ai_tools.x_poster import XPoster
+
+
+class TestPostIndex:
+    """测试PostIndex类"""
+
+    def setup_method(self):
+        """测试前设置"""
+        self.now = 1_700_000_000.0
+
+    def test_contains(self, tmp_path):
+        """测试重复内容检测"""
+        index = PostIndex(tmp_path / "index.sqlite3", retention_days=1)
+        index.add("🚀 Exascale Computing update", now=self.now)
+
+        assert index.contains("🚀 Exascale Computing update", now=self.now + 60)
+        assert index.contains("  🚀 Exascale Computing update\n", now=self.now + 60)
+        assert not index.contains("🚀 GPU Computing update", now=self.now + 60)
+
+    def test_retention_window(self, tmp_path):
+        """测试保留窗口和过期清理"""
+        index = PostIndex(tmp_path / "index.sqlite3", retention_days=1)
+        index.add("old post", now=self.now)
+        index.add("new post", now=self.now + 86400)
+
+        assert not index.contains("old post", now=self.now + 86400 + 1)
+        assert index.evict(now=self.now + 86400 + 1) == 1
+        assert len(index) == 1
+
+    def test_persistent(self, tmp_path):
+        """测试跨实例持久化"""
+        path = tmp_path / "index.sqlite3"
+        first = PostIndex(path)
+        first.add("persisted post")
+        first.close()
+
+        assert PostIndex(path).contains("persisted post")
+
+
+class TestDuplicateChecks:
+    """测试发布和生成时的重复检查"""
+
+    def test_post_to_x_rejects_duplicate(self, tmp_path, monkeypatch):
+        """测试post_to_x拒绝重复内容"""
+        monkeypatch.chdir(tmp_path)
+        index = PostIndex(tmp_path / "index.sqlite3")
+        index.add("Already posted HPC content #HPC")
+        poster = XPoster(mock_mode=True, post_index=index)
+
+        success, message = poster.post_to_x("Already posted HPC content #HPC")
+        assert not success
+        assert "Duplicate" in message
+
+    def test_real_post_recorded(self, tmp_path, monkeypatch):
+        """测试成功发布后写入索引"""
+        monkeypatch.chdir(tmp_path)
+        index = PostIndex(tmp_path / "index.sqlite3")
+        poster = XPoster(mock_mode=True, post_index=index)
+        monkeypatch.setattr(poster, "_real_post", lambda content, *args: (True, "ok", "1", True))
+
+        assert poster.post_to_x("Fresh HPC content #HPC", mock=False)[0]
+        assert index.contains("Fresh HPC content #HPC")
+
+    def test_generator_skips_posted(self, tmp_path):
+        """测试生成器跳过已发布内容"""
+        index = PostIndex(tmp_path / "index.sqlite3")
+        generator = ContentGenerator(seed=3, post_index=index)
+        posted = [record["content"] for record in generator.iter_content(limit=50)]
+        for content in posted:
+            index.add(content)
+
+        replay = ContentGenerator(seed=3, post_index=index)
+        assert not set(posted) & {r["content"] for r in replay.iter_content(limit=50)}
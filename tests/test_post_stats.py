@@ -0,0 +1,91 @@
+"""
+测试发布统计计数器
+"""
+
+import sys
+from datetime import datetime
+
+from hpc_ai_tools import cli
+from hpc_ai_tools.history import PostHistory, history_record
+from hpc_ai_tools.post_index import PostIndex
+from hpc_ai_tools.post_stats import PostCounters
+from hpc_ai_tools.x_poster import XPoster
+
+
+class TestPostCounters:
+    """测试PostCounters类"""
+
+    def setup_method(self):
+        """测试前设置"""
+        self.now = datetime(2024, 5, 1, 9, 30).timestamp()
+
+    def test_record(self, tmp_path):
+        """测试增量计数"""
+        counters = PostCounters(tmp_path / "stats.sqlite3")
+        counters.record("mock", now=self.now)
+        counters.record("real", now=self.now + 60)
+        counters.record("error", now=self.now + 120)
+
+        assert PostCounters(tmp_path / "stats.sqlite3").snapshot() == {
+            "total_posts": 2,
+            "real_posts": 1,
+            "mock_posts": 1,
+            "errors": 1,
+            "last_post_at": "2024-05-01 09:31:00",
+        }
+
+    def test_rebuild_from_logs(self, tmp_path):
+        """测试从发布历史和旧日志重建计数"""
+        tweet_log = tmp_path / "tweet_log.txt"
+        tweet_log.write_text(
+            "[2024-05-01 09:00:00] MOCK POST\nMentions REAL POST in the text\n" + "=" * 50 + "\n"
+            "[2024-05-01 10:00:00] REAL POST - ID: 42\nReal one\nURL: x\n" + "=" * 50 + "\n",
+            encoding="utf-8",
+        )
+        error_log = tmp_path / "post_errors.log"
+        error_log.write_text("[2024-05-01 11:00:00] ERROR\nContent: c\nError: e\n", encoding="utf-8")
+        history = PostHistory(tmp_path / "post_history.jsonl")
+        history.path.write_text(
+            history_record("real", "From the history", tweet_id="43", now=datetime(2024, 5, 2, 8, 0).astimezone())
+            + history_record("real", "Failed", error="503", now=datetime(2024, 5, 2, 9, 0).astimezone()),
+            encoding="utf-8",
+        )
+        counters = PostCounters(tmp_path / "stats.sqlite3")
+        counters.record("mock")
+
+        stats = counters.rebuild(history, tweet_log, error_log)
+
+        assert stats == {
+            "total_posts": 3,
+            "real_posts": 2,
+            "mock_posts": 1,
+            "errors": 2,
+            "last_post_at": "2024-05-02 08:00:00",
+        }
+
+    def test_rebuild_without_logs(self, tmp_path):
+        """测试日志不存在时重建为零"""
+        counters = PostCounters(tmp_path / "stats.sqlite3")
+
+        stats = counters.rebuild(
+            PostHistory(tmp_path / "post_history.jsonl"), tmp_path / "missing.txt", tmp_path / "empty.log"
+        )
+
+        assert stats["total_posts"] == 0 and stats["last_post_at"] is None
+
+
+class TestPosterStats:
+    """测试XPoster统计读取计数器"""
+
+    def test_stats_follow_posts(self, tmp_path, monkeypatch, capsys):
+        """测试发布后统计与stats命令一致"""
+        monkeypatch.chdir(tmp_path)
+        poster = XPoster(mock_mode=True, post_index=PostIndex(tmp_path / "index.sqlite3"))
+        for i in range(3):
+            poster.post_to_x(f"Counted mock post number {i} #HPC")
+
+        assert poster.get_posting_stats()["mock_posts"] == 3
+
+        monkeypatch.setattr(sys, "argv", ["hpc-ai-tools", "stats", "--rebuild"])
+        assert cli.main() == 0
+        assert "total_posts: 3" in capsys.readouterr().out
@@ -0,0 +1,171 @@
+"""
+测试X API速率限制管理
+"""
+
+import time
+
+import pytest
+from hpc_ai_tools.post_index import PostIndex
+from hpc_ai_tools.rate_limit import RateLimitExceeded, RateLimitManager
+from hpc_ai_tools.x_api import XApiClient
+from hpc_ai_tools.x_poster import XPoster
+
+
+class FakeClock:
+    """可控的时钟，sleep直接推进时间"""
+
+    def __init__(self, now=1_700_000_000.0):
+        self.now = now
+        self.sleeps = []
+
+    def time(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def make_manager(tmp_path, clock, max_wait=900.0):
+    """创建使用假时钟的管理器"""
+    return RateLimitManager(
+        tmp_path / "rate_limits.json", max_wait=max_wait, clock=clock.time, sleep=clock.sleep
+    )
+
+
+def limited_tweets(server, clock, limit):
+    """让模拟服务器的发帖接口返回速率限制头"""
+    state = {"remaining": limit, "reset": clock.now + 60}
+
+    def responder(body):
+        if clock.now >= state["reset"]:
+            state["remaining"] = limit
+            state["reset"] = clock.now + 60
+        state["remaining"] -= 1
+        headers = {
+            "x-rate-limit-limit": limit,
+            "x-rate-limit-remaining": state["remaining"],
+            "x-rate-limit-reset": int(state["reset"]),
+        }
+        return 201, headers, {"data": {"id": str(len(server.requests)), "text": body["text"]}}
+
+    server.respond("POST", "/2/tweets", responder)
+
+
+class TestRateLimitManager:
+    """测试RateLimitManager"""
+
+    def setup_method(self):
+        """设置测试环境"""
+        self.clock = FakeClock()
+
+    def test_unknown_endpoint_does_not_wait(self, tmp_path):
+        """测试未知接口不等待"""
+        manager = make_manager(tmp_path, self.clock)
+
+        assert manager.acquire("create_tweet") == 0
+        assert self.clock.sleeps == []
+
+    def test_waits_for_reset_when_exhausted(self, tmp_path):
+        """测试额度用完后等待到重置时间"""
+        manager = make_manager(tmp_path, self.clock)
+        reset = self.clock.now + 30
+        manager.update("create_tweet", {"x-rate-limit-remaining": "2", "x-rate-limit-reset": str(reset)})
+
+        assert manager.acquire("create_tweet") == 0
+        assert manager.acquire("create_tweet") == 0
+        assert manager.acquire("create_tweet") == pytest.approx(30)
+        assert self.clock.now == pytest.approx(reset)
+        assert "create_tweet" not in manager.state()
+
+    def test_endpoints_have_separate_buckets(self, tmp_path):
+        """测试各接口额度独立"""
+        manager = make_manager(tmp_path, self.clock)
+        manager.update("create_tweet", {"x-rate-limit-remaining": "0", "x-rate-limit-reset": str(self.clock.now + 30)})
+
+        assert manager.acquire("users/me") == 0
+        assert self.clock.sleeps == []
+
+    def test_raises_when_wait_too_long(self, tmp_path):
+        """测试等待超过上限时抛出异常"""
+        manager = make_manager(tmp_path, self.clock, max_wait=10)
+        manager.update("create_tweet", {}, status_code=429)
+
+        with pytest.raises(RateLimitExceeded) as excinfo:
+            manager.acquire("create_tweet")
+
+        assert excinfo.value.status_code == 429
+        assert self.clock.sleeps == []
+
+    def test_state_persists_across_instances(self, tmp_path):
+        """测试状态在进程重启后保留"""
+        first = make_manager(tmp_path, self.clock)
+        first.update("create_tweet", {"x-rate-limit-limit": "5", "x-rate-limit-remaining": "0", "x-rate-limit-reset": str(self.clock.now + 45)})
+
+        second = make_manager(tmp_path, self.clock)
+
+        assert second.state()["create_tweet"]["limit"] == 5
+        assert second.acquire("create_tweet") == pytest.approx(45)
+
+
+class TestRateLimitedClient:
+    """测试XApiClient在模拟服务器上的速率限制"""
+
+    def setup_method(self):
+        """设置测试环境"""
+        self.clock = FakeClock()
+
+    def make_client(self, server, tmp_path):
+        """创建带速率限制的客户端"""
+        self.manager = make_manager(tmp_path, self.clock)
+        return XApiClient(
+            "key", "secret", "token", "token-secret", base_url=server.url, rate_limiter=self.manager
+        )
+
+    def test_delays_instead_of_failing(self, fake_x_server, tmp_path):
+        """测试额度用完时延迟请求而不是失败"""
+        limited_tweets(fake_x_server, self.clock, limit=2)
+        client = self.make_client(fake_x_server, tmp_path)
+
+        ids = [client.create_tweet(f"Rate limited post {i}")["id"] for i in range(3)]
+        client.close()
+
+        assert len(set(ids)) == 3
+        assert self.clock.sleeps == [pytest.approx(60)]
+
+    def test_retries_after_429(self, fake_x_server, tmp_path):
+        """测试收到429后等待重置再重试"""
+        reset = int(self.clock.now) + 20
+        responses = [
+            (429, {"x-rate-limit-remaining": 0, "x-rate-limit-reset": reset}, {"title": "Too Many Requests"}),
+            (201, {}, {"data": {"id": "42", "text": "retried"}}),
+        ]
+        fake_x_server.respond("POST", "/2/tweets", lambda body: responses.pop(0))
+        client = self.make_client(fake_x_server, tmp_path)
+
+        data = client.create_tweet("Retried after the window reset")
+        client.close()
+
+        assert data["id"] == "42"
+        assert len(fake_x_server.requests) == 2
+        assert self.clock.sleeps == [pytest.approx(20)]
+
+
+class TestXPosterRateLimits:
+    """测试XPoster真实模式使用速率限制"""
+
+    def test_real_mode_records_headers(self, fake_x_server, tmp_path, monkeypatch):
+        """测试真实模式发帖后保存速率限制状态"""
+        monkeypatch.chdir(tmp_path)
+        for var in ("X_API_KEY", "X_API_SECRET", "X_ACCESS_TOKEN", "X_ACCESS_TOKEN_SECRET"):
+            monkeypatch.setenv(var, "test")
+        monkeypatch.setenv("X_API_BASE_URL", fake_x_server.url)
+        monkeypatch.setenv("X_RATE_LIMIT_STATE", str(tmp_path / "limits.json"))
+        limited_tweets(fake_x_server, FakeClock(time.time()), limit=100)
+
+        poster = XPoster(mock_mode=False, post_index=PostIndex(tmp_path / "index.sqlite3"))
+        success, message = poster.post_to_x("Real mode post through the local server #HPC")
+
+        assert success, message
+        assert poster.get_posting_stats()["rate_limits"]["create_tweet"]["remaining"] == 99
+        assert RateLimitManager(tmp_path / "limits.json").state()["create_tweet"]["limit"] == 100
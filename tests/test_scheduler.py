@@ -0,0 +1,126 @@
+"""
+测试serve守护进程的调度器
+"""
+
+import asyncio
+import json
+import os
+import random
+import signal
+import subprocess
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+from hpc_ai_tools.scheduler import Job, Scheduler, parse_clock
+
+SRC_DIR = Path(__file__).resolve().parent.parent / "src"
+
+
+def at(timestamp):
+    """时间戳对应的每日时刻"""
+    return datetime.fromtimestamp(timestamp).time()
+
+
+class TestScheduler:
+    """测试Scheduler类"""
+
+    def setup_method(self):
+        """测试前设置"""
+        self.now = datetime(2024, 5, 1, 10, 30).timestamp()
+        self.runs = []
+
+    def scheduler(self, tmp_path, jobs, **kwargs):
+        return Scheduler(jobs, state_path=tmp_path / "serve.json", clock=lambda: self.now, **kwargs)
+
+    def test_next_run_with_jitter(self, tmp_path):
+        """测试下次运行时间落在抖动范围内"""
+        job = Job("post_morning", parse_clock("09:00"), lambda: None)
+        scheduler = self.scheduler(tmp_path, [job], jitter=300, rng=random.Random(1))
+
+        slot, run_at = scheduler.next_run(job)
+
+        assert slot == datetime(2024, 5, 2, 9, 0).timestamp()
+        assert slot <= run_at <= slot + 300
+
+    def test_catch_up(self, tmp_path):
+        """测试重启后补跑错过的任务，过旧的则跳过"""
+        (tmp_path / "serve.json").write_text(json.dumps({
+            "post_morning": datetime(2024, 4, 30, 9, 0).timestamp(),
+            "generate_morning": datetime(2024, 4, 29, 8, 0).timestamp(),
+        }))
+        post = Job("post_morning", parse_clock("09:00"), lambda: None)
+        generate = Job("generate_morning", parse_clock("08:00"), lambda: None)
+        scheduler = self.scheduler(tmp_path, [post, generate], jitter=0, catch_up=7200)
+
+        assert scheduler.next_run(post) == (datetime(2024, 5, 1, 9, 0).timestamp(), self.now)
+
+        scheduler.catch_up = 1800
+        slot, run_at = scheduler.next_run(generate)
+        assert run_at == slot == datetime(2024, 5, 2, 8, 0).timestamp()
+        assert scheduler.state()["generate_morning"] == datetime(2024, 5, 1, 8, 0).timestamp()
+
+    def test_graceful_shutdown(self, tmp_path):
+        """测试停止时等待正在运行的任务完成"""
+        def slow_job():
+            time.sleep(0.3)
+            self.runs.append("done")
+
+        now = time.time()
+        job = Job("generate_morning", at(now + 0.2), slow_job)
+        scheduler = Scheduler([job], state_path=tmp_path / "serve.json", jitter=0)
+
+        async def main():
+            task = asyncio.create_task(scheduler.serve())
+            await asyncio.sleep(0.3)
+            scheduler.stop()
+            await asyncio.wait_for(task, timeout=2)
+
+        asyncio.run(main())
+
+        assert self.runs == ["done"]
+        slot = datetime.combine(datetime.fromtimestamp(now + 0.2).date(), job.at).timestamp()
+        assert json.loads((tmp_path / "serve.json").read_text())["generate_morning"] == slot
+
+
+class TestServeCommand:
+    """测试serve命令"""
+
+    def test_sigterm_stops(self, tmp_path):
+        """测试收到SIGTERM后正常退出"""
+        env = dict(os.environ, PYTHONPATH=str(SRC_DIR), MOCK_MODE="true")
+        process = subprocess.Popen(
+            [sys.executable, "-m", "hpc_ai_tools.cli", "serve"],
+            cwd=tmp_path,
+            env=env,
+            stdout=subprocess.PIPE,
+            text=True,
+        )
+        assert "Serving in mock mode" in process.stdout.readline()
+
+        process.send_signal(signal.SIGTERM)
+
+        assert process.wait(timeout=10) == 0
+        assert "Stopped" in process.stdout.read()
+        assert set(json.loads((tmp_path / "logs" / "serve_state.json").read_text())) == {
+            "generate_morning", "generate_afternoon", "post_morning", "post_afternoon"
+        }
+
+    def test_outbox_closed_on_error(self, tmp_path, monkeypatch):
+        """测试调度器出错时仍关闭outbox"""
+        from hpc_ai_tools import cli
+        from hpc_ai_tools.outbox import Outbox
+
+        monkeypatch.chdir(tmp_path)
+        closed = []
+        monkeypatch.setattr(Outbox, "close", lambda self: closed.append(self.path))
+
+        def crash(self, on_start=None):
+            raise RuntimeError("job crashed")
+
+        monkeypatch.setattr(Scheduler, "run", crash)
+        monkeypatch.setattr(sys, "argv", ["hpc-ai-tools", "serve"])
+
+        assert cli.main() == 1
+        assert len(closed) == 1
@@ -0,0 +1,40 @@
+"""
+测试预编译模板
+"""
+
+import pytest
+from hpc_ai_tools.content_generator import ContentGenerator
+from hpc_ai_tools.templates import CompiledTemplate, compile_templates
+
+
+class TestCompiledTemplate:
+    """测试CompiledTemplate类"""
+
+    def test_render_matches_format(self):
+        """测试渲染结果与str.format一致"""
+        source = "{emoji} {topic}: {organization} {{literal}}\n\n{hashtags}"
+        template = CompiledTemplate(source)
+        values = ("🚀", "GPU Computing", "CERN", "#HPC")
+
+        expected = source.format(
+            emoji="🚀", topic="GPU Computing", organization="CERN", hashtags="#HPC"
+        )
+        assert template.render(values) == expected
+        assert template.rendered_length(values) == len(expected)
+
+    def test_static_length(self):
+        """测试静态长度缓存"""
+        template = CompiledTemplate("{emoji} ab {topic}")
+        assert template.static_length == 4
+
+    def test_unknown_field(self):
+        """测试未知字段"""
+        with pytest.raises(ValueError):
+            CompiledTemplate("{emoji} {date}")
+
+    @pytest.mark.parametrize("language", ["en", "zh"])
+    def test_generator_templates(self, language):
+        """测试生成器模板全部可编译"""
+        generator = ContentGenerator(language=language)
+        compiled = compile_templates(generator.hpc_templates + generator.ai_templates)
+        assert all(t.static_length > 0 for t in compiled)
@@ -0,0 +1,107 @@
+"""
+测试长内容拆分为线程发布
+"""
+
+import pytest
+from hpc_ai_tools.post_index import PostIndex
+from hpc_ai_tools.threads import graphemes, split_thread
+from hpc_ai_tools.x_api import XApiClient
+from hpc_ai_tools.x_poster import XPoster
+
+LONG_CONTENT = (
+    "Exascale systems move more data than they compute. "
+    "Memory bandwidth per core keeps shrinking on every generation. "
+    "Mixed precision lets AI training stretch that bandwidth further. "
+    "Sparse kernels help as well, but only when the sparsity is structured. "
+    "Scheduling across CPUs and GPUs is still mostly done by hand. "
+    "#HPC #AI #Exascale"
+)
+
+
+class TestSplitThread:
+    """测试split_thread函数"""
+
+    def test_sentence_boundaries(self):
+        """测试按句子拆分并编号"""
+        parts = split_thread(LONG_CONTENT, 140)
+
+        assert len(parts) == 3
+        assert all(len(part) <= 140 for part in parts)
+        assert parts[0].startswith("Exascale systems") and parts[0].endswith("generation. 1/3")
+        assert parts[-1].endswith("#HPC #AI #Exascale 3/3")
+        assert split_thread("Short post #HPC", 140) == ["Short post #HPC"]
+
+    def test_graphemes_and_hashtags(self):
+        """测试不拆分字素簇和话题标签"""
+        family = "👨‍👩‍👧"
+        assert graphemes(f"é{family}🇯🇵👍🏽") == ["é", family, "🇯🇵", "👍🏽"]
+
+        parts = split_thread(family * 40, 50)
+        assert "".join(part.rsplit(" ", 1)[0] for part in parts) == family * 40
+        assert all(len(part) <= 50 for part in parts)
+
+        parts = split_thread("x" * 30 + " #HighPerformanceComputing", 40)
+        assert parts[1].startswith("#HighPerformanceComputing")
+        with pytest.raises(ValueError):
+            split_thread("#" + "A" * 60, 40)
+
+
+class TestPostThread:
+    """测试XPoster线程发布"""
+
+    @pytest.fixture(autouse=True)
+    def setup(self, fake_x_server, tmp_path, monkeypatch):
+        """创建指向本地服务器的真实模式XPoster"""
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.setenv("MAX_TWEET_LENGTH", "140")
+        self.server = fake_x_server
+        self.poster = XPoster(mock_mode=True, post_index=PostIndex(tmp_path / "index.sqlite3"))
+        self.poster.mock_mode = False
+        self.poster.client = XApiClient("key", "secret", "token", "token-secret", base_url=fake_x_server.url)
+
+    def tweets(self):
+        return [body for _, path, _, body in self.server.requests if path == "/2/tweets"]
+
+    def test_reply_chain(self):
+        """测试每条回复指向上一条"""
+        success, message = self.poster.post_thread(LONG_CONTENT)
+
+        assert success, message
+        tweets = self.tweets()
+        assert [t["text"][-3:] for t in tweets] == ["1/3", "2/3", "3/3"]
+        assert "reply" not in tweets[0]
+        assert tweets[1]["reply"]["in_reply_to_tweet_id"] == "1001"
+        assert tweets[2]["reply"]["in_reply_to_tweet_id"] == "1002"
+        assert not self.poster.post_thread(LONG_CONTENT)[0]
+
+    def test_resume_after_failure(self):
+        """测试部分失败后从断点继续"""
+        calls = []
+
+        def fail_third(body):
+            calls.append(body)
+            if len(calls) == 3:
+                return 503, {}, {"detail": "Service Unavailable"}
+            return self.server._tweet(body)
+
+        self.server.respond("POST", "/2/tweets", fail_third)
+        success, message = self.poster.post_thread(LONG_CONTENT)
+        assert not success and "part 3/3" in message
+
+        success, message = self.poster.post_thread(LONG_CONTENT)
+        assert success, message
+        texts = [t["text"][-3:] for t in self.tweets()]
+        assert texts == ["1/3", "2/3", "3/3", "3/3"]
+        assert self.tweets()[-1]["reply"]["in_reply_to_tweet_id"] == "1002"
+
+    def test_bookkeeping_errors_logged(self, monkeypatch, caplog):
+        """测试后台记录失败时写入错误日志"""
+        def broken_log(*args):
+            raise OSError("disk full")
+
+        monkeypatch.setattr(self.poster, "_log_real_post", broken_log)
+        success, message = self.poster.post_thread(LONG_CONTENT)
+
+        assert success, message
+        errors = [r.getMessage() for r in caplog.records if r.levelname == "ERROR"]
+        assert errors == [f"Failed to record thread post {1000 + i}: disk full" for i in (1, 2, 3)]
@@ -0,0 +1,111 @@
+"""
+测试生成与发布流水线的span追踪
+"""
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from hpc_ai_tools.content_generator import ContentGenerator
+from hpc_ai_tools.post_index import PostIndex
+from hpc_ai_tools.tracing import TRACER, span
+from hpc_ai_tools.x_api import XApiClient
+from hpc_ai_tools.x_poster import XPoster
+
+SRC_DIR = Path(__file__).resolve().parent.parent / "src"
+
+
+def spans(events):
+    """按名称分组的完整事件"""
+    grouped = {}
+    for event in events:
+        if event["ph"] == "X":
+            grouped.setdefault(event["name"], []).append(event)
+    return grouped
+
+
+def contains(parent, child):
+    """子span是否落在父span内"""
+    return parent["ts"] <= child["ts"] and child["ts"] + child["dur"] <= parent["ts"] + parent["dur"] + 1
+
+
+class TestTracer:
+    """测试Tracer类"""
+
+    @pytest.fixture(autouse=True)
+    def setup(self, tmp_path):
+        """每个测试后关闭追踪"""
+        self.path = tmp_path / "trace.json"
+        yield
+        TRACER.reset()
+
+    def test_disabled(self):
+        """测试关闭时不记录事件"""
+        with span("post") as disabled:
+            pass
+
+        assert TRACER.stages("generate_content") is None
+        assert not hasattr(disabled, "args")
+        assert TRACER.events() == []
+
+    def test_generate_stages(self):
+        """测试生成阶段嵌套在generate_content内"""
+        TRACER.enable(self.path)
+        ContentGenerator(seed=1).generate_morning_content()
+
+        written = json.loads(TRACER.write().read_text(encoding="utf-8"))
+
+        grouped = spans(written["traceEvents"])
+        (parent,) = grouped["generate_content"]
+        assert parent["args"] == {"focus": "hpc"}
+        for stage in ("sample", "hashtags", "render", "validate"):
+            assert contains(parent, grouped[stage][0])
+        assert written["traceEvents"][0]["ph"] == "M"
+
+
+class TestPosterTracing:
+    """测试真实模式发布的span"""
+
+    @pytest.fixture(autouse=True)
+    def setup(self, fake_x_server, tmp_path, monkeypatch):
+        """创建指向本地服务器的真实模式XPoster"""
+        monkeypatch.chdir(tmp_path)
+        self.poster = XPoster(mock_mode=True, post_index=PostIndex(tmp_path / "index.sqlite3"))
+        self.poster.mock_mode = False
+        self.poster.client = XApiClient("key", "secret", "token", "token-secret", base_url=fake_x_server.url)
+        TRACER.enable(tmp_path / "trace.json")
+        yield
+        TRACER.reset()
+
+    def test_post_stages(self):
+        """测试验证、HTTP调用和日志写入都在post内"""
+        success, message = self.poster.post_to_x("Traced real post #HPC")
+        assert success, message
+
+        grouped = spans(TRACER.events())
+        (post,) = grouped["post"]
+        assert post["args"] == {"mode": "real", "focus": None}
+        for name in ("validate", "http", "log_write"):
+            assert contains(post, grouped[name][0])
+        assert grouped["http"][0]["args"] == {"method": "POST", "endpoint": "create_tweet"}
+
+
+class TestTraceOption:
+    """测试--trace选项"""
+
+    def test_trace_file_written_at_exit(self, tmp_path):
+        """测试命令退出时写出追踪文件"""
+        env = dict(os.environ, PYTHONPATH=str(SRC_DIR))
+        subprocess.run(
+            [sys.executable, "-m", "hpc_ai_tools.cli", "generate", "--trace", "trace.json"],
+            cwd=tmp_path,
+            env=env,
+            check=True,
+            stdout=subprocess.DEVNULL,
+        )
+
+        events = json.loads((tmp_path / "trace.json").read_text(encoding="utf-8"))["traceEvents"]
+        assert len(spans(events)["generate_content"]) == 2